@@ -0,0 +1,137 @@
+"""
+Memory per mine field benchmark
+Measures how many bytes one deployed mine field (mines + nets) occupies in
+each representation the simulator offers:
+  - legacy objects: the original plain classes with a per-instance __dict__,
+    string type/placement fields and NumPy scalar attributes
+  - slotted objects: SurfaceMine/MooredMine/BottomMine/Net3D (__slots__)
+  - record arrays: Minefield.to_records() + NetField.to_records()
+  - Minefield + NetField: the structure-of-arrays storage
+  - MinefieldBatch: one field's share of a batch of BATCH_SIZE fields
+Object sizes are measured with tracemalloc, array sizes with nbytes.
+"""
+
+import sys
+sys.path.append('..')
+
+import tracemalloc
+
+import numpy as np
+
+from src.config import TacticalMineConfig, ThreatLevel
+from src.minefield import MineType
+from src.simulation import TacticalMineSimulation
+
+NUM_FIELDS = 20
+BATCH_SIZE = 100
+
+
+class LegacyMine:
+    """Reference copy of the original mine layout (per-instance __dict__)"""
+
+    def __init__(self, x, y, z, radius, mine_type, placement_type):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.radius = radius
+        self.type = mine_type
+        self.placement_type = placement_type
+
+
+class LegacyNet:
+    """Reference copy of the original Net3D layout with an eager NumPy length"""
+
+    def __init__(self, x1, y1, x2, y2, depth_top, depth_bottom, width):
+        self.x1, self.y1 = x1, y1
+        self.x2, self.y2 = x2, y2
+        self.z_top = depth_top
+        self.z_bottom = depth_bottom
+        self.width = width
+        self.length = np.sqrt((x2-x1)**2 + (y2-y1)**2)
+        self.type = "net"
+
+
+def traced_bytes(build):
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def legacy_objects(mines, nets):
+    """Legacy objects holding NumPy scalars, as the original generator built them"""
+    names = {MineType.SURFACE: "surface", MineType.MOORED: "moored",
+             MineType.BOTTOM: "bottom"}
+    return ([LegacyMine(x, y, z, r, names[MineType(k)], "linear" if p else "random")
+             for x, y, z, r, k, p in zip(mines.x, mines.y, mines.z, mines.radius,
+                                         mines.kind, mines.placement)],
+            [LegacyNet(*row) for row in zip(nets.x1, nets.y1, nets.x2, nets.y2,
+                                            nets.z_top, nets.z_bottom, nets.width)])
+
+
+def slotted_objects(mines, nets):
+    return ([m for mine_type in MineType for m in mines.to_objects(mine_type)],
+            nets.to_objects())
+
+
+def array_bytes(*arrays):
+    return sum(a.nbytes for a in arrays)
+
+
+def measure(threat_level):
+    """Average bytes per field for every representation"""
+    config = TacticalMineConfig(threat_level=threat_level)
+    sim = TacticalMineSimulation(config)
+    start, end = (1000, 1000), (9000, 9000)
+
+    totals = dict.fromkeys(["legacy objects", "slotted objects", "record arrays",
+                            "Minefield + NetField", "MinefieldBatch"], 0)
+    for seed in range(NUM_FIELDS):
+        sim.generate_tactical_mines(start, end, seed=seed)
+        mines, nets = sim.minefield, sim.netfield
+
+        totals["legacy objects"] += traced_bytes(lambda: legacy_objects(mines, nets))
+        totals["slotted objects"] += traced_bytes(lambda: slotted_objects(mines, nets))
+        totals["record arrays"] += array_bytes(mines.to_records(), nets.to_records())
+        totals["Minefield + NetField"] += array_bytes(
+            mines.x, mines.y, mines.z, mines.radius, mines.kind, mines.placement,
+            nets.x1, nets.y1, nets.x2, nets.y2, nets.z_top, nets.z_bottom, nets.width)
+
+    batch = sim.generate_minefield_batch(start, end, BATCH_SIZE, seed=0)
+    batch_bytes = array_bytes(batch.positions, batch.radius, batch.kind, batch.placement,
+                              batch.net_endpoints, batch.net_z_top, batch.net_z_bottom,
+                              batch.net_width)
+
+    per_field = {name: total / NUM_FIELDS for name, total in totals.items()}
+    per_field["MinefieldBatch"] = batch_bytes / BATCH_SIZE
+    return per_field
+
+
+def main():
+    print("="*72)
+    print("Memory per Mine Field".center(72))
+    print("="*72)
+
+    for threat_level in ThreatLevel:
+        config = TacticalMineConfig(threat_level=threat_level)
+        objects = threat_level.value[0] + config.num_nets
+        per_field = measure(threat_level)
+        baseline = per_field["legacy objects"]
+
+        print(f"\n{threat_level.name}: {threat_level.value[0]} mines + "
+              f"{config.num_nets} nets")
+        print(f"{'Representation':<24} {'KiB/field':>10} {'B/object':>10} {'vs legacy':>10}")
+        print("-"*72)
+        for name, size in per_field.items():
+            print(f"{name:<24} {size/1024:>10.1f} {size/objects:>10.1f} "
+                  f"{size/baseline:>9.2f}x")
+
+    print("\n" + "="*72)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
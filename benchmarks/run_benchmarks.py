@@ -0,0 +1,273 @@
+"""
+Offline benchmark suite
+Times mine deployment, collision checks, path generation and end-to-end
+Monte Carlo runs for every ThreatLevel and path_sampling_points setting,
+and stores the results as JSON so runs can be compared across commits.
+
+Each benchmark is timed like timeit: the number of calls per repeat is
+calibrated until one repeat takes at least MIN_REPEAT_TIME seconds, then
+REPEAT repeats are taken and min/median/mean seconds per call recorded.
+
+Usage:
+  python run_benchmarks.py                      # full suite -> results/<commit>.json
+  python run_benchmarks.py --quick              # smaller grid, fewer repeats
+  python run_benchmarks.py -k collision         # only benchmarks matching a substring
+  python run_benchmarks.py --compare OLD.json NEW.json [--threshold 1.10]
+
+--compare exits with status 1 if any benchmark's median slowed down by more
+than the threshold ratio.
+"""
+
+import sys
+sys.path.append('..')
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.config import TacticalMineConfig, ThreatLevel, RouteScenario
+from src.simulation import TacticalMineSimulation
+
+PATH_SAMPLING_POINTS = (100, 200, 500)
+QUICK_PATH_SAMPLING_POINTS = (200,)
+REPEAT = 5
+MIN_REPEAT_TIME = 0.05
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SURFACE_START, SURFACE_END = (1000, 1000), (9000, 9000)
+SUB_START, SUB_END = (1000, 1000, 100), (9000, 9000, 200)
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks: each takes a prepared simulation and returns the callable to time
+# ---------------------------------------------------------------------------
+
+def bench_generate_tactical_mines(sim):
+    seeds = iter(range(10**9))
+    return lambda: sim.generate_tactical_mines(SURFACE_START, SURFACE_END, seed=next(seeds))
+
+
+def bench_check_surface_vessel_safety(sim):
+    path = sim.generate_path_2d(SURFACE_START, SURFACE_END)
+    return lambda: sim.check_surface_vessel_safety(path)
+
+
+def bench_check_submarine_safety(sim):
+    path = sim.generate_path_3d(SUB_START, SUB_END)
+    return lambda: sim.check_submarine_safety(path)
+
+
+def bench_net3d_check_collision_3d(sim):
+    path = sim.generate_path_3d(SUB_START, SUB_END)
+    nets = sim.nets
+    width = sim.config.submarine_width
+    return lambda: [net.check_collision_3d(path, width) for net in nets]
+
+
+def bench_generate_scenario_path(sim):
+    def generate():
+        sim.path_cache.clear()
+        for scenario in RouteScenario:
+            sim.generate_scenario_path(scenario, SUB_START, SUB_END)
+    return generate
+
+
+def bench_run_simulation(sim, iterations):
+    return lambda: sim.run_simulation(SURFACE_START, SURFACE_END, SUB_START, SUB_END,
+                                      num_iterations=iterations, verbose=False)
+
+
+def bench_run_scenario_comparison(sim, iterations):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run_scenario_comparison(SUB_START, SUB_END, num_iterations=iterations)
+    return run
+
+
+BENCHMARKS = {
+    'deploy.generate_tactical_mines': bench_generate_tactical_mines,
+    'collision.check_surface_vessel_safety': bench_check_surface_vessel_safety,
+    'collision.check_submarine_safety': bench_check_submarine_safety,
+    'collision.Net3D.check_collision_3d': bench_net3d_check_collision_3d,
+    'paths.generate_scenario_path': bench_generate_scenario_path,
+    'end_to_end.run_simulation': bench_run_simulation,
+    'end_to_end.run_scenario_comparison': bench_run_scenario_comparison,
+}
+
+# End-to-end benchmarks take an iteration count and report seconds per run
+END_TO_END = {'end_to_end.run_simulation', 'end_to_end.run_scenario_comparison'}
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def time_callable(func, repeat: int):
+    """Seconds per call as (number, [per-call time of each repeat])"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_TIME:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(MIN_REPEAT_TIME / elapsed * 1.2))
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return number, timings
+
+
+def prepare_simulation(threat_level: ThreatLevel, points: int) -> TacticalMineSimulation:
+    """Simulation with one deployed mine field, as the collision benchmarks expect"""
+    config = TacticalMineConfig(threat_level=threat_level, path_sampling_points=points)
+    sim = TacticalMineSimulation(config)
+    sim.generate_tactical_mines(SURFACE_START, SURFACE_END, seed=0)
+    return sim
+
+
+def run_suite(threat_levels, sampling_points, pattern: str, repeat: int,
+              iterations: int):
+    results = []
+    for name, factory in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        for threat_level in threat_levels:
+            for points in sampling_points:
+                sim = prepare_simulation(threat_level, points)
+                if name in END_TO_END:
+                    func = factory(sim, iterations)
+                else:
+                    func = factory(sim)
+                number, timings = time_callable(func, repeat)
+
+                record = {
+                    'benchmark': name,
+                    'threat_level': threat_level.name,
+                    'path_sampling_points': points,
+                    'unit': 'seconds/call',
+                    'min': min(timings),
+                    'median': statistics.median(timings),
+                    'mean': statistics.fmean(timings),
+                    'repeat': repeat,
+                    'number': number,
+                }
+                if name in END_TO_END:
+                    record['iterations'] = iterations
+                results.append(record)
+                print(f"{name:<40} {threat_level.name:<9} {points:>5} pts "
+                      f"{record['median']*1000:>10.3f} ms")
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def metadata() -> dict:
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def _key(record):
+    return record['benchmark'], record['threat_level'], record['path_sampling_points']
+
+
+def compare(old_file: str, new_file: str, threshold: float) -> int:
+    """Print median ratios new/old and return the number of regressions"""
+    with open(old_file, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_file, encoding='utf-8') as f:
+        new = json.load(f)
+    baseline = {_key(r): r for r in old['results']}
+
+    print(f"Comparing {old['metadata']['commit']} -> {new['metadata']['commit']} "
+          f"(regression threshold {threshold:.2f}x)\n")
+    print(f"{'Benchmark':<40} {'Threat':<9} {'Pts':>5} {'Old ms':>10} {'New ms':>10} "
+          f"{'Ratio':>7}")
+    print("-"*86)
+
+    regressions = 0
+    for record in new['results']:
+        before = baseline.get(_key(record))
+        if before is None:
+            continue
+        ratio = record['median'] / before['median']
+        flag = ''
+        if ratio > threshold:
+            regressions += 1
+            flag = '  ✗ slower'
+        elif ratio < 1 / threshold:
+            flag = '  ✓ faster'
+        print(f"{record['benchmark']:<40} {record['threat_level']:<9} "
+              f"{record['path_sampling_points']:>5} {before['median']*1000:>10.3f} "
+              f"{record['median']*1000:>10.3f} {ratio:>6.2f}x{flag}")
+
+    print(f"\n{regressions} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default='',
+                        help='only run benchmarks whose name contains this substring')
+    parser.add_argument('--quick', action='store_true',
+                        help='HIGH threat and 200 path points only, 3 repeats')
+    parser.add_argument('--iterations', type=int, default=20,
+                        help='iterations per end-to-end run (default: 20)')
+    parser.add_argument('--output', help='JSON output path (default: results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='compare two result files instead of running')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='slowdown ratio counted as a regression (default: 1.10)')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    print("="*72)
+    print("Naval Simulator Benchmarks".center(72))
+    print("="*72)
+
+    threat_levels = [ThreatLevel.HIGH] if args.quick else list(ThreatLevel)
+    sampling_points = QUICK_PATH_SAMPLING_POINTS if args.quick else PATH_SAMPLING_POINTS
+    results = run_suite(threat_levels, sampling_points, args.pattern,
+                        3 if args.quick else REPEAT, args.iterations)
+
+    info = metadata()
+    output = args.output or os.path.join(RESULTS_DIR, f"{info['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': info, 'results': results}, f, indent=2)
+
+    print("\n" + "="*72)
+    print(f"✓ Saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
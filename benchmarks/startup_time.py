@@ -0,0 +1,83 @@
+"""
+Package import and worker startup benchmark
+Times, in fresh interpreters:
+  - import src: what every headless batch worker pays
+  - import src + src.create_comparison_dashboard: the first plot, which
+    loads matplotlib through the lazy visualization import
+  - a spawned process-pool worker running its first task
+and fails (exit status 1) if importing src, or starting a worker, loads
+matplotlib.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+REPEAT = 5
+
+IMPORT_PACKAGE = "import src"
+IMPORT_PLOTTING = "import src; src.create_comparison_dashboard"
+
+
+def time_import(statement: str) -> dict:
+    """Median import time of ``statement`` in a fresh interpreter, and whether it loaded matplotlib"""
+    probe = ("import sys, time\n"
+             "start = time.perf_counter()\n"
+             f"{statement}\n"
+             "print(time.perf_counter() - start, 'matplotlib' in sys.modules)")
+    seconds, loaded = [], False
+    for _ in range(REPEAT):
+        output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.split()
+        seconds.append(float(output[0]))
+        loaded = output[1] == 'True'
+    return {'median': statistics.median(seconds), 'matplotlib': loaded}
+
+
+def _worker_probe() -> bool:
+    from src.simulation import TacticalMineSimulation  # noqa: F401
+    return 'matplotlib' in sys.modules
+
+
+def time_worker_startup() -> dict:
+    """Median time for a spawned pool worker to start and run its first task"""
+    seconds, loaded = [], False
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            loaded = pool.submit(_worker_probe).result()
+        seconds.append(time.perf_counter() - start)
+    return {'median': statistics.median(seconds), 'matplotlib': loaded}
+
+
+def main():
+    print("="*60)
+    print("Startup Time Benchmark".center(60))
+    print("="*60)
+
+    results = {
+        IMPORT_PACKAGE: time_import(IMPORT_PACKAGE),
+        IMPORT_PLOTTING: time_import(IMPORT_PLOTTING),
+        'spawned worker, first task': time_worker_startup(),
+    }
+    for name, result in results.items():
+        flag = 'matplotlib loaded' if result['matplotlib'] else 'no matplotlib'
+        print(f"{name:<50} {result['median']*1000:>8.1f} ms   {flag}")
+
+    failures = [name for name in (IMPORT_PACKAGE, 'spawned worker, first task')
+                if results[name]['matplotlib']]
+    if failures:
+        print(f"\n✗ matplotlib imported by: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✓ import src and pool workers do not load matplotlib")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Deployment equivalence check
+Verifies that the batched mine deployment in generate_tactical_mines draws
+from the same distributions as the legacy one-mine-at-a-time generator.
+
+Method: both generators deploy NUM_FIELDS mine fields from independent seeds
+and every comparison uses a two-sample Kolmogorov-Smirnov test. KS assumes
+independent samples, so only quantities that are independent across mines
+are pooled over fields:
+  - random mines: x, y and z
+  - linear mines: perpendicular offset from the core route and z
+Linear mines of one field share a single spacing draw, so their along-track
+positions are compared through one value per field (the along-track step
+between consecutive linear mines), together with the per-field count of
+linear mines. The batched generator only changes the order in which random
+numbers are drawn, so every comparison should pass at the ALPHA significance
+level (a single marginal failure across many columns would still be
+consistent with chance; a systematic failure is a bug).
+"""
+
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.stats import ks_2samp
+
+from src.config import TacticalMineConfig, ThreatLevel
+from src.minefield import MineType, Placement
+from src.simulation import TacticalMineSimulation
+
+NUM_FIELDS = 300
+ALPHA = 0.001
+
+
+def legacy_deploy(config, start, end, seed):
+    """Reference copy of the original per-mine deployment loops
+
+    Returns rows of (type, placement, x, y, z) for one mine field.
+    """
+    np.random.seed(seed)
+    total_mines = config.threat_level.value[0]
+    num_surface = int(total_mines * 0.3)
+    num_moored = int(total_mines * 0.4)
+    num_bottom = total_mines - num_surface - num_moored
+
+    direction = np.array([end[0] - start[0], end[1] - start[1]])
+    direction = direction / np.linalg.norm(direction)
+    perpendicular = np.array([-direction[1], direction[0]])
+    route_length = np.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
+    mid_x = (start[0] + end[0]) / 2
+    mid_y = (start[1] + end[1]) / 2
+
+    classes = [
+        (MineType.SURFACE, num_surface, config.surface_mine_spacing,
+         config.core_route_width / 3, 4, config.surface_mine_depth_range),
+        (MineType.MOORED, num_moored, config.subsurface_mine_spacing,
+         config.core_route_width / 2, 3, config.subsurface_mine_depth_range),
+        (MineType.BOTTOM, num_bottom, config.subsurface_mine_spacing,
+         config.core_route_width / 2, 3, None),
+    ]
+
+    rows = []
+    for mine_type, count, spacing_range, half_width, spread, depth_range in classes:
+        num_linear = int(count * config.linear_density)
+        spacing = np.random.uniform(*spacing_range)
+        num_line_mines = int(route_length / spacing)
+        placed = 0
+
+        for i in range(min(num_linear, num_line_mines)):
+            t = i / max(num_line_mines - 1, 1)
+            offset = np.random.uniform(-half_width, half_width)
+            x = start[0] + t * (end[0] - start[0]) + offset * perpendicular[0]
+            y = start[1] + t * (end[1] - start[1]) + offset * perpendicular[1]
+            z = np.random.uniform(*depth_range) if depth_range else config.max_depth
+            rows.append((mine_type, Placement.LINEAR,
+                         np.clip(x, 0, config.area_width),
+                         np.clip(y, 0, config.area_height), z))
+            placed += 1
+
+        for _ in range(count - placed):
+            x = np.random.normal(mid_x, config.area_width / spread)
+            y = np.random.normal(mid_y, config.area_height / spread)
+            z = np.random.uniform(*depth_range) if depth_range else config.max_depth
+            rows.append((mine_type, Placement.RANDOM,
+                         np.clip(x, 0, config.area_width),
+                         np.clip(y, 0, config.area_height), z))
+
+    return np.array(rows, dtype=np.float64)
+
+
+def batched_deploy(sim, start, end, seed):
+    """Rows of (type, placement, x, y, z) from generate_tactical_mines"""
+    sim.generate_tactical_mines(start, end, seed=seed)
+    f = sim.minefield
+    return np.column_stack([f.kind, f.placement, f.x, f.y, f.z])
+
+
+def main():
+    print("="*60)
+    print("Deployment Equivalence Check".center(60))
+    print("="*60)
+
+    config = TacticalMineConfig(threat_level=ThreatLevel.HIGH)
+    sim = TacticalMineSimulation(config)
+    start, end = (1000, 1000), (9000, 9000)
+
+    legacy = [legacy_deploy(config, start, end, seed)
+              for seed in range(NUM_FIELDS)]
+    batched = [batched_deploy(sim, start, end, seed)
+               for seed in range(NUM_FIELDS, 2 * NUM_FIELDS)]
+
+    print(f"\n{NUM_FIELDS} fields per generator, KS test at alpha={ALPHA}\n")
+    print(f"{'Sample':<28} {'KS stat':>10} {'p-value':>10}  Result")
+    print("-"*60)
+
+    failures = 0
+
+    def report(label, a, b):
+        nonlocal failures
+        if np.ptp(a) == 0 and np.ptp(b) == 0:
+            passed = np.allclose(a[0], b[0])
+            stat, p = 0.0, 1.0 if passed else 0.0
+        else:
+            stat, p = ks_2samp(a, b)
+            passed = p >= ALPHA
+        failures += not passed
+        print(f"{label:<28} {stat:>10.4f} {p:>10.4f}  {'✓' if passed else '✗'}")
+
+    direction = np.array([end[0] - start[0], end[1] - start[1]], dtype=float)
+    direction /= np.linalg.norm(direction)
+    perpendicular = np.array([-direction[1], direction[0]])
+
+    def select(fields, mine_type, placement):
+        return [r[(r[:, 0] == mine_type) & (r[:, 1] == placement)] for r in fields]
+
+    def linear_offsets(fields):
+        return np.concatenate([(r[:, 2:4] - start) @ perpendicular for r in fields])
+
+    def linear_steps(fields):
+        return np.array([np.median(np.diff(np.sort((r[:, 2:4] - start) @ direction)))
+                         for r in fields if len(r) > 1])
+
+    for mine_type in MineType:
+        name = mine_type.name.lower()
+
+        rand_l = np.vstack(select(legacy, mine_type, Placement.RANDOM))
+        rand_b = np.vstack(select(batched, mine_type, Placement.RANDOM))
+        for col, axis in zip((2, 3, 4), "xyz"):
+            report(f"{name}/random {axis}", rand_l[:, col], rand_b[:, col])
+
+        lin_l = select(legacy, mine_type, Placement.LINEAR)
+        lin_b = select(batched, mine_type, Placement.LINEAR)
+        report(f"{name}/linear offset", linear_offsets(lin_l), linear_offsets(lin_b))
+        report(f"{name}/linear z", np.concatenate([r[:, 4] for r in lin_l]),
+               np.concatenate([r[:, 4] for r in lin_b]))
+        report(f"{name}/linear step", linear_steps(lin_l), linear_steps(lin_b))
+        report(f"{name}/linear count", np.array([len(r) for r in lin_l], float),
+               np.array([len(r) for r in lin_b], float))
+
+    print("\n" + "="*60)
+    if failures:
+        print(f"✗ {failures} distribution(s) differ")
+        sys.exit(1)
+    print("✓ Batched and legacy deployment are statistically equivalent")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Parameter sweep example
+Sweeps threat level and linear deployment density, streaming results as
+they complete. Results are cached in ./output/sweep_cache, so running the
+example again returns immediately.
+"""
+
+import sys
+sys.path.append('..')
+
+from src.config import TacticalMineConfig, ThreatLevel
+from src.sweep import run_sweep
+
+
+def main():
+    print("="*60)
+    print("Parameter Sweep Example".center(60))
+    print("="*60)
+    
+    grid = {
+        'threat_level': [ThreatLevel.MODERATE, ThreatLevel.HIGH, ThreatLevel.CRITICAL],
+        'linear_density': [0.5, 0.7, 0.9],
+    }
+    base_config = TacticalMineConfig(path_sampling_points=100)
+    
+    print(f"\n{'Threat':<10} {'Linear':>7} {'Surface':>9} {'Submarine':>10}  Source")
+    print("-"*60)
+    for result in run_sweep(grid, base_config, num_iterations=100, seed=0, workers=2):
+        stats = result.stats
+        print(f"{result.params['threat_level'].name:<10} "
+              f"{result.params['linear_density']:>7.1f} "
+              f"{stats['surface_vessel']['any_hit_prob']*100:>8.1f}% "
+              f"{stats['submarine']['any_hit_prob']*100:>9.1f}%  "
+              f"{'cache' if result.cached else 'run'}")
+    
+    print("\n" + "="*60)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Risk service example
+Starts a RiskService on a temporary Unix socket and queries it from two
+stand-in clients, one of them sending the same query twice.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+sys.path.append('..')
+
+from src.service import RiskService, ServiceClient
+
+
+def print_progress(event):
+    risk = event['any_hit_prob']['surface_vessel']
+    print(f"  {event['completed']:>5}/{event['total']} iterations, "
+          f"surface vessel risk so far {risk*100:.1f}%")
+
+
+async def run():
+    socket_path = os.path.join(tempfile.mkdtemp(), 'risk.sock')
+    high = {'config': {'threat_level': 'HIGH'}, 'num_iterations': 2000, 'batch_size': 250}
+    critical = {'config': {'threat_level': 'CRITICAL', 'collision_mode': 'swept'},
+                'num_iterations': 1000, 'batch_size': 250}
+
+    async with RiskService(workers=2, chunk_size=500) as service:
+        server = await service.serve(socket_path)
+        async with await ServiceClient.connect(socket_path) as planner, \
+                   await ServiceClient.connect(socket_path) as analyst:
+            print("HIGH query progress:")
+            results = await asyncio.gather(planner.query(high, print_progress),
+                                           analyst.query(high),
+                                           analyst.query(critical))
+        server.close()
+        await server.wait_closed()
+
+    for name, stats in zip(('HIGH (planner)', 'HIGH (analyst)', 'CRITICAL'), results):
+        print(f"{name:<15} surface {stats['surface_vessel']['any_hit_prob']*100:5.1f}%  "
+              f"submarine {stats['submarine']['any_hit_prob']*100:5.1f}%")
+    print(f"Service counters: {service.counters}")
+
+
+def main():
+    print("="*60)
+    print("Risk Service Example".center(60))
+    print("="*60)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Route optimization example
+Searches for the lowest-risk surface vessel route with the cross-entropy
+method, then checks the result on fresh mine fields.
+"""
+
+import sys
+sys.path.append('..')
+
+from src.config import TacticalMineConfig, ThreatLevel
+from src.random_streams import batch_rng
+from src.route_optimizer import RouteOptimizer
+from src.simulation import TacticalMineSimulation
+
+
+def main():
+    print("="*60)
+    print("Route Optimization Example".center(60))
+    print("="*60)
+    
+    config = TacticalMineConfig(threat_level=ThreatLevel.HIGH)
+    sim = TacticalMineSimulation(config)
+    start, end = (1000, 1000), (9000, 9000)
+    
+    # Fixed fields to optimize on, and independent fields to validate on
+    fields = sim.generate_minefield_batch(start, end, 200, rng=batch_rng(0, 0))
+    validation = sim.generate_minefield_batch(start, end, 500, rng=batch_rng(1, 0))
+    
+    optimizer = RouteOptimizer(sim, fields, start, end, vessel='surface_vessel')
+    direct = optimizer.evaluate([start, end])
+    best = optimizer.optimize(generations=15, population=40, verbose=True)
+    
+    print(f"\nDirect route risk:     {direct['any_hit_prob']*100:.1f}%")
+    print(f"Optimized route risk:  {best['any_hit_prob']*100:.1f}% "
+          f"({best['length']/1000:.1f} km)")
+    checked = optimizer.evaluate(best['waypoints'], fields=validation)
+    print(f"On fresh fields:       {checked['any_hit_prob']*100:.1f}%")
+    print(f"Leg cache:             {best['cache_hits']} hits, {best['cache_misses']} misses")
+    print("\nWaypoints:")
+    for x, y, _ in best['waypoints']:
+        print(f"  ({x:.0f}, {y:.0f})")
+    
+    print("\n" + "="*60)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -6,10 +6,14 @@ Naval Mine Warfare Simulator
 __version__ = "3.0.0"
 __author__ = "Your Name"
 
+from importlib import import_module
+
 from .config import TacticalMineConfig, ThreatLevel, RouteScenario
 from .mine_objects import SurfaceMine, MooredMine, BottomMine, Net3D
 from .simulation import TacticalMineSimulation
-from .visualization import create_comparison_dashboard
+
+# Plotting pulls in matplotlib, so it is imported on first use only
+_LAZY_ATTRIBUTES = {'create_comparison_dashboard': '.visualization'}
 
 __all__ = [
     'TacticalMineConfig',
@@ -21,4 +25,17 @@ __all__ = [
     'Net3D',
     'TacticalMineSimulation',
     'create_comparison_dashboard'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Persistent mine field archive backed by memory-mapped .npy arrays
+"""
+
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .config import TacticalMineConfig
+from .minefield import MinefieldBatch
+from .random_streams import batch_rng, iteration_rng
+from .simulation import TacticalMineSimulation
+from .util import canonical_value, config_hash
+
+# Config fields that do not influence mine and net deployment
+DEPLOYMENT_NEUTRAL_FIELDS = ('vessel_width', 'vessel_draft', 'submarine_width',
+                             'num_simulations', 'path_sampling_points', 'spatial_index',
+                             'collision_mode', 'profiling', 'hit_mode')
+
+# MinefieldBatch attributes stored as one .npy file each
+ARRAYS = ('positions', 'radius', 'kind', 'placement',
+          'net_endpoints', 'net_z_top', 'net_z_bottom', 'net_width')
+
+# Arrays with a leading per-field axis; the others are shared by all fields
+_PER_FIELD = ('positions', 'placement', 'net_endpoints', 'net_z_top', 'net_z_bottom')
+
+
+def deployment_hash(config: TacticalMineConfig, start: Tuple[float, float],
+                    end: Tuple[float, float], batch_size: int = None) -> str:
+    """Config hash of everything that determines the deployed fields
+
+    ``batch_size`` selects the random streams: None for the per-iteration
+    streams of run_simulation, an int for the batch streams of
+    run_simulation(batch_size=...).
+    """
+    return config_hash(config, exclude=DEPLOYMENT_NEUTRAL_FIELDS,
+                       start=start, end=end, batch_size=batch_size)
+
+
+class MinefieldArchive:
+    """Directory of deployed mine field batches indexed by (config hash, seed)
+
+    Each entry lives in ``<root>/<hash>/seed_<seed>/`` as one .npy file per
+    MinefieldBatch array plus ``meta.json``. Field i of an entry is exactly
+    the field iteration i of run_simulation deploys for the same config,
+    route, seed and batch_size, so archived fields can stand in for
+    redeployment. Entries load as read-only memory maps: opening one costs
+    nothing and only the fields actually touched are read from disk.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str, seed: int) -> str:
+        return os.path.join(self.root, key, f"seed_{int(seed)}")
+
+    def meta(self, key: str, seed: int) -> Optional[Dict]:
+        """Metadata of an entry, or None if it does not exist"""
+        try:
+            with open(os.path.join(self.path(key, seed), 'meta.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def entries(self) -> List[Dict]:
+        """Metadata of every stored entry"""
+        found = []
+        for key in sorted(os.listdir(self.root)):
+            key_dir = os.path.join(self.root, key)
+            if not os.path.isdir(key_dir):
+                continue
+            for name in sorted(os.listdir(key_dir)):
+                if name.startswith('seed_'):
+                    meta = self.meta(key, int(name[len('seed_'):]))
+                    if meta is not None:
+                        found.append(meta)
+        return found
+
+    def load_key(self, key: str, seed: int = 0, mmap: bool = True) -> MinefieldBatch:
+        """Open an entry by hash and seed; raises KeyError if it does not exist"""
+        if self.meta(key, seed) is None:
+            raise KeyError(f"No archived fields for hash {key[:12]}... seed {seed}")
+        entry = self.path(key, seed)
+        mode = 'r' if mmap else None
+        return MinefieldBatch(*(np.load(os.path.join(entry, f"{name}.npy"), mmap_mode=mode)
+                                for name in ARRAYS))
+
+    def load(self, config: TacticalMineConfig, start: Tuple[float, float],
+             end: Tuple[float, float], seed: int = 0, batch_size: int = None,
+             mmap: bool = True) -> MinefieldBatch:
+        """Open the fields archived for a config, route and seed"""
+        return self.load_key(deployment_hash(config, start, end, batch_size), seed, mmap)
+
+    def create(self, sim: TacticalMineSimulation, start: Tuple[float, float],
+               end: Tuple[float, float], num_fields: int, seed: int = 0,
+               batch_size: int = None) -> MinefieldBatch:
+        """Deploy ``num_fields`` fields with ``sim`` and archive them, replacing any entry
+
+        Fields are generated block by block straight into the memory-mapped
+        files, so the library can be far larger than memory. The entry is
+        written to a temporary directory and renamed into place.
+        """
+        if num_fields < 1:
+            raise ValueError("num_fields must be at least 1")
+        key = deployment_hash(sim.config, start, end, batch_size)
+        entry = self.path(key, seed)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        arrays = None
+        step = batch_size or 1
+        for lo in range(0, num_fields, step):
+            hi = min(lo + step, num_fields)
+            if batch_size:
+                block = sim.generate_minefield_batch(start, end, hi - lo,
+                                                     rng=batch_rng(seed, lo // batch_size))
+            else:
+                block = sim.generate_minefield_batch(start, end, 1, rng=iteration_rng(seed, lo))
+            if arrays is None:
+                arrays = {name: _create_array(tmp, name, getattr(block, name), num_fields)
+                          for name in ARRAYS}
+            for name in _PER_FIELD:
+                arrays[name][lo:hi] = getattr(block, name)
+        for array in arrays.values():
+            array.flush()
+        del arrays
+
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'seed': seed, 'num_fields': num_fields,
+                       'batch_size': batch_size, 'start': canonical_value(start),
+                       'end': canonical_value(end),
+                       'threat_level': sim.config.threat_level.name}, f, indent=2)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        return self.load_key(key, seed)
+
+    def get_or_create(self, sim: TacticalMineSimulation, start: Tuple[float, float],
+                      end: Tuple[float, float], num_fields: int, seed: int = 0,
+                      batch_size: int = None) -> MinefieldBatch:
+        """First ``num_fields`` archived fields, deploying them if the entry is too short"""
+        key = deployment_hash(sim.config, start, end, batch_size)
+        meta = self.meta(key, seed)
+        if meta is None or meta['num_fields'] < num_fields:
+            return self.create(sim, start, end, num_fields, seed, batch_size)
+        return self.load_key(key, seed).slice(0, num_fields)
+
+
+def _create_array(directory: str, name: str, sample: np.ndarray,
+                  num_fields: int) -> np.ndarray:
+    """Memory-mapped .npy file for one array; shared arrays are written at once"""
+    path = os.path.join(directory, f"{name}.npy")
+    if name in _PER_FIELD:
+        return open_memmap(path, mode='w+', dtype=sample.dtype,
+                           shape=(num_fields,) + sample.shape[1:])
+    array = open_memmap(path, mode='w+', dtype=sample.dtype, shape=sample.shape)
+    array[...] = sample
+    return array
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Checkpoint files for resumable simulation runs
+"""
+
+import json
+import os
+from typing import Dict
+
+# Bump when the checkpoint layout changes
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, state: Dict):
+    """Write a checkpoint atomically: a crash mid-write keeps the previous one"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(dict(state, version=CHECKPOINT_VERSION), f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str, kind: str) -> Dict:
+    """Read a checkpoint written for a job of the given kind"""
+    with open(path, encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')!r} in {path}")
+    if state.get('kind') != kind:
+        raise ValueError(f"{path} is a {state.get('kind')!r} checkpoint, not {kind!r}")
+    return state
\ No newline at end of file
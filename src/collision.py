@@ -0,0 +1,123 @@
+"""
+Vectorized geometric kernels for collision detection
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+def point_segment_distance_sq(points: np.ndarray, seg_start: np.ndarray,
+                              seg_end: np.ndarray) -> np.ndarray:
+    """Squared distance from points to line segments
+
+    All arguments have shape (..., D) and broadcast against each other.
+    Degenerate segments fall back to the distance to ``seg_start``.
+    """
+    segment = seg_end - seg_start
+    point_vec = points - seg_start
+
+    segment_length_sq = np.sum(segment * segment, axis=-1)
+    degenerate = segment_length_sq < 1e-6
+    t = np.sum(point_vec * segment, axis=-1) / np.where(degenerate, 1.0, segment_length_sq)
+    t = np.where(degenerate, 0.0, np.clip(t, 0, 1))
+
+    offset = point_vec - t[..., None] * segment
+    return np.sum(offset * offset, axis=-1)
+
+
+def segment_distance_sq_2d(p1: np.ndarray, p2: np.ndarray,
+                           q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
+    """Squared minimum distance between 2D segments p1-p2 and q1-q2
+
+    All arguments have shape (..., 2) and broadcast against each other.
+    Properly crossing segments have distance zero; otherwise the minimum is
+    attained at one of the four endpoints.
+    """
+    p1x, p1y, p2x, p2y = p1[..., 0], p1[..., 1], p2[..., 0], p2[..., 1]
+    q1x, q1y, q2x, q2y = q1[..., 0], q1[..., 1], q2[..., 0], q2[..., 1]
+    px, py = p2x - p1x, p2y - p1y
+    qx, qy = q2x - q1x, q2y - q1y
+    p_len_sq = px * px + py * py
+    q_len_sq = qx * qx + qy * qy
+
+    dist_sq = np.minimum(
+        np.minimum(_endpoint_distance_sq(p1x - q1x, p1y - q1y, qx, qy, q_len_sq),
+                   _endpoint_distance_sq(p2x - q1x, p2y - q1y, qx, qy, q_len_sq)),
+        np.minimum(_endpoint_distance_sq(q1x - p1x, q1y - p1y, px, py, p_len_sq),
+                   _endpoint_distance_sq(q2x - p1x, q2y - p1y, px, py, p_len_sq)))
+
+    d1 = qx * (p1y - q1y) - qy * (p1x - q1x)
+    d2 = qx * (p2y - q1y) - qy * (p2x - q1x)
+    d3 = px * (q1y - p1y) - py * (q1x - p1x)
+    d4 = px * (q2y - p1y) - py * (q2x - p1x)
+    crossing = (d1 * d2 < 0) & (d3 * d4 < 0)
+
+    return np.where(crossing, 0.0, dist_sq)
+
+
+def polyline_legs(waypoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end points of the legs between consecutive waypoints
+
+    A single waypoint is treated as a zero-length leg.
+    """
+    if len(waypoints) == 1:
+        return waypoints, waypoints
+    return waypoints[:-1], waypoints[1:]
+
+
+def segment_disk_interval(points: np.ndarray, seg_start: np.ndarray,
+                          seg_end: np.ndarray, radius_sq) -> Tuple[np.ndarray, np.ndarray]:
+    """Parameter range [t_lo, t_hi] of each segment within a disk around each point
+
+    Arguments are 2D with shape (..., 2) and broadcast against each other;
+    the segment is ``seg_start + t * (seg_end - seg_start)`` for t in [0, 1].
+    The range is empty where t_lo > t_hi.
+    """
+    vx, vy = points[..., 0] - seg_start[..., 0], points[..., 1] - seg_start[..., 1]
+    sx, sy = seg_end[..., 0] - seg_start[..., 0], seg_end[..., 1] - seg_start[..., 1]
+    a = sx * sx + sy * sy
+    b = vx * sx + vy * sy
+    c = vx * vx + vy * vy - radius_sq
+
+    degenerate = a < 1e-6
+    disc = b * b - a * c
+    root = np.sqrt(np.maximum(disc, 0.0))
+    safe_a = np.where(degenerate, 1.0, a)
+    t_lo = np.maximum((b - root) / safe_a, 0.0)
+    t_hi = np.minimum((b + root) / safe_a, 1.0)
+
+    # Degenerate segments are a single point: all or nothing
+    inside = np.where(degenerate, c <= 0, disc >= 0)
+    t_lo = np.where(degenerate, 0.0, t_lo)
+    t_hi = np.where(degenerate, 1.0, t_hi)
+    return np.where(inside, t_lo, 1.0), np.where(inside, t_hi, 0.0)
+
+
+def segment_band_interval(z_start, z_end, band_top, band_bottom) -> Tuple[np.ndarray, np.ndarray]:
+    """Parameter range [t_lo, t_hi] of each segment inside a depth band
+
+    The segment depth is ``z_start + t * (z_end - z_start)``; arguments
+    broadcast against each other and the range is empty where t_lo > t_hi.
+    """
+    dz = z_end - z_start
+    level = np.abs(dz) < 1e-9
+    safe_dz = np.where(level, 1.0, dz)
+    t_top = (band_top - z_start) / safe_dz
+    t_bottom = (band_bottom - z_start) / safe_dz
+    t_lo = np.maximum(np.minimum(t_top, t_bottom), 0.0)
+    t_hi = np.minimum(np.maximum(t_top, t_bottom), 1.0)
+
+    inside = (band_top <= z_start) & (z_start <= band_bottom)
+    t_lo = np.where(level, np.where(inside, 0.0, 1.0), t_lo)
+    t_hi = np.where(level, np.where(inside, 1.0, 0.0), t_hi)
+    return t_lo, t_hi
+
+
+def _endpoint_distance_sq(vx, vy, sx, sy, seg_length_sq):
+    """Squared distance from a point, given relative to a segment start, to the segment"""
+    safe_length_sq = np.where(seg_length_sq < 1e-6, 1.0, seg_length_sq)
+    t = np.clip((vx * sx + vy * sy) / safe_length_sq, 0, 1)
+    t = np.where(seg_length_sq < 1e-6, 0.0, t)
+    ox = vx - t * sx
+    oy = vy - t * sy
+    return ox * ox + oy * oy
\ No newline at end of file
@@ -6,6 +6,11 @@ from dataclasses import dataclass
 from typing import Tuple
 from enum import Enum
 
+# Values accepted for TacticalMineConfig.collision_mode
+COLLISION_MODES = ('sampled', 'swept')
+# Values accepted for TacticalMineConfig.hit_mode
+HIT_MODES = ('attribution', 'any_hit')
+
 
 class ThreatLevel(Enum):
     """위협 수준"""
@@ -62,4 +67,16 @@ class TacticalMineConfig:
     
     # Simulation parameters
     num_simulations: int = 1000
-    path_sampling_points: int = 200
\ No newline at end of file
+    path_sampling_points: int = 200
+    spatial_index: bool = True  # KD-tree broad phase before exact collision tests
+    collision_mode: str = 'sampled'  # 'sampled' points or exact 'swept' legs
+    profiling: bool = False  # Per-phase timings and counters in the statistics
+    hit_mode: str = 'attribution'  # Full mine-vs-net 'attribution' or first-contact 'any_hit'
+
+    def __post_init__(self):
+        if self.collision_mode not in COLLISION_MODES:
+            raise ValueError(f"Unknown collision_mode {self.collision_mode!r}; "
+                             f"expected one of {COLLISION_MODES}")
+        if self.hit_mode not in HIT_MODES:
+            raise ValueError(f"Unknown hit_mode {self.hit_mode!r}; "
+                             f"expected one of {HIT_MODES}")
\ No newline at end of file
@@ -2,21 +2,69 @@
 Mine and net objects for naval warfare simulation
 """
 
+import math
 import numpy as np
-from typing import Tuple
+from enum import IntEnum
+from typing import Tuple, Union
 
+from .collision import (point_segment_distance_sq, polyline_legs, segment_band_interval,
+                        segment_disk_interval, segment_distance_sq_2d)
+from .paths import PathData
 
-class SurfaceMine:
+
+class MineType(IntEnum):
+    """기뢰 종류 코드"""
+    SURFACE = 0
+    MOORED = 1
+    BOTTOM = 2
+
+
+class Placement(IntEnum):
+    """부설 방식 코드"""
+    RANDOM = 0
+    LINEAR = 1
+
+
+_PLACEMENT_NAMES = {Placement.RANDOM: "random", Placement.LINEAR: "linear"}
+_PLACEMENT_CODES = {"random": Placement.RANDOM, "linear": Placement.LINEAR}
+
+
+class _Mine:
+    """Shared storage of the mine classes
+    
+    Instances hold only coordinates, radius and a Placement code in
+    ``__slots__``; the mine type is a class attribute.
+    """
+    __slots__ = ('x', 'y', 'z', 'radius', 'placement')
+    
+    type = None
+    kind = None
+    
+    def __init__(self, x: float, y: float, z: float, radius: float,
+                 placement_type: Union[str, Placement] = "random"):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        self.radius = float(radius)
+        self.placement = (Placement(placement_type) if isinstance(placement_type, int)
+                          else _PLACEMENT_CODES[placement_type])
+    
+    @property
+    def placement_type(self) -> str:
+        """Placement as 'random' or 'linear'"""
+        return _PLACEMENT_NAMES[self.placement]
+    
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(x={self.x:.1f}, y={self.y:.1f}, z={self.z:.1f}, "
+                f"radius={self.radius:g}, placement_type={self.placement_type!r})")
+
+
+class SurfaceMine(_Mine):
     """부유 기뢰 (Surface mine)"""
+    __slots__ = ()
     
-    def __init__(self, x: float, y: float, z: float, radius: float, 
-                 placement_type: str = "random"):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.radius = radius
-        self.type = "surface"
-        self.placement_type = placement_type
+    type = "surface"
+    kind = MineType.SURFACE
     
     def check_collision_2d(self, path_points: np.ndarray, vessel_width: float, 
                           vessel_draft: float) -> bool:
@@ -35,19 +83,39 @@ class SurfaceMine:
         distances = np.sqrt((surface_points[:, 0] - self.x)**2 + 
                           (surface_points[:, 1] - self.y)**2)
         return np.any(distances <= (self.radius + vessel_width/2))
+    
+    def check_collision_2d_swept(self, waypoints: np.ndarray, vessel_width: float,
+                                 vessel_draft: float) -> bool:
+        """Check 2D collision with a surface vessel sailing straight legs between waypoints"""
+        if vessel_draft < self.z or len(waypoints) == 0:
+            return False
+        start, end = polyline_legs(waypoints)
+        dist_sq = point_segment_distance_sq(np.array([self.x, self.y]), 
+                                            start[:, :2], end[:, :2])
+        return bool(np.any(dist_sq <= (self.radius + vessel_width/2)**2))
+    
+    def check_collision_3d_swept(self, waypoints: np.ndarray, vessel_width: float) -> bool:
+        """Check 3D collision with a submarine sailing straight legs between waypoints
+        
+        Hit if the part of a leg within horizontal reach comes within 20 m
+        below the mine.
+        """
+        if len(waypoints) == 0:
+            return False
+        start, end = polyline_legs(waypoints)
+        t_lo, t_hi = segment_disk_interval(np.array([self.x, self.y]), start[:, :2], 
+                                           end[:, :2], (self.radius + vessel_width/2)**2)
+        climb = end[:, 2] - start[:, 2]
+        shallowest = start[:, 2] + np.where(climb > 0, t_lo, t_hi) * climb
+        return bool(np.any((t_lo <= t_hi) & (shallowest <= self.z + 20)))
 
 
-class MooredMine:
+class MooredMine(_Mine):
     """계류 기뢰 (Moored mine)"""
+    __slots__ = ()
     
-    def __init__(self, x: float, y: float, z: float, radius: float, 
-                 placement_type: str = "random"):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.radius = radius
-        self.type = "moored"
-        self.placement_type = placement_type
+    type = "moored"
+    kind = MineType.MOORED
     
     def check_collision_3d(self, path_points: np.ndarray, vessel_width: float) -> bool:
         """Check 3D collision"""
@@ -55,19 +123,26 @@ class MooredMine:
                           (path_points[:, 1] - self.y)**2 +
                           (path_points[:, 2] - self.z)**2)
         return np.any(distances <= (self.radius + vessel_width/2))
+    
+    def check_collision_3d_swept(self, waypoints: np.ndarray, vessel_width: float) -> bool:
+        """Check 3D collision with straight legs between waypoints"""
+        if len(waypoints) == 0:
+            return False
+        start, end = polyline_legs(waypoints)
+        dist_sq = point_segment_distance_sq(np.array([self.x, self.y, self.z]), start, end)
+        return bool(np.any(dist_sq <= (self.radius + vessel_width/2)**2))
 
 
-class BottomMine:
+class BottomMine(_Mine):
     """침저 기뢰 (Bottom mine)"""
+    __slots__ = ()
+    
+    type = "bottom"
+    kind = MineType.BOTTOM
     
     def __init__(self, x: float, y: float, z_bottom: float, radius: float, 
-                 placement_type: str = "random"):
-        self.x = x
-        self.y = y
-        self.z = z_bottom
-        self.radius = radius
-        self.type = "bottom"
-        self.placement_type = placement_type
+                 placement_type: Union[str, Placement] = "random"):
+        super().__init__(x, y, z_bottom, radius, placement_type)
     
     def check_collision_3d(self, path_points: np.ndarray, vessel_width: float) -> bool:
         """Check 3D collision"""
@@ -75,54 +150,111 @@ class BottomMine:
                           (path_points[:, 1] - self.y)**2 +
                           (path_points[:, 2] - self.z)**2)
         return np.any(distances <= (self.radius + vessel_width/2))
+    
+    def check_collision_3d_swept(self, waypoints: np.ndarray, vessel_width: float) -> bool:
+        """Check 3D collision with straight legs between waypoints"""
+        if len(waypoints) == 0:
+            return False
+        start, end = polyline_legs(waypoints)
+        dist_sq = point_segment_distance_sq(np.array([self.x, self.y, self.z]), start, end)
+        return bool(np.any(dist_sq <= (self.radius + vessel_width/2)**2))
 
 
 class Net3D:
     """닻자망 (3D Net)"""
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'z_top', 'z_bottom', 'width')
+    
+    type = "net"
     
     def __init__(self, x1: float, y1: float, x2: float, y2: float, 
                  depth_top: float, depth_bottom: float, width: float):
-        self.x1, self.y1 = x1, y1
-        self.x2, self.y2 = x2, y2
-        self.z_top = depth_top
-        self.z_bottom = depth_bottom
-        self.width = width
-        self.length = np.sqrt((x2-x1)**2 + (y2-y1)**2)
-        self.type = "net"
-    
-    def check_collision_2d(self, path_points: np.ndarray, vessel_width: float,
-                          vessel_draft: float) -> bool:
-        """Check 2D collision with surface vessel"""
+        self.x1, self.y1 = float(x1), float(y1)
+        self.x2, self.y2 = float(x2), float(y2)
+        self.z_top = float(depth_top)
+        self.z_bottom = float(depth_bottom)
+        self.width = float(width)
+    
+    @property
+    def length(self) -> float:
+        """Horizontal length of the net (m)"""
+        return math.hypot(self.x2 - self.x1, self.y2 - self.y1)
+    
+    def __repr__(self) -> str:
+        return (f"Net3D(({self.x1:.1f}, {self.y1:.1f}) -> ({self.x2:.1f}, {self.y2:.1f}), "
+                f"depth={self.z_top:g}-{self.z_bottom:g}, width={self.width:g})")
+    
+    def check_collision_2d(self, path_points: Union[np.ndarray, PathData], 
+                          vessel_width: float, vessel_draft: float) -> bool:
+        """Check 2D collision with surface vessel
+        
+        A PathData path is first rejected by its bounding box.
+        """
         if vessel_draft < self.z_top:
             return False
         
         total_width = (self.width + vessel_width) / 2
         
-        for i in range(len(path_points) - 1):
-            p1 = path_points[i, :2]
-            p2 = path_points[i + 1, :2]
-            
-            if self._segment_intersects_2d(p1, p2, total_width):
-                return True
+        if isinstance(path_points, PathData):
+            if path_points.misses_box(*self._bounds(), total_width):
+                return False
+            path_points = path_points.points
         
-        return False
+        dist_sq = self._path_distance_sq(path_points)
+        return bool(np.any(dist_sq <= total_width**2))
     
-    def check_collision_3d(self, path_points: np.ndarray, vessel_width: float) -> bool:
-        """Check 3D collision with submarine"""
+    def check_collision_3d(self, path_points: Union[np.ndarray, PathData], 
+                          vessel_width: float) -> bool:
+        """Check 3D collision with submarine
+        
+        A PathData path is first rejected by its depth range and bounding box.
+        """
         total_width = (self.width + vessel_width) / 2
         
-        for i in range(len(path_points) - 1):
-            p1 = path_points[i]
-            p2 = path_points[i + 1]
-            
-            if not (self.z_top <= p1[2] <= self.z_bottom or 
-                   self.z_top <= p2[2] <= self.z_bottom):
-                continue
-            
-            if self._segment_intersects_2d(p1[:2], p2[:2], total_width):
-                return True
+        if isinstance(path_points, PathData):
+            if (path_points.misses_depth_band(self.z_top, self.z_bottom) or
+                    path_points.misses_box(*self._bounds(), total_width)):
+                return False
+            path_points = path_points.points
+        
+        z = path_points[:, 2]
+        in_band = (self.z_top <= z) & (z <= self.z_bottom)
+        active = in_band[:-1] | in_band[1:]
+        if not np.any(active):
+            return False
         
-        return False
+        dist_sq = self._path_distance_sq(path_points)
+        return bool(np.any(dist_sq[active] <= total_width**2))
+    
+    def check_collision_3d_swept(self, waypoints: np.ndarray, vessel_width: float) -> bool:
+        """Check 3D collision with a submarine sailing straight legs between waypoints
+        
+        Only the part of each leg inside the net's depth band is tested.
+        """
+        if len(waypoints) == 0:
+            return False
+        start, end = polyline_legs(waypoints)
+        t_lo, t_hi = segment_band_interval(start[:, 2], end[:, 2], self.z_top, self.z_bottom)
+        active = t_lo <= t_hi
+        if not np.any(active):
+            return False
+        heading = end[active, :2] - start[active, :2]
+        p1 = start[active, :2] + t_lo[active, None] * heading
+        p2 = start[active, :2] + t_hi[active, None] * heading
+        q1 = np.array([self.x1, self.y1])
+        q2 = np.array([self.x2, self.y2])
+        dist_sq = segment_distance_sq_2d(p1, p2, q1, q2)
+        return bool(np.any(dist_sq <= ((self.width + vessel_width) / 2)**2))
+    
+    def _bounds(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """Horizontal bounding box of the net as (lower, upper) corners"""
+        return ((min(self.x1, self.x2), min(self.y1, self.y2)),
+                (max(self.x1, self.x2), max(self.y1, self.y2)))
+    
+    def _path_distance_sq(self, path_points: np.ndarray) -> np.ndarray:
+        """Squared 2D distance from the net to every path segment"""
+        q1 = np.array([self.x1, self.y1])
+        q2 = np.array([self.x2, self.y2])
+        return segment_distance_sq_2d(path_points[:-1, :2], path_points[1:, :2], q1, q2)
     
     def _segment_intersects_2d(self, p1: np.ndarray, p2: np.ndarray, 
                               safe_distance: float) -> bool:
@@ -130,12 +262,7 @@ class Net3D:
         q1 = np.array([self.x1, self.y1])
         q2 = np.array([self.x2, self.y2])
         
-        dist1 = self._point_to_segment_distance(p1, q1, q2)
-        dist2 = self._point_to_segment_distance(p2, q1, q2)
-        dist3 = self._point_to_segment_distance(q1, p1, p2)
-        dist4 = self._point_to_segment_distance(q2, p1, p2)
-        
-        return min(dist1, dist2, dist3, dist4) <= safe_distance
+        return bool(segment_distance_sq_2d(p1, p2, q1, q2) <= safe_distance**2)
     
     def _point_to_segment_distance(self, point: np.ndarray, 
                                    seg_start: np.ndarray, seg_end: np.ndarray) -> float:
@@ -0,0 +1,870 @@
+"""
+Array-backed mine field storage and vectorized collision tests
+"""
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from .collision import (point_segment_distance_sq, polyline_legs, segment_band_interval,
+                        segment_disk_interval, segment_distance_sq_2d)
+from .spatial import FieldIndex, PathIndex
+from .mine_objects import (SurfaceMine, MooredMine, BottomMine, Net3D,
+                           MineType, Placement)
+
+
+# Depth margin above a surface mine inside which a submarine can trigger it
+SURFACE_MINE_DEPTH_GATE = 20
+
+
+_MINE_CLASSES = {
+    MineType.SURFACE: SurfaceMine,
+    MineType.MOORED: MooredMine,
+    MineType.BOTTOM: BottomMine,
+}
+
+# Record layouts of Minefield.to_records and NetField.to_records
+MINE_RECORD_DTYPE = np.dtype([('x', np.float64), ('y', np.float64), ('z', np.float64),
+                              ('radius', np.float64), ('kind', np.int8),
+                              ('placement', np.int8)])
+NET_RECORD_DTYPE = np.dtype([('x1', np.float64), ('y1', np.float64),
+                             ('x2', np.float64), ('y2', np.float64),
+                             ('z_top', np.float64), ('z_bottom', np.float64),
+                             ('width', np.float64)])
+
+
+class Minefield:
+    """Structure-of-arrays mine field (기뢰원)
+
+    Every mine is one row across the contiguous ``x``, ``y``, ``z``,
+    ``radius``, ``kind`` and ``placement`` arrays, so collision tests run as
+    a single mines-by-path-points array operation instead of one Python call
+    per mine object.
+    """
+
+    def __init__(self, x, y, z, radius, kind, placement):
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.z = np.ascontiguousarray(z, dtype=np.float64)
+        self.radius = np.ascontiguousarray(radius, dtype=np.float64)
+        self.kind = np.ascontiguousarray(kind, dtype=np.int8)
+        self.placement = np.ascontiguousarray(placement, dtype=np.int8)
+        self._index = None
+        self._types = {}
+        self._routes = {}
+
+    @classmethod
+    def empty(cls) -> "Minefield":
+        """Create a mine field without any mines"""
+        return cls(*([np.empty(0)] * 6))
+
+    @classmethod
+    def from_mines(cls, mines: Sequence) -> "Minefield":
+        """Build a mine field from SurfaceMine/MooredMine/BottomMine objects"""
+        return cls([m.x for m in mines], [m.y for m in mines],
+                   [m.z for m in mines], [m.radius for m in mines],
+                   [m.kind for m in mines], [m.placement for m in mines])
+
+    @classmethod
+    def concatenate(cls, fields: Sequence["Minefield"]) -> "Minefield":
+        """Join several mine fields into one"""
+        return cls(*(np.concatenate([getattr(f, name) for f in fields])
+                     for name in ("x", "y", "z", "radius", "kind", "placement")))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Mine positions as an (M, 3) array"""
+        return np.stack([self.x, self.y, self.z], axis=-1)
+
+    def select(self, mask) -> "Minefield":
+        """Return the sub-field selected by a boolean mask or index array"""
+        return Minefield(self.x[mask], self.y[mask], self.z[mask],
+                         self.radius[mask], self.kind[mask], self.placement[mask])
+
+    def of_type(self, mine_type: MineType) -> "Minefield":
+        """Return the sub-field holding a single mine type, cached per type"""
+        sub = self._types.get(mine_type)
+        if sub is None:
+            sub = self._types[mine_type] = self.select(self.kind == mine_type)
+        return sub
+
+    def to_objects(self, mine_type: MineType) -> List:
+        """Materialize mines of one type as SurfaceMine/MooredMine/BottomMine views"""
+        mine_class = _MINE_CLASSES[MineType(mine_type)]
+        sub = self.of_type(mine_type)
+        return [mine_class(x, y, z, r, Placement(p))
+                for x, y, z, r, p in zip(sub.x.tolist(), sub.y.tolist(), sub.z.tolist(),
+                                         sub.radius.tolist(), sub.placement.tolist())]
+
+    def to_records(self) -> np.recarray:
+        """Mines as a record array with MINE_RECORD_DTYPE rows"""
+        records = np.empty(len(self), dtype=MINE_RECORD_DTYPE)
+        for name in MINE_RECORD_DTYPE.names:
+            records[name] = getattr(self, name)
+        return records.view(np.recarray)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "Minefield":
+        """Build a mine field from a MINE_RECORD_DTYPE record array"""
+        return cls(*(records[name] for name in MINE_RECORD_DTYPE.names))
+
+    def spatial_index(self) -> FieldIndex:
+        """KD-tree over the horizontal mine positions, built on first use"""
+        if self._index is None:
+            self._index = FieldIndex(np.stack([self.x, self.y], axis=-1))
+        return self._index
+
+    def route_split(self, start, end, corridor: float) -> Tuple["Minefield", "Minefield"]:
+        """Linear mines within ``corridor`` of the straight route start -> end, and the rest
+
+        The split is cached per route, so every path between the same
+        endpoints reuses it along with the sub-fields' spatial indexes.
+        """
+        key = _route_key(start, end) + (float(corridor),)
+        split = self._routes.get(key)
+        if split is None:
+            near = ((self.placement == Placement.LINEAR) &
+                    (route_distance_sq(self.x, self.y, start, end) <= corridor ** 2))
+            split = self._routes[key] = (self.select(near), self.select(~near))
+        return split
+
+    def check_surface_vessel(self, path_points: np.ndarray, vessel_width: float,
+                             vessel_draft: float,
+                             path_index: Optional[PathIndex] = None,
+                             swept: bool = False) -> bool:
+        """Check 2D collision of a surface vessel path with any surface mine
+
+        With a ``path_index`` only the mines the spatial index places near
+        the path get exact distance tests. With ``swept`` the path points
+        are waypoints and every leg between them is tested exactly.
+        """
+        if swept:
+            return bool(swept_surface_vessel_mine_hits(
+                self.positions[None], self.kind, self.radius,
+                path_points, vessel_width, vessel_draft)[0])
+        if path_index is not None:
+            return bool(indexed_surface_vessel_mine_hits(
+                self.spatial_index(), self.positions[None], self.kind, self.radius,
+                path_index, vessel_width, vessel_draft)[0])
+        return bool(surface_vessel_mine_hits(
+            self.positions[None], self.kind, self.radius,
+            path_points, vessel_width, vessel_draft)[0])
+
+    def check_submarine(self, path_points: np.ndarray, vessel_width: float,
+                        path_index: Optional[PathIndex] = None,
+                        swept: bool = False) -> bool:
+        """Check 3D collision of a submarine path with any mine"""
+        if swept:
+            return bool(swept_submarine_mine_hits(
+                self.positions[None], self.kind, self.radius,
+                path_points, vessel_width)[0])
+        if path_index is not None:
+            return bool(indexed_submarine_mine_hits(
+                self.spatial_index(), self.positions[None], self.kind, self.radius,
+                path_index, vessel_width)[0])
+        return bool(submarine_mine_hits(
+            self.positions[None], self.kind, self.radius,
+            path_points, vessel_width)[0])
+
+
+class NetField:
+    """Structure-of-arrays net field (닻자망)
+
+    Nets are stored as endpoint, depth band and width arrays so that every
+    net is tested against every path segment in a single array operation.
+    """
+
+    def __init__(self, x1, y1, x2, y2, z_top, z_bottom, width):
+        self.x1 = np.ascontiguousarray(x1, dtype=np.float64)
+        self.y1 = np.ascontiguousarray(y1, dtype=np.float64)
+        self.x2 = np.ascontiguousarray(x2, dtype=np.float64)
+        self.y2 = np.ascontiguousarray(y2, dtype=np.float64)
+        self.z_top = np.ascontiguousarray(z_top, dtype=np.float64)
+        self.z_bottom = np.ascontiguousarray(z_bottom, dtype=np.float64)
+        self.width = np.ascontiguousarray(width, dtype=np.float64)
+        self._index = None
+
+    @classmethod
+    def empty(cls) -> "NetField":
+        """Create a net field without any nets"""
+        return cls(*([np.empty(0)] * 7))
+
+    @classmethod
+    def from_nets(cls, nets: Sequence[Net3D]) -> "NetField":
+        """Build a net field from Net3D objects"""
+        return cls([n.x1 for n in nets], [n.y1 for n in nets],
+                   [n.x2 for n in nets], [n.y2 for n in nets],
+                   [n.z_top for n in nets], [n.z_bottom for n in nets],
+                   [n.width for n in nets])
+
+    def __len__(self) -> int:
+        return len(self.x1)
+
+    def to_objects(self) -> List[Net3D]:
+        """Materialize nets as Net3D views"""
+        return [Net3D(float(x1), float(y1), float(x2), float(y2),
+                      float(top), float(bottom), float(w))
+                for x1, y1, x2, y2, top, bottom, w in zip(
+                    self.x1, self.y1, self.x2, self.y2,
+                    self.z_top, self.z_bottom, self.width)]
+
+    def to_records(self) -> np.recarray:
+        """Nets as a record array with NET_RECORD_DTYPE rows"""
+        records = np.empty(len(self), dtype=NET_RECORD_DTYPE)
+        for name in NET_RECORD_DTYPE.names:
+            records[name] = getattr(self, name)
+        return records.view(np.recarray)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "NetField":
+        """Build a net field from a NET_RECORD_DTYPE record array"""
+        return cls(*(records[name] for name in NET_RECORD_DTYPE.names))
+
+    def segment_distance_sq(self, path_points: np.ndarray) -> np.ndarray:
+        """Squared 2D distance of every net to every path segment, shape (nets, segments)"""
+        q1 = np.stack([self.x1, self.y1], axis=-1)[:, None, :]
+        q2 = np.stack([self.x2, self.y2], axis=-1)[:, None, :]
+        return segment_distance_sq_2d(path_points[None, :-1, :2],
+                                      path_points[None, 1:, :2], q1, q2)
+
+    def spatial_index(self) -> FieldIndex:
+        """KD-tree over the net midpoints, built on first use"""
+        if self._index is None:
+            self._index = FieldIndex.for_segments(self.x1, self.y1, self.x2, self.y2)
+        return self._index
+
+    def check_collision_2d(self, path_points: np.ndarray, vessel_width: float,
+                           vessel_draft: float,
+                           path_index: Optional[PathIndex] = None,
+                           swept: bool = False) -> bool:
+        """Check 2D collision of a surface vessel path with any net
+
+        Path segments are already tested exactly, so ``swept`` only skips
+        the spatial index, which is of no use on long legs.
+        """
+        if path_index is not None and not swept:
+            return bool(indexed_net_hits_2d(
+                self.spatial_index(), self.x1[None], self.y1[None], self.x2[None],
+                self.y2[None], self.z_top[None], self.width[None], path_index,
+                vessel_width, vessel_draft)[0])
+        return bool(net_hits_2d(
+            self.x1[None], self.y1[None], self.x2[None], self.y2[None],
+            self.z_top[None], self.width[None], path_points,
+            vessel_width, vessel_draft)[0])
+
+    def check_collision_3d(self, path_points: np.ndarray, vessel_width: float,
+                           path_index: Optional[PathIndex] = None,
+                           swept: bool = False) -> bool:
+        """Check 3D collision of a submarine path with any net
+
+        A path segment is tested against a net only if one of its endpoints
+        lies inside the net's depth band. With ``swept`` the path points are
+        waypoints and only the part of each leg inside the band is tested.
+        """
+        if swept:
+            return bool(swept_net_hits_3d(
+                self.x1[None], self.y1[None], self.x2[None], self.y2[None],
+                self.z_top[None], self.z_bottom[None], self.width[None],
+                path_points, vessel_width)[0])
+        if path_index is not None:
+            return bool(indexed_net_hits_3d(
+                self.spatial_index(), self.x1[None], self.y1[None], self.x2[None],
+                self.y2[None], self.z_top[None], self.z_bottom[None], self.width[None],
+                path_index, vessel_width)[0])
+        return bool(net_hits_3d(
+            self.x1[None], self.y1[None], self.x2[None], self.y2[None],
+            self.z_top[None], self.z_bottom[None], self.width[None],
+            path_points, vessel_width)[0])
+
+
+class MinefieldBatch:
+    """Stack of K mine fields drawn in one shot
+
+    Mine positions are stored as a (K, M, 3) array; ``kind`` and ``radius``
+    have shape (M,) because every field holds the same number of mines of
+    each type, while ``placement`` varies per field with shape (K, M). Nets
+    are stored as (K, N, 2, 2) endpoint arrays (``[..., 0, :]`` is the first
+    endpoint) with (K, N) depth bands and (N,) widths.
+    """
+
+    def __init__(self, positions, radius, kind, placement,
+                 net_endpoints, net_z_top, net_z_bottom, net_width):
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64)
+        self.radius = np.ascontiguousarray(radius, dtype=np.float64)
+        self.kind = np.ascontiguousarray(kind, dtype=np.int8)
+        self.placement = np.ascontiguousarray(placement, dtype=np.int8)
+        self.net_endpoints = np.ascontiguousarray(net_endpoints, dtype=np.float64)
+        self.net_z_top = np.ascontiguousarray(net_z_top, dtype=np.float64)
+        self.net_z_bottom = np.ascontiguousarray(net_z_bottom, dtype=np.float64)
+        self.net_width = np.ascontiguousarray(net_width, dtype=np.float64)
+        self._mine_index = None
+        self._net_index = None
+        self._routes = {}
+
+    def __len__(self) -> int:
+        return self.positions.shape[0]
+
+    @property
+    def num_mines(self) -> int:
+        return self.positions.shape[1]
+
+    @property
+    def num_nets(self) -> int:
+        return self.net_endpoints.shape[1]
+
+    def slice(self, start: int, stop: int) -> "MinefieldBatch":
+        """Fields [start, stop) as a batch of views, without copying"""
+        return MinefieldBatch(self.positions[start:stop], self.radius, self.kind,
+                              self.placement[start:stop], self.net_endpoints[start:stop],
+                              self.net_z_top[start:stop], self.net_z_bottom[start:stop],
+                              self.net_width)
+
+    def field(self, index: int) -> Tuple[Minefield, NetField]:
+        """Return one field of the batch as a Minefield and NetField"""
+        pos = self.positions[index]
+        ends = self.net_endpoints[index]
+        mines = Minefield(pos[:, 0], pos[:, 1], pos[:, 2], self.radius,
+                          self.kind, self.placement[index])
+        nets = NetField(ends[:, 0, 0], ends[:, 0, 1], ends[:, 1, 0], ends[:, 1, 1],
+                        self.net_z_top[index], self.net_z_bottom[index],
+                        self.net_width)
+        return mines, nets
+
+    def spatial_index(self) -> Tuple[FieldIndex, FieldIndex]:
+        """KD-trees over the mines and nets of all fields, built on first use
+
+        Indexed objects are numbered in row-major (field, object) order.
+        """
+        return self._mines_index(), self._nets_index()
+
+    def _mines_index(self) -> FieldIndex:
+        if self._mine_index is None:
+            self._mine_index = FieldIndex(self.positions[..., :2])
+        return self._mine_index
+
+    def _nets_index(self) -> FieldIndex:
+        if self._net_index is None:
+            ends = self.net_endpoints
+            self._net_index = FieldIndex.for_segments(
+                ends[:, :, 0, 0], ends[:, :, 0, 1], ends[:, :, 1, 0], ends[:, :, 1, 1])
+        return self._net_index
+
+    def select(self, fields: np.ndarray = None, mines: np.ndarray = None) -> "MinefieldBatch":
+        """Sub-batch of the ``fields`` and mine slots ``mines`` index arrays (all if None)"""
+        batch = self if fields is None else MinefieldBatch(
+            self.positions[fields], self.radius, self.kind, self.placement[fields],
+            self.net_endpoints[fields], self.net_z_top[fields], self.net_z_bottom[fields],
+            self.net_width)
+        if mines is None:
+            return batch
+        # take() keeps the mine axis gather C-contiguous, unlike fancy indexing
+        return MinefieldBatch(np.take(batch.positions, mines, axis=1), batch.radius[mines],
+                              batch.kind[mines], np.take(batch.placement, mines, axis=1),
+                              batch.net_endpoints, batch.net_z_top, batch.net_z_bottom,
+                              batch.net_width)
+
+    def near_route(self, start, end, corridor: float) -> np.ndarray:
+        """(K, M) mask of linear mines within ``corridor`` of the straight route start -> end
+
+        Horizontal mine distances to the route are computed once per route
+        and reused by every path between the same endpoints.
+        """
+        key = _route_key(start, end)
+        dist_sq = self._routes.get(key)
+        if dist_sq is None:
+            dist_sq = self._routes[key] = route_distance_sq(
+                self.positions[..., 0], self.positions[..., 1], start, end)
+        return (self.placement == Placement.LINEAR) & (dist_sq <= corridor ** 2)
+
+    def check_surface_vessel(self, path_points: np.ndarray, vessel_width: float,
+                             vessel_draft: float, path_index: Optional[PathIndex] = None,
+                             swept: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Mine and net hit flags, shape (K,), for a surface vessel path"""
+        return (self.surface_vessel_mine_hits(path_points, vessel_width, vessel_draft,
+                                              path_index, swept),
+                self.surface_vessel_net_hits(path_points, vessel_width, vessel_draft,
+                                             path_index, swept))
+
+    def check_submarine(self, path_points: np.ndarray, vessel_width: float,
+                        path_index: Optional[PathIndex] = None,
+                        swept: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Mine and net hit flags, shape (K,), for a submarine path"""
+        return (self.submarine_mine_hits(path_points, vessel_width, path_index, swept),
+                self.submarine_net_hits(path_points, vessel_width, path_index, swept))
+
+    def first_contact_surface_vessel(self, path_points: np.ndarray, vessel_width: float,
+                                     vessel_draft: float, priority: np.ndarray,
+                                     path_index: Optional[PathIndex] = None,
+                                     swept: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Mine and net hit flags of a surface vessel path, stopping at the first contact
+
+        See _first_contact; ``priority`` is a (K, M) mask such as near_route().
+        """
+        return self._first_contact(
+            priority,
+            lambda batch: batch.surface_vessel_mine_hits(path_points, vessel_width,
+                                                         vessel_draft, path_index, swept),
+            lambda batch: batch.surface_vessel_net_hits(path_points, vessel_width,
+                                                        vessel_draft, path_index, swept))
+
+    def first_contact_submarine(self, path_points: np.ndarray, vessel_width: float,
+                                priority: np.ndarray, path_index: Optional[PathIndex] = None,
+                                swept: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Mine and net hit flags of a submarine path, stopping at the first contact
+
+        See _first_contact; ``priority`` is a (K, M) mask such as near_route().
+        """
+        return self._first_contact(
+            priority,
+            lambda batch: batch.submarine_mine_hits(path_points, vessel_width,
+                                                    path_index, swept),
+            lambda batch: batch.submarine_net_hits(path_points, vessel_width,
+                                                   path_index, swept))
+
+    def _first_contact(self, priority: np.ndarray, mine_check, net_check
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        """Any-hit evaluation in three stages, each on the fields still safe
+
+        Mine slots that hold a ``priority`` mine in some field are tested
+        first, in every field; the remaining slots follow on the fields not
+        yet hit, and finally the nets. Every mine is tested at most once,
+        and a field's net flag is only set when none of its mines is hit:
+        the flags give the first contact found, not the full mine-vs-net
+        breakdown of check_surface_vessel and check_submarine, but their
+        union is the same.
+        """
+        mine_hits = np.zeros(len(self), dtype=bool)
+        net_hits = np.zeros(len(self), dtype=bool)
+        first = priority.any(axis=0)
+        if first.any():
+            mine_hits |= mine_check(self.select(mines=np.flatnonzero(first)))
+
+        open_fields = np.flatnonzero(~mine_hits)
+        if len(open_fields) and not first.all():
+            mine_hits[open_fields] = mine_check(self.select(open_fields,
+                                                            np.flatnonzero(~first)))
+
+        open_fields = np.flatnonzero(~mine_hits)
+        if len(open_fields) and self.num_nets:
+            net_hits[open_fields] = net_check(self.select(open_fields))
+        return mine_hits, net_hits
+
+    def surface_vessel_mine_hits(self, path_points: np.ndarray, vessel_width: float,
+                                 vessel_draft: float, path_index: Optional[PathIndex] = None,
+                                 swept: bool = False) -> np.ndarray:
+        """Mine hit flags, shape (K,), for a surface vessel path"""
+        if swept:
+            return swept_surface_vessel_mine_hits(self.positions, self.kind, self.radius,
+                                                  path_points, vessel_width, vessel_draft)
+        if path_index is not None:
+            return indexed_surface_vessel_mine_hits(
+                self._mines_index(), self.positions, self.kind, self.radius,
+                path_index, vessel_width, vessel_draft)
+        return surface_vessel_mine_hits(self.positions, self.kind, self.radius,
+                                        path_points, vessel_width, vessel_draft)
+
+    def surface_vessel_net_hits(self, path_points: np.ndarray, vessel_width: float,
+                                vessel_draft: float, path_index: Optional[PathIndex] = None,
+                                swept: bool = False) -> np.ndarray:
+        """Net hit flags, shape (K,), for a surface vessel path
+
+        Path segments are tested exactly, so ``swept`` only skips the
+        spatial index.
+        """
+        ends = self.net_endpoints
+        if path_index is not None and not swept:
+            return indexed_net_hits_2d(
+                self._nets_index(), ends[:, :, 0, 0], ends[:, :, 0, 1],
+                ends[:, :, 1, 0], ends[:, :, 1, 1], self.net_z_top,
+                self.net_width, path_index, vessel_width, vessel_draft)
+        return net_hits_2d(
+            ends[:, :, 0, 0], ends[:, :, 0, 1], ends[:, :, 1, 0], ends[:, :, 1, 1],
+            self.net_z_top, self.net_width, path_points, vessel_width, vessel_draft)
+
+    def submarine_mine_hits(self, path_points: np.ndarray, vessel_width: float,
+                            path_index: Optional[PathIndex] = None,
+                            swept: bool = False) -> np.ndarray:
+        """Mine hit flags, shape (K,), for a submarine path"""
+        if swept:
+            return swept_submarine_mine_hits(self.positions, self.kind, self.radius,
+                                             path_points, vessel_width)
+        if path_index is not None:
+            return indexed_submarine_mine_hits(
+                self._mines_index(), self.positions, self.kind, self.radius,
+                path_index, vessel_width)
+        return submarine_mine_hits(self.positions, self.kind, self.radius,
+                                   path_points, vessel_width)
+
+    def submarine_net_hits(self, path_points: np.ndarray, vessel_width: float,
+                           path_index: Optional[PathIndex] = None,
+                           swept: bool = False) -> np.ndarray:
+        """Net hit flags, shape (K,), for a submarine path"""
+        ends = self.net_endpoints
+        if swept:
+            return swept_net_hits_3d(
+                ends[:, :, 0, 0], ends[:, :, 0, 1], ends[:, :, 1, 0], ends[:, :, 1, 1],
+                self.net_z_top, self.net_z_bottom, self.net_width,
+                path_points, vessel_width)
+        if path_index is not None:
+            return indexed_net_hits_3d(
+                self._nets_index(), ends[:, :, 0, 0], ends[:, :, 0, 1],
+                ends[:, :, 1, 0], ends[:, :, 1, 1], self.net_z_top,
+                self.net_z_bottom, self.net_width, path_index, vessel_width)
+        return net_hits_3d(
+            ends[:, :, 0, 0], ends[:, :, 0, 1], ends[:, :, 1, 0], ends[:, :, 1, 1],
+            self.net_z_top, self.net_z_bottom, self.net_width,
+            path_points, vessel_width)
+
+
+def route_distance_sq(x: np.ndarray, y: np.ndarray, start, end) -> np.ndarray:
+    """Squared horizontal distance of points to the single segment start -> end
+
+    Any-hit checks test the linear mines closest to a vessel's route
+    first, since they are the most likely to be hit.
+    """
+    x0, y0 = float(start[0]), float(start[1])
+    dx, dy = float(end[0]) - x0, float(end[1]) - y0
+    px, py = x - x0, y - y0
+    length_sq = dx * dx + dy * dy
+    if length_sq < 1e-6:
+        return px * px + py * py
+    t = np.clip((px * dx + py * dy) / length_sq, 0.0, 1.0)
+    px -= t * dx
+    py -= t * dy
+    return px * px + py * py
+
+
+def _route_key(start, end) -> Tuple[float, ...]:
+    return (float(start[0]), float(start[1]), float(end[0]), float(end[1]))
+
+
+# Upper bound on the element count of one (fields, objects, path points) temporary
+_CHUNK_ELEMENTS = 1 << 16
+
+
+def _field_chunks(num_fields: int, per_field: int):
+    """Slices over the field axis that keep temporaries below _CHUNK_ELEMENTS"""
+    step = max(1, _CHUNK_ELEMENTS // max(per_field, 1))
+    for start in range(0, num_fields, step):
+        yield slice(start, start + step)
+
+
+def surface_vessel_mine_hits(positions: np.ndarray, kind: np.ndarray, radius,
+                             path_points: np.ndarray, vessel_width: float,
+                             vessel_draft: float) -> np.ndarray:
+    """Per-field surface mine hits for a surface vessel path
+
+    ``positions`` has shape (K, M, 3), ``kind`` shape (M,) and ``radius``
+    broadcasts to (K, M). Only surface mines no deeper than the vessel draft
+    count; the test is horizontal.
+    """
+    num_fields = positions.shape[0]
+    surface = kind == MineType.SURFACE
+    reach_sq = np.broadcast_to((np.asarray(radius) + vessel_width / 2) ** 2,
+                               (num_fields, len(kind)))[:, surface]
+    positions = positions[:, surface]
+    active = positions[..., 2] <= vessel_draft
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if positions.shape[1] == 0 or len(path_points) == 0:
+        return hits
+    center = path_points.mean(axis=0)
+    path = path_points[:, :2] - center[:2]
+    for sl in _field_chunks(num_fields, positions.shape[1] * len(path)):
+        dist_sq = _pairwise_distance_sq(positions[sl, :, :2] - center[:2], path)
+        within = (dist_sq <= reach_sq[sl, :, None]) & active[sl, :, None]
+        hits[sl] = within.any(axis=(1, 2))
+    return hits
+
+
+def submarine_mine_hits(positions: np.ndarray, kind: np.ndarray, radius,
+                        path_points: np.ndarray, vessel_width: float) -> np.ndarray:
+    """Per-field mine hits for a submarine path
+
+    Surface mines are tested horizontally and only against path points
+    within SURFACE_MINE_DEPTH_GATE below them; moored and bottom mines are
+    tested in 3D. Array shapes are as in surface_vessel_mine_hits.
+    """
+    num_fields = positions.shape[0]
+    surface = kind == MineType.SURFACE
+    reach_sq = np.broadcast_to((np.asarray(radius) + vessel_width / 2) ** 2,
+                               positions.shape[:2])
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if len(kind) == 0 or len(path_points) == 0:
+        return hits
+    center = path_points.mean(axis=0)
+    path = path_points - center
+    for sl in _field_chunks(num_fields, len(kind) * len(path)):
+        pos = positions[sl] - center
+        if surface.any():
+            # Surface mines only threaten path points within the depth gate
+            top = pos[:, surface]
+            dist_sq = _pairwise_distance_sq(top[..., :2], path[:, :2])
+            within = dist_sq <= reach_sq[sl][:, surface, None]
+            within &= path[None, None, :, 2] <= top[..., 2, None] + SURFACE_MINE_DEPTH_GATE
+            hits[sl] |= within.any(axis=(1, 2))
+        if (~surface).any():
+            dist_sq = _pairwise_distance_sq(pos[:, ~surface], path)
+            within = dist_sq <= reach_sq[sl][:, ~surface, None]
+            hits[sl] |= within.any(axis=(1, 2))
+    return hits
+
+
+def _pairwise_distance_sq(points: np.ndarray, path: np.ndarray) -> np.ndarray:
+    """Squared distances between (k, m, d) points and (p, d) path points
+
+    Uses |a|^2 + |b|^2 - 2 a.b so the bulk of the work is one matrix product;
+    callers pass coordinates centred on the path to limit cancellation.
+    """
+    k, m, d = points.shape
+    flat = points.reshape(k * m, d)
+    dist_sq = (np.einsum('ij,ij->i', flat, flat)[:, None]
+               + np.einsum('ij,ij->i', path, path)[None, :]
+               - 2.0 * (flat @ path.T))
+    return dist_sq.reshape(k, m, len(path))
+
+
+def net_hits_2d(x1, y1, x2, y2, z_top, width, path_points: np.ndarray,
+                vessel_width: float, vessel_draft: float) -> np.ndarray:
+    """Per-field net hits for a surface vessel path
+
+    Endpoint and depth arrays have shape (K, N), ``width`` broadcasts
+    against them. Nets whose top lies below the vessel draft are ignored.
+    """
+    num_fields = x1.shape[0]
+    reach_sq = ((np.broadcast_to(width, x1.shape) + vessel_width) / 2) ** 2
+    active = z_top <= vessel_draft
+    num_segments = max(len(path_points) - 1, 0)
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if x1.shape[1] == 0 or num_segments == 0:
+        return hits
+    for sl in _field_chunks(num_fields, x1.shape[1] * num_segments):
+        dist_sq = _net_segment_distance_sq(x1[sl], y1[sl], x2[sl], y2[sl], path_points)
+        within = (dist_sq <= reach_sq[sl, :, None]) & active[sl, :, None]
+        hits[sl] = within.any(axis=(1, 2))
+    return hits
+
+
+def net_hits_3d(x1, y1, x2, y2, z_top, z_bottom, width, path_points: np.ndarray,
+                vessel_width: float) -> np.ndarray:
+    """Per-field net hits for a submarine path
+
+    A path segment is tested against a net only if one of its endpoints lies
+    inside the net's depth band. Array shapes are as in net_hits_2d.
+    """
+    num_fields = x1.shape[0]
+    reach_sq = ((np.broadcast_to(width, x1.shape) + vessel_width) / 2) ** 2
+    num_segments = max(len(path_points) - 1, 0)
+    z = path_points[:, 2]
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if x1.shape[1] == 0 or num_segments == 0:
+        return hits
+    for sl in _field_chunks(num_fields, x1.shape[1] * num_segments):
+        in_band = ((z_top[sl, :, None] <= z[None, None, :]) &
+                   (z[None, None, :] <= z_bottom[sl, :, None]))
+        active = in_band[..., :-1] | in_band[..., 1:]
+        if not active.any():
+            continue
+        dist_sq = _net_segment_distance_sq(x1[sl], y1[sl], x2[sl], y2[sl], path_points)
+        within = active & (dist_sq <= reach_sq[sl, :, None])
+        hits[sl] = within.any(axis=(1, 2))
+    return hits
+
+
+def _net_segment_distance_sq(x1, y1, x2, y2, path_points: np.ndarray) -> np.ndarray:
+    """Squared 2D distance of (K, N) nets to every path segment, shape (K, N, S)"""
+    q1 = np.stack([x1, y1], axis=-1)[:, :, None, :]
+    q2 = np.stack([x2, y2], axis=-1)[:, :, None, :]
+    return segment_distance_sq_2d(path_points[None, None, :-1, :2],
+                                  path_points[None, None, 1:, :2], q1, q2)
+
+
+def swept_surface_vessel_mine_hits(positions: np.ndarray, kind: np.ndarray, radius,
+                                   waypoints: np.ndarray, vessel_width: float,
+                                   vessel_draft: float) -> np.ndarray:
+    """Per-field surface mine hits for a surface vessel sailing between waypoints
+
+    Every mine is tested against its exact horizontal distance to each leg
+    instead of to sampled path points. Shapes are as in
+    surface_vessel_mine_hits with (L + 1, 3) waypoints.
+    """
+    num_fields = positions.shape[0]
+    surface = kind == MineType.SURFACE
+    reach_sq = np.broadcast_to((np.asarray(radius) + vessel_width / 2) ** 2,
+                               (num_fields, len(kind)))[:, surface]
+    positions = positions[:, surface]
+    active = positions[..., 2] <= vessel_draft
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if positions.shape[1] == 0 or len(waypoints) == 0:
+        return hits
+    leg_start, leg_end = polyline_legs(waypoints)
+    for sl in _field_chunks(num_fields, positions.shape[1] * len(leg_start)):
+        dist_sq = point_segment_distance_sq(positions[sl, :, None, :2],
+                                            leg_start[:, :2], leg_end[:, :2])
+        within = (dist_sq <= reach_sq[sl, :, None]) & active[sl, :, None]
+        hits[sl] = within.any(axis=(1, 2))
+    return hits
+
+
+def swept_submarine_mine_hits(positions: np.ndarray, kind: np.ndarray, radius,
+                              waypoints: np.ndarray, vessel_width: float) -> np.ndarray:
+    """Per-field mine hits for a submarine sailing between waypoints
+
+    Moored and bottom mines use the exact 3D distance to each leg. A
+    surface mine is hit if the part of a leg within horizontal reach rises
+    to within SURFACE_MINE_DEPTH_GATE below it anywhere.
+    """
+    num_fields = positions.shape[0]
+    surface = kind == MineType.SURFACE
+    reach_sq = np.broadcast_to((np.asarray(radius) + vessel_width / 2) ** 2,
+                               positions.shape[:2])
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if len(kind) == 0 or len(waypoints) == 0:
+        return hits
+    leg_start, leg_end = polyline_legs(waypoints)
+    climb = leg_end[:, 2] - leg_start[:, 2]
+    for sl in _field_chunks(num_fields, len(kind) * len(leg_start)):
+        pos = positions[sl]
+        if surface.any():
+            top = pos[:, surface]
+            t_lo, t_hi = segment_disk_interval(top[:, :, None, :2], leg_start[:, :2],
+                                               leg_end[:, :2], reach_sq[sl][:, surface, None])
+            # Shallowest depth over the part of the leg within reach
+            shallowest = leg_start[:, 2] + np.where(climb > 0, t_lo, t_hi) * climb
+            within = ((t_lo <= t_hi) &
+                      (shallowest <= top[..., 2, None] + SURFACE_MINE_DEPTH_GATE))
+            hits[sl] |= within.any(axis=(1, 2))
+        if (~surface).any():
+            dist_sq = point_segment_distance_sq(pos[:, ~surface, None, :],
+                                                leg_start, leg_end)
+            within = dist_sq <= reach_sq[sl][:, ~surface, None]
+            hits[sl] |= within.any(axis=(1, 2))
+    return hits
+
+
+def swept_net_hits_3d(x1, y1, x2, y2, z_top, z_bottom, width, waypoints: np.ndarray,
+                      vessel_width: float) -> np.ndarray:
+    """Per-field net hits for a submarine sailing between waypoints
+
+    Each leg is clipped to the depth band of each net and the clipped part
+    is tested with the exact segment-to-segment distance. Array shapes are
+    as in net_hits_2d.
+    """
+    num_fields = x1.shape[0]
+    reach_sq = ((np.broadcast_to(width, x1.shape) + vessel_width) / 2) ** 2
+
+    hits = np.zeros(num_fields, dtype=bool)
+    if x1.shape[1] == 0 or len(waypoints) == 0:
+        return hits
+    leg_start, leg_end = polyline_legs(waypoints)
+    heading = leg_end[:, :2] - leg_start[:, :2]
+    for sl in _field_chunks(num_fields, x1.shape[1] * len(leg_start)):
+        t_lo, t_hi = segment_band_interval(leg_start[:, 2], leg_end[:, 2],
+                                           z_top[sl, :, None], z_bottom[sl, :, None])
+        active = t_lo <= t_hi
+        if not active.any():
+            continue
+        p1 = leg_start[:, :2] + t_lo[..., None] * heading
+        p2 = leg_start[:, :2] + t_hi[..., None] * heading
+        q1 = np.stack([x1[sl], y1[sl]], axis=-1)[:, :, None, :]
+        q2 = np.stack([x2[sl], y2[sl]], axis=-1)[:, :, None, :]
+        dist_sq = segment_distance_sq_2d(p1, p2, q1, q2)
+        within = active & (dist_sq <= reach_sq[sl, :, None])
+        hits[sl] = within.any(axis=(1, 2))
+    return hits
+
+
+def indexed_surface_vessel_mine_hits(index: FieldIndex, positions: np.ndarray,
+                                     kind: np.ndarray, radius, path_index: PathIndex,
+                                     vessel_width: float,
+                                     vessel_draft: float) -> np.ndarray:
+    """surface_vessel_mine_hits with KD-tree broad-phase culling
+
+    ``index`` covers the K * M mines of ``positions`` in row-major order;
+    only the (mine, path point) pairs it returns get exact tests.
+    """
+    num_fields, num_mines = positions.shape[:2]
+    reach = np.broadcast_to(np.asarray(radius) + vessel_width / 2,
+                            (num_fields, num_mines)).ravel()
+    mine, point = index.near_points(path_index, reach)
+    pos = positions.reshape(-1, 3)[mine]
+    path = path_index.points[point]
+
+    dist_sq = (pos[:, 0] - path[:, 0]) ** 2 + (pos[:, 1] - path[:, 1]) ** 2
+    within = ((kind[mine % num_mines] == MineType.SURFACE) &
+              (pos[:, 2] <= vessel_draft) & (dist_sq <= reach[mine] ** 2))
+    hits = np.zeros(num_fields, dtype=bool)
+    hits[mine[within] // num_mines] = True
+    return hits
+
+
+def indexed_submarine_mine_hits(index: FieldIndex, positions: np.ndarray,
+                                kind: np.ndarray, radius, path_index: PathIndex,
+                                vessel_width: float) -> np.ndarray:
+    """submarine_mine_hits with KD-tree broad-phase culling
+
+    The index is horizontal, which never culls a 3D contact because the 3D
+    distance is at least the horizontal one.
+    """
+    num_fields, num_mines = positions.shape[:2]
+    reach = np.broadcast_to(np.asarray(radius) + vessel_width / 2,
+                            (num_fields, num_mines)).ravel()
+    mine, point = index.near_points(path_index, reach)
+    pos = positions.reshape(-1, 3)[mine]
+    path = path_index.points[point]
+
+    reach_sq = reach[mine] ** 2
+    horizontal_sq = (pos[:, 0] - path[:, 0]) ** 2 + (pos[:, 1] - path[:, 1]) ** 2
+    depth = pos[:, 2] - path[:, 2]
+    within = np.where(kind[mine % num_mines] == MineType.SURFACE,
+                      (horizontal_sq <= reach_sq) &
+                      (path[:, 2] <= pos[:, 2] + SURFACE_MINE_DEPTH_GATE),
+                      horizontal_sq + depth * depth <= reach_sq)
+    hits = np.zeros(num_fields, dtype=bool)
+    hits[mine[within] // num_mines] = True
+    return hits
+
+
+def indexed_net_hits_2d(index: FieldIndex, x1, y1, x2, y2, z_top, width,
+                        path_index: PathIndex, vessel_width: float,
+                        vessel_draft: float) -> np.ndarray:
+    """net_hits_2d with KD-tree broad-phase culling of (net, segment) pairs"""
+    num_fields, num_nets = x1.shape
+    reach = ((np.broadcast_to(width, x1.shape) + vessel_width) / 2).ravel()
+    net, segment = index.near_segments(path_index, reach)
+    keep = z_top.ravel()[net] <= vessel_draft
+    return _indexed_net_hits(net[keep], segment[keep], x1, y1, x2, y2, reach,
+                             path_index, num_fields, num_nets)
+
+
+def indexed_net_hits_3d(index: FieldIndex, x1, y1, x2, y2, z_top, z_bottom, width,
+                        path_index: PathIndex, vessel_width: float) -> np.ndarray:
+    """net_hits_3d with KD-tree broad-phase culling of (net, segment) pairs"""
+    num_fields, num_nets = x1.shape
+    reach = ((np.broadcast_to(width, x1.shape) + vessel_width) / 2).ravel()
+    net, segment = index.near_segments(path_index, reach)
+    z = path_index.points[:, 2]
+    top, bottom = z_top.ravel()[net], z_bottom.ravel()[net]
+    keep = (((top <= z[segment]) & (z[segment] <= bottom)) |
+            ((top <= z[segment + 1]) & (z[segment + 1] <= bottom)))
+    return _indexed_net_hits(net[keep], segment[keep], x1, y1, x2, y2, reach,
+                             path_index, num_fields, num_nets)
+
+
+def _indexed_net_hits(net, segment, x1, y1, x2, y2, reach, path_index: PathIndex,
+                      num_fields: int, num_nets: int) -> np.ndarray:
+    """Exact segment-to-segment tests on candidate (net, path segment) pairs"""
+    path = path_index.points[:, :2]
+    q1 = np.stack([x1.ravel()[net], y1.ravel()[net]], axis=-1)
+    q2 = np.stack([x2.ravel()[net], y2.ravel()[net]], axis=-1)
+    dist_sq = segment_distance_sq_2d(path[segment], path[segment + 1], q1, q2)
+    hits = np.zeros(num_fields, dtype=bool)
+    hits[net[dist_sq <= reach[net] ** 2] // num_nets] = True
+    return hits
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Memoized path generation and precomputed per-path data
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from .spatial import PathIndex
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class PathData:
+    """Sampled path with read-only points and precomputed segment data
+
+    ``segment_vectors`` and ``segment_lengths`` describe the N - 1 path
+    segments; ``bbox_min``/``bbox_max`` bound the points in x, y and z and
+    ``depth_range`` is the (shallowest, deepest) point depth.
+    """
+
+    def __init__(self, points: np.ndarray):
+        self.points = _readonly(np.array(points, dtype=np.float64).reshape(-1, 3))
+        self.segment_vectors = _readonly(np.diff(self.points, axis=0))
+        self.segment_lengths = _readonly(np.sqrt(np.sum(self.segment_vectors ** 2, axis=-1)))
+        if len(self.points):
+            self.bbox_min = _readonly(self.points.min(axis=0))
+            self.bbox_max = _readonly(self.points.max(axis=0))
+        else:
+            self.bbox_min = _readonly(np.full(3, np.inf))
+            self.bbox_max = _readonly(np.full(3, -np.inf))
+        self.depth_range = (float(self.bbox_min[2]), float(self.bbox_max[2]))
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def index(self) -> PathIndex:
+        """Broad-phase spatial index of the path, built on first use"""
+        if self._index is None:
+            self._index = PathIndex(self.points, self.segment_lengths)
+        return self._index
+
+    def misses_box(self, lower: Tuple[float, float], upper: Tuple[float, float],
+                   margin: float = 0.0) -> bool:
+        """Whether the horizontal bounding box is further than ``margin`` from a box"""
+        return bool(self.bbox_max[0] < lower[0] - margin or self.bbox_min[0] > upper[0] + margin or
+                    self.bbox_max[1] < lower[1] - margin or self.bbox_min[1] > upper[1] + margin)
+
+    def misses_depth_band(self, z_top: float, z_bottom: float) -> bool:
+        """Whether every path point lies outside the depth band [z_top, z_bottom]"""
+        return self.depth_range[1] < z_top or self.depth_range[0] > z_bottom
+
+
+class PathCache:
+    """Bounded LRU cache of PathData keyed on the inputs that generated a path
+
+    Cached points are read-only, so the same array can be handed to every
+    caller; lookup() maps such an array back to its PathData.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._by_array = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, build: Callable[[], np.ndarray]) -> PathData:
+        """Return the cached path for ``key``, calling ``build`` on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = PathData(build())
+        self._entries[key] = entry
+        self._by_array[id(entry.points)] = entry
+        while len(self._entries) > self.maxsize:
+            _, evicted = self._entries.popitem(last=False)
+            del self._by_array[id(evicted.points)]
+        return entry
+
+    def lookup(self, points: np.ndarray) -> Optional[PathData]:
+        """PathData whose points array is ``points``, if it is still cached"""
+        entry = self._by_array.get(id(points))
+        return entry if entry is not None and entry.points is points else None
+
+    def clear(self):
+        """Drop every cached path"""
+        self._entries.clear()
+        self._by_array.clear()
+
+
+def point_key(point) -> Tuple[float, ...]:
+    """Hashable cache key for a start/end/waypoint coordinate tuple"""
+    return tuple(float(c) for c in point)
\ No newline at end of file
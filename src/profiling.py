@@ -0,0 +1,68 @@
+"""
+Opt-in per-phase timing and event counters
+"""
+
+import time
+from contextlib import nullcontext
+from typing import Dict
+
+# Shared no-op context for call sites with profiling disabled
+NO_PHASE = nullcontext()
+
+
+class PhaseProfile:
+    """Accumulates wall time and call counts per named phase, plus event counters
+
+    ``phase(name)`` is a context manager that adds the time spent inside it
+    to ``name``; ``count(name)`` bumps an event counter. Profiles from
+    several workers combine with merge().
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, list] = {}
+        self.counters: Dict[str, int] = {}
+
+    def phase(self, name: str) -> "_Phase":
+        return _Phase(self, name)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [calls, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: Dict):
+        """Add a profile exported by as_dict() into this one"""
+        for name, entry in other['phases'].items():
+            self.add_time(name, entry['seconds'], entry['calls'])
+        for name, n in other['counters'].items():
+            self.count(name, n)
+
+    def as_dict(self) -> Dict:
+        """Structured copy: {'phases': {name: {calls, seconds}}, 'counters': {name: n}}"""
+        return {
+            'phases': {name: {'calls': calls, 'seconds': seconds}
+                       for name, (calls, seconds) in sorted(self.phases.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+
+class _Phase:
+    __slots__ = ('profile', 'name', 'start')
+
+    def __init__(self, profile: PhaseProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.add_time(self.name, time.perf_counter() - self.start)
+        return False
\ No newline at end of file
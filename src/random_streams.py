@@ -0,0 +1,42 @@
+"""
+Reproducible random streams for mine field generation
+
+Every mine field is drawn from its own ``numpy.random.Generator``. Streams are
+addressed by a master seed plus a key path, ``SeedSequence(seed,
+spawn_key=keys)``, which is exactly the generator that ``SeedSequence(seed)``
+would hand out through ``spawn()`` for that position. Stream ``(i,)`` is the
+mine field of Monte Carlo iteration ``i``; any stream can be rebuilt on its
+own, in any process or thread, without replaying the streams before it.
+Streams for other purposes use a two-part key ``(namespace, index)``, with
+namespaces above any realistic iteration index.
+"""
+
+import numpy as np
+from typing import Union
+
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+# Namespace of the streams that draw whole batches of mine fields
+BATCH_STREAM = 2**32
+
+
+def make_rng(seed: SeedLike = None) -> np.random.Generator:
+    """Create a Generator from a seed, SeedSequence or existing Generator"""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def stream_rng(seed: int, *keys: int) -> np.random.Generator:
+    """Generator for the stream addressed by ``keys`` under a master seed"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=keys))
+
+
+def iteration_rng(seed: int, iteration: int) -> np.random.Generator:
+    """Generator for the mine field of one Monte Carlo iteration"""
+    return stream_rng(seed, iteration)
+
+
+def batch_rng(seed: int, batch_index: int) -> np.random.Generator:
+    """Generator for one batch of mine fields drawn by generate_minefield_batch"""
+    return stream_rng(seed, BATCH_STREAM, batch_index)
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Streaming per-iteration result files (JSON Lines, or Parquet with pyarrow)
+"""
+
+import json
+import os
+import time
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Columns of one iteration record
+FIELDS = ('iteration', 'surface_vessel_mine_hit', 'surface_vessel_net_hit',
+          'submarine_mine_hit', 'submarine_net_hit')
+
+FORMATS = ('jsonl', 'parquet')
+
+
+def outcome_rows(start: int, flags: Dict) -> List[Dict]:
+    """Iteration records for outcome flags starting at iteration ``start``
+
+    ``flags`` maps 'surface_vessel' and 'submarine' to (mine_hits, net_hits),
+    either single flags or arrays with one entry per iteration.
+    """
+    columns = [np.atleast_1d(np.asarray(flag, dtype=bool))
+               for vessel_type in ('surface_vessel', 'submarine')
+               for flag in flags[vessel_type]]
+    return [dict(zip(FIELDS, (start + k, *(bool(c[k]) for c in columns))))
+            for k in range(len(columns[0]))]
+
+
+class ResultStreamWriter:
+    """Appends iteration records to a JSON Lines or Parquet file as a run progresses
+
+    Records are flushed to disk every ``flush_every`` records or
+    ``flush_seconds`` seconds, whichever comes first, and on close(). A
+    JSON Lines file is fsynced at each flush, so after a crash it holds
+    every record up to the last flush (a torn final line is skipped by
+    read_stream). Parquet needs pyarrow; each flush writes one row group,
+    but the file is only readable once closed. ``append`` continues an
+    existing JSON Lines file.
+    """
+
+    def __init__(self, path: str, format: str = None, flush_every: int = 1000,
+                 flush_seconds: float = 5.0, append: bool = False):
+        if format is None:
+            format = 'parquet' if path.endswith('.parquet') else 'jsonl'
+        if format not in FORMATS:
+            raise ValueError(f"Unknown stream format '{format}', expected one of {FORMATS}")
+        if append and format != 'jsonl':
+            raise ValueError("Only JSON Lines streams can be appended to")
+
+        self.path = path
+        self.format = format
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.rows_written = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if format == 'jsonl':
+            self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+        else:
+            self._parquet = _parquet_writer(path)
+
+    def write_rows(self, rows: Iterable[Dict]):
+        self._pending.extend(rows)
+        if (len(self._pending) >= self.flush_every or
+                time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Write buffered records and force them to disk"""
+        if self._pending:
+            if self.format == 'jsonl':
+                self._file.writelines(json.dumps(row, separators=(',', ':')) + '\n'
+                                      for row in self._pending)
+            else:
+                self._parquet.write_rows(self._pending)
+            self.rows_written += len(self._pending)
+            self._pending = []
+        if self.format == 'jsonl':
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        if self.format == 'jsonl':
+            self._file.close()
+        else:
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class _ParquetRowGroups:
+    """Writes each batch of records as one Parquet row group"""
+
+    def __init__(self, path: str, pa, pq):
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.int64() if name == 'iteration' else pa.bool_())
+                                 for name in FIELDS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_rows(self, rows: List[Dict]):
+        table = self.pa.Table.from_pydict({name: [row[name] for row in rows] for name in FIELDS},
+                                          schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+
+def _parquet_writer(path: str) -> _ParquetRowGroups:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet result streams require pyarrow "
+                          "(pip install pyarrow)") from exc
+    return _ParquetRowGroups(path, pa, pq)
+
+
+def read_stream(path: str) -> Dict[str, np.ndarray]:
+    """Columns of a result stream as arrays sorted by iteration
+
+    Iterations recorded more than once (e.g. rerun after a resume) keep
+    their last record. A truncated final JSON Lines record is ignored.
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        columns = {name: table.column(name).to_numpy() for name in FIELDS}
+    else:
+        rows = []
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()
+        for number, line in enumerate(lines):
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                if number < len(lines) - 1:
+                    raise
+        columns = {name: np.array([row[name] for row in rows],
+                                  dtype=np.int64 if name == 'iteration' else bool)
+                   for name in FIELDS}
+
+    # Last record of each iteration wins
+    iterations = columns['iteration']
+    order = np.argsort(iterations, kind='stable')
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = iterations[order][1:] != iterations[order][:-1]
+    keep = order[last]
+    return {name: np.asarray(column)[keep] for name, column in columns.items()}
+
+
+def summarize_stream(path: str, confidence: float = None,
+                     interval_method: str = 'wilson') -> Dict:
+    """run_simulation-style statistics derived from a result stream"""
+    from .simulation import empty_results, record_outcomes, outcome_statistics
+
+    columns = read_stream(path)
+    if len(columns['iteration']) == 0:
+        raise ValueError(f"No iteration records in {path}")
+    results = empty_results()
+    for vessel_type in results:
+        record_outcomes(results[vessel_type], columns[f'{vessel_type}_mine_hit'],
+                         columns[f'{vessel_type}_net_hit'])
+    return outcome_statistics(results, len(columns['iteration']), confidence, interval_method)
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+Precomputed contact-probability rasters over the operating area
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict
+
+from .collision import point_segment_distance_sq
+from .minefield import SURFACE_MINE_DEPTH_GATE, MinefieldBatch, MineType
+from .simulation import TacticalMineSimulation
+
+VESSEL_TYPES = ('submarine', 'surface_vessel')
+PATH_RISK_METHODS = ('max', 'integral')
+
+
+class RiskRaster:
+    """Probability that a vessel at a cell centre is in contact with a mine or net
+
+    ``probability`` has shape (nz, ny, nx): ``nz`` depth layers of
+    ``depth_step`` metres for a submarine (one layer at the surface for a
+    surface vessel) over square ``cell_size`` cells covering the area from
+    the origin. A cell's value is the fraction of the sampled fields in
+    which its centre lies within contact reach of some mine or net, with
+    the same contact rules as the collision kernels.
+    """
+
+    def __init__(self, probability: np.ndarray, cell_size: float, depth_step: float,
+                 vessel: str, num_fields: int):
+        if vessel not in VESSEL_TYPES:
+            raise ValueError(f"Unknown vessel type {vessel!r}, expected one of {VESSEL_TYPES}")
+        self.probability = np.asarray(probability, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.depth_step = float(depth_step)
+        self.vessel = vessel
+        self.num_fields = int(num_fields)
+
+    @property
+    def shape(self):
+        return self.probability.shape
+
+    @property
+    def x_centers(self) -> np.ndarray:
+        return (np.arange(self.shape[2]) + 0.5) * self.cell_size
+
+    @property
+    def y_centers(self) -> np.ndarray:
+        return (np.arange(self.shape[1]) + 0.5) * self.cell_size
+
+    @property
+    def depths(self) -> np.ndarray:
+        """Depth of each layer's cell centres (0 for a surface vessel)"""
+        if self.vessel == 'surface_vessel':
+            return np.zeros(1)
+        return (np.arange(self.shape[0]) + 0.5) * self.depth_step
+
+    @classmethod
+    def build(cls, sim: TacticalMineSimulation, fields: MinefieldBatch,
+              vessel: str = 'submarine', cell_size: float = 100.0,
+              depth_step: float = 20.0, chunk_fields: int = 32) -> "RiskRaster":
+        """Compute the raster from a batch of sampled fields
+
+        Fields are processed ``chunk_fields`` at a time. For each chunk,
+        KD-trees pair every mine and net with the cells within its reach,
+        and the covered cells are marked for each field.
+        """
+        if vessel not in VESSEL_TYPES:
+            raise ValueError(f"Unknown vessel type {vessel!r}, expected one of {VESSEL_TYPES}")
+        config = sim.config
+        nx = int(np.ceil(config.area_width / cell_size))
+        ny = int(np.ceil(config.area_height / cell_size))
+        nz = 1 if vessel == 'surface_vessel' else int(np.ceil(config.max_depth / depth_step))
+        raster = cls(np.zeros((nz, ny, nx)), cell_size, depth_step, vessel, len(fields))
+
+        gx, gy = np.meshgrid(raster.x_centers, raster.y_centers)
+        cells = np.stack([gx.ravel(), gy.ravel()], axis=-1)
+        cell_tree = cKDTree(cells)
+        counts = np.zeros(nz * len(cells), dtype=np.int64)
+        for lo in range(0, len(fields), chunk_fields):
+            chunk = fields.slice(lo, min(lo + chunk_fields, len(fields)))
+            covered = np.zeros((len(chunk), nz * len(cells)), dtype=bool)
+            raster._cover_mines(covered, chunk, cell_tree, config)
+            raster._cover_nets(covered, chunk, cells, cell_tree, config)
+            counts += covered.sum(axis=0)
+
+        raster.probability = counts.reshape(nz, ny, nx) / max(len(fields), 1)
+        return raster
+
+    def _cover_mines(self, covered: np.ndarray, chunk: MinefieldBatch,
+                     cell_tree: cKDTree, config):
+        num_fields, num_mines = chunk.positions.shape[:2]
+        positions = chunk.positions.reshape(-1, 3)
+        field = np.repeat(np.arange(num_fields), num_mines)
+        surface = np.tile(chunk.kind == MineType.SURFACE, num_fields)
+        radius = np.tile(np.broadcast_to(chunk.radius, (num_mines,)), num_fields)
+
+        if self.vessel == 'surface_vessel':
+            reach = radius + config.vessel_width / 2
+            keep = surface & (positions[:, 2] <= config.vessel_draft)
+        else:
+            reach = radius + config.submarine_width / 2
+            keep = np.ones(len(positions), dtype=bool)
+        if not keep.any():
+            return
+        positions, field, surface, reach = (positions[keep], field[keep],
+                                            surface[keep], reach[keep])
+
+        pairs = cKDTree(positions[:, :2]).sparse_distance_matrix(
+            cell_tree, float(reach.max()), output_type='ndarray')
+        pairs = pairs[pairs['v'] <= reach[pairs['i']]]
+        mine, cell, dist = pairs['i'], pairs['j'], pairs['v']
+        if self.vessel == 'surface_vessel':
+            covered[field[mine], cell] = True
+            return
+
+        # Surface mines threaten depths within the gate below them; moored
+        # and bottom mines need 3D distance within reach
+        depths = self.depths
+        z = positions[mine, 2]
+        dz_sq = reach[mine] ** 2 - dist ** 2
+        in_reach = np.where(surface[mine, None],
+                            depths[None, :] <= z[:, None] + SURFACE_MINE_DEPTH_GATE,
+                            (depths[None, :] - z[:, None]) ** 2 <= dz_sq[:, None])
+        pair, layer = np.nonzero(in_reach)
+        covered[field[mine[pair]], layer * cell_tree.n + cell[pair]] = True
+
+    def _cover_nets(self, covered: np.ndarray, chunk: MinefieldBatch, cells: np.ndarray,
+                    cell_tree: cKDTree, config):
+        num_fields, num_nets = chunk.net_endpoints.shape[:2]
+        if num_nets == 0:
+            return
+        ends = chunk.net_endpoints.reshape(-1, 2, 2)
+        field = np.repeat(np.arange(num_fields), num_nets)
+        z_top = chunk.net_z_top.ravel()
+        z_bottom = chunk.net_z_bottom.ravel()
+        vessel_width = (config.vessel_width if self.vessel == 'surface_vessel'
+                        else config.submarine_width)
+        reach = (np.tile(np.broadcast_to(chunk.net_width, (num_nets,)), num_fields)
+                 + vessel_width) / 2
+
+        mid = ends.mean(axis=1)
+        half = np.hypot(*(ends[:, 1] - ends[:, 0]).T) / 2
+        pairs = cKDTree(mid).sparse_distance_matrix(
+            cell_tree, float((half + reach).max()), output_type='ndarray')
+        pairs = pairs[pairs['v'] <= half[pairs['i']] + reach[pairs['i']]]
+        net, cell = pairs['i'], pairs['j']
+        dist_sq = point_segment_distance_sq(cells[cell], ends[net, 0], ends[net, 1])
+        within = dist_sq <= reach[net] ** 2
+        net, cell = net[within], cell[within]
+
+        if self.vessel == 'surface_vessel':
+            active = z_top[net] <= config.vessel_draft
+            covered[field[net[active]], cell[active]] = True
+            return
+        depths = self.depths
+        in_band = ((z_top[net, None] <= depths[None, :]) &
+                   (depths[None, :] <= z_bottom[net, None]))
+        pair, layer = np.nonzero(in_band)
+        covered[field[net[pair]], layer * cell_tree.n + cell[pair]] = True
+
+    def at(self, points: np.ndarray) -> np.ndarray:
+        """Contact probability of the cells holding (N, 2) or (N, 3) points"""
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        nz, ny, nx = self.shape
+        ix = np.clip((points[:, 0] // self.cell_size).astype(int), 0, nx - 1)
+        iy = np.clip((points[:, 1] // self.cell_size).astype(int), 0, ny - 1)
+        if self.vessel == 'surface_vessel' or points.shape[1] < 3:
+            iz = np.zeros(len(points), dtype=int)
+        else:
+            iz = np.clip((points[:, 2] // self.depth_step).astype(int), 0, nz - 1)
+        return self.probability[iz, iy, ix]
+
+    def sample_path(self, path: np.ndarray, spacing: float = None):
+        """Contact probabilities along a polyline sampled every ``spacing`` metres
+
+        Returns (probabilities, step lengths) with one entry per sample.
+        ``spacing`` defaults to half the smaller cell dimension.
+        """
+        path = np.atleast_2d(np.asarray(path, dtype=np.float64))
+        if spacing is None:
+            spacing = min(self.cell_size, self.depth_step) / 2
+        pieces, steps = [path[:1]], [np.zeros(1)]
+        for a, b in zip(path[:-1], path[1:]):
+            length = float(np.linalg.norm(b - a))
+            n = max(1, int(np.ceil(length / spacing)))
+            t = np.arange(1, n + 1)[:, None] / n
+            pieces.append(a + t * (b - a))
+            steps.append(np.full(n, length / n))
+        return self.at(np.concatenate(pieces)), np.concatenate(steps)
+
+    def path_risk(self, path: np.ndarray, method: str = 'max') -> float:
+        """Fast risk score of a path from the raster
+
+        'max' is the highest cell probability along the path, a lower
+        bound on the path's any-hit probability up to discretization.
+        'integral' is the line integral of the probability divided by the
+        cell size: the expected number of cell widths sailed within contact
+        reach, a relative exposure score for ranking routes.
+        """
+        if method not in PATH_RISK_METHODS:
+            raise ValueError(f"Unknown path risk method {method!r}, "
+                             f"expected one of {PATH_RISK_METHODS}")
+        probability, steps = self.sample_path(path)
+        if method == 'max':
+            return float(probability.max())
+        return float(np.sum(probability * steps) / self.cell_size)
+
+    def layer(self, depth: float = None) -> np.ndarray:
+        """(ny, nx) slice at ``depth``, or the maximum over depth if None"""
+        if depth is None:
+            return self.probability.max(axis=0)
+        iz = int(np.clip(depth // self.depth_step, 0, self.shape[0] - 1))
+        return self.probability[iz]
+
+    def save(self, path: str):
+        np.savez_compressed(path, probability=self.probability, cell_size=self.cell_size,
+                            depth_step=self.depth_step, vessel=self.vessel,
+                            num_fields=self.num_fields)
+
+    @classmethod
+    def load(cls, path: str) -> "RiskRaster":
+        with np.load(path) as data:
+            return cls(data['probability'], float(data['cell_size']),
+                       float(data['depth_step']), str(data['vessel']),
+                       int(data['num_fields']))
+
+    def summary(self) -> Dict:
+        """Mean and peak probability per depth layer"""
+        return {float(depth): {'mean': float(layer.mean()), 'max': float(layer.max())}
+                for depth, layer in zip(self.depths, self.probability)}
\ No newline at end of file
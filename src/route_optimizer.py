@@ -0,0 +1,196 @@
+"""
+Minimum-risk route search over waypoint sequences
+"""
+
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+
+from .minefield import MinefieldBatch
+from .random_streams import SeedLike, make_rng
+from .simulation import TacticalMineSimulation
+
+VESSEL_TYPES = ('submarine', 'surface_vessel')
+
+
+class LegRiskCache:
+    """Per-field mine and net hit flags of route legs against a fixed set of fields
+
+    Flags are stored bit-packed per leg, keyed by the leg's snapped
+    endpoints, so routes that share legs only pay for the new ones. A
+    route's flags are the bitwise OR of its legs' flags.
+    """
+
+    def __init__(self, sim: TacticalMineSimulation, fields: MinefieldBatch,
+                 vessel: str = 'submarine'):
+        if vessel not in VESSEL_TYPES:
+            raise ValueError(f"Unknown vessel type {vessel!r}, expected one of {VESSEL_TYPES}")
+        self.sim = sim
+        self.fields = fields
+        self.vessel = vessel
+        self.hits = 0
+        self.misses = 0
+        self._legs = {}
+
+    def __len__(self) -> int:
+        return len(self._legs)
+
+    def leg(self, a: Tuple[float, ...], b: Tuple[float, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Packed (mine_hits, net_hits) of the straight leg a -> b"""
+        key = (a, b)
+        flags = self._legs.get(key)
+        if flags is not None:
+            self.hits += 1
+            return flags
+
+        self.misses += 1
+        # Legs are tested exactly (swept), independent of path sampling density
+        leg = np.array([a, b], dtype=np.float64)
+        config = self.sim.config
+        if self.vessel == 'submarine':
+            mine_hits, net_hits = self.fields.check_submarine(
+                leg, config.submarine_width, swept=True)
+        else:
+            mine_hits, net_hits = self.fields.check_surface_vessel(
+                leg, config.vessel_width, config.vessel_draft, swept=True)
+        flags = self._legs[key] = (np.packbits(mine_hits), np.packbits(net_hits))
+        return flags
+
+    def route_flags(self, waypoints: Sequence[Tuple[float, ...]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-field (mine_hits, net_hits) bool arrays of a route through ``waypoints``"""
+        mine_bits = np.zeros((len(self.fields) + 7) // 8, dtype=np.uint8)
+        net_bits = mine_bits.copy()
+        for a, b in zip(waypoints[:-1], waypoints[1:]):
+            leg_mines, leg_nets = self.leg(a, b)
+            mine_bits |= leg_mines
+            net_bits |= leg_nets
+        count = len(self.fields)
+        return (np.unpackbits(mine_bits, count=count).astype(bool),
+                np.unpackbits(net_bits, count=count).astype(bool))
+
+    def clear(self):
+        self._legs.clear()
+
+
+class RouteOptimizer:
+    """Cross-entropy search for the lowest-risk route between two points
+
+    A route is ``start``, ``num_waypoints`` free waypoints and ``end``.
+    Free waypoints are drawn from independent Gaussians, snapped to a grid
+    of ``resolution`` metres horizontally and ``depth_resolution`` metres
+    in depth so that routes share legs in the LegRiskCache, and clipped to
+    the operating area (and ``depth_range`` for submarines). Each
+    generation the ``elite_fraction`` routes with the lowest objective
+    refit the Gaussians.
+
+    The objective is the any-hit probability over ``fields`` plus
+    ``length_weight`` times the relative detour over the straight route,
+    which breaks ties between equally safe routes in favour of shorter
+    ones. Risk is measured on a fixed set of fields, so the optimum is
+    biased low; check it on fresh fields with evaluate(..., fields=...).
+    """
+
+    def __init__(self, sim: TacticalMineSimulation, fields: MinefieldBatch,
+                 start: Tuple[float, ...], end: Tuple[float, ...],
+                 vessel: str = 'submarine', num_waypoints: int = 3,
+                 depth_range: Tuple[float, float] = None, resolution: float = 100.0,
+                 depth_resolution: float = 10.0, length_weight: float = 0.01):
+        self.sim = sim
+        self.cache = LegRiskCache(sim, fields, vessel)
+        self.vessel = vessel
+        self.num_waypoints = num_waypoints
+        self.length_weight = length_weight
+
+        config = sim.config
+        if vessel == 'submarine':
+            if depth_range is None:
+                depth_range = (min(30.0, config.max_depth), config.max_depth - 30)
+            self.start = tuple(float(c) for c in start)
+            self.end = tuple(float(c) for c in end)
+        else:
+            depth_range = (0.0, 0.0)
+            self.start = (float(start[0]), float(start[1]), 0.0)
+            self.end = (float(end[0]), float(end[1]), 0.0)
+        self.lower = np.array([0.0, 0.0, depth_range[0]])
+        self.upper = np.array([config.area_width, config.area_height, depth_range[1]])
+        self.step = np.array([resolution, resolution, depth_resolution])
+        self.straight_length = float(np.linalg.norm(np.subtract(self.end, self.start)))
+
+    def _snap(self, points: np.ndarray) -> np.ndarray:
+        points = np.round(points / self.step) * self.step
+        return np.clip(points, self.lower, self.upper)
+
+    def route(self, free: np.ndarray) -> List[Tuple[float, float, float]]:
+        """Full waypoint list for an array of free waypoints"""
+        return [self.start] + [tuple(p) for p in free.tolist()] + [self.end]
+
+    def evaluate(self, waypoints: Sequence[Tuple[float, ...]],
+                 fields: MinefieldBatch = None) -> Dict:
+        """Outcome probabilities of a route; other ``fields`` bypass the leg cache
+
+        Surface vessel waypoints may be given as (x, y).
+        """
+        waypoints = [tuple(float(c) for c in w) + (0.0,) * (3 - len(w)) for w in waypoints]
+        if fields is None:
+            mine_hits, net_hits = self.cache.route_flags(waypoints)
+        else:
+            other = LegRiskCache(self.sim, fields, self.vessel)
+            mine_hits, net_hits = other.route_flags(waypoints)
+        total = len(mine_hits)
+        length = float(sum(np.linalg.norm(np.subtract(b, a))
+                           for a, b in zip(waypoints[:-1], waypoints[1:])))
+        return {
+            'waypoints': np.array(waypoints),
+            'length': length,
+            'mine_hit_prob': float(np.sum(mine_hits & ~net_hits)) / total,
+            'net_hit_prob': float(np.sum(~mine_hits & net_hits)) / total,
+            'both_hit_prob': float(np.sum(mine_hits & net_hits)) / total,
+            'any_hit_prob': float(np.sum(mine_hits | net_hits)) / total,
+            'safe_prob': float(np.sum(~(mine_hits | net_hits))) / total,
+        }
+
+    def objective(self, waypoints: Sequence[Tuple[float, float, float]]) -> float:
+        mine_hits, net_hits = self.cache.route_flags(waypoints)
+        risk = float(np.mean(mine_hits | net_hits))
+        length = sum(np.linalg.norm(np.subtract(b, a))
+                     for a, b in zip(waypoints[:-1], waypoints[1:]))
+        detour = length / self.straight_length - 1 if self.straight_length > 0 else 0.0
+        return risk + self.length_weight * detour
+
+    def optimize(self, generations: int = 25, population: int = 60,
+                 elite_fraction: float = 0.15, smoothing: float = 0.7,
+                 seed: SeedLike = 0, verbose: bool = False) -> Dict:
+        """Run the cross-entropy search
+
+        Returns evaluate() of the best route found, plus its 'objective',
+        the best objective after each generation ('history') and the leg
+        cache 'cache_hits'/'cache_misses'.
+        """
+        rng = make_rng(seed)
+        t = np.arange(1, self.num_waypoints + 1)[:, None] / (self.num_waypoints + 1)
+        mean = np.asarray(self.start) + t * (np.subtract(self.end, self.start))
+        std = np.broadcast_to((self.upper - self.lower) / 4, mean.shape).copy()
+        num_elite = max(2, int(round(population * elite_fraction)))
+
+        best_free = self._snap(mean)
+        best_score = self.objective(self.route(best_free))
+        history = []
+        for generation in range(generations):
+            samples = self._snap(rng.normal(mean, std, size=(population,) + mean.shape))
+            scores = np.array([self.objective(self.route(s)) for s in samples])
+            elite = samples[np.argsort(scores, kind='stable')[:num_elite]]
+
+            if scores.min() < best_score:
+                best_score = float(scores.min())
+                best_free = samples[int(np.argmin(scores))]
+            history.append(best_score)
+
+            mean = smoothing * elite.mean(axis=0) + (1 - smoothing) * mean
+            std = smoothing * elite.std(axis=0) + (1 - smoothing) * std
+            if verbose:
+                print(f"Generation {generation + 1}/{generations}: best objective "
+                      f"{best_score:.4f}, {len(self.cache)} legs cached")
+
+        result = self.evaluate(self.route(best_free))
+        result.update(objective=best_score, history=history,
+                      cache_hits=self.cache.hits, cache_misses=self.cache.misses)
+        return result
\ No newline at end of file
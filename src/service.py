@@ -0,0 +1,527 @@
+"""
+Local asyncio service answering risk queries from a pool of warm worker processes
+
+Clients send one JSON object per line, ``{"id": ..., "query": {...}}``, over
+a Unix socket or TCP connection and receive JSON Lines events tagged with
+the same id: 'accepted', 'progress' after every finished chunk, then
+'result' or 'error'. Run ``python -m src.service --socket PATH`` (or
+``--port N``) to serve, and ServiceClient to query.
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from enum import Enum
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from .archive import MinefieldArchive, deployment_hash
+from .config import TacticalMineConfig
+from .minefield import MinefieldBatch
+from .simulation import (TacticalMineSimulation, empty_results, merge_results,
+                         record_outcomes, outcome_statistics)
+from .sweep import DEFAULT_ROUTES, ROUTE_KEYS
+from .util import INTERVAL_METHODS, config_hash
+
+QUERY_KEYS = ('config',) + ROUTE_KEYS + ('num_iterations', 'seed', 'batch_size',
+                                         'confidence', 'interval_method')
+
+# Simulations (with their path caches) kept per worker, least recently used dropped
+_MAX_SIMULATIONS = 8
+
+
+@dataclass
+class RiskQuery:
+    """A validated query; ``key`` identifies queries with identical results"""
+    config: TacticalMineConfig
+    routes: Dict[str, Tuple[float, ...]]
+    num_iterations: int
+    seed: int
+    batch_size: Optional[int]
+    confidence: float
+    interval_method: str
+    key: str
+
+
+def config_from_dict(values: Dict, base: TacticalMineConfig = None) -> TacticalMineConfig:
+    """``base`` (default TacticalMineConfig()) with JSON-style overrides applied
+
+    Enum fields take member names such as 'CRITICAL' and lists become
+    tuples. Unknown fields raise ValueError.
+    """
+    base = base or TacticalMineConfig()
+    unknown = set(values) - {f.name for f in fields(TacticalMineConfig)}
+    if unknown:
+        raise ValueError(f"Unknown config fields: {', '.join(sorted(unknown))}")
+
+    changes = {}
+    for name, value in values.items():
+        current = getattr(base, name)
+        if isinstance(current, Enum) and isinstance(value, str):
+            try:
+                value = type(current)[value]
+            except KeyError:
+                raise ValueError(f"Unknown {type(current).__name__}: {value!r}") from None
+        elif isinstance(current, tuple):
+            value = tuple(value)
+        changes[name] = value
+    return replace(base, **changes)
+
+
+def parse_query(query: Dict, base_config: TacticalMineConfig = None) -> RiskQuery:
+    """Validate a JSON query and fill in defaults
+
+    Keys are QUERY_KEYS: 'config' overrides for config_from_dict, the
+    run_simulation route endpoints (default sweep.DEFAULT_ROUTES) and run
+    arguments. ``num_iterations`` defaults to config.num_simulations.
+    """
+    if not isinstance(query, dict):
+        raise ValueError("A query must be a JSON object")
+    unknown = set(query) - set(QUERY_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown query fields: {', '.join(sorted(unknown))}")
+
+    config = config_from_dict(query.get('config') or {}, base_config)
+    routes = dict(DEFAULT_ROUTES, **{name: tuple(float(c) for c in query[name])
+                                     for name in ROUTE_KEYS if name in query})
+    num_iterations = int(query.get('num_iterations') or config.num_simulations)
+    seed = int(query.get('seed', 0))
+    batch_size = int(query['batch_size']) if query.get('batch_size') else None
+    confidence = float(query.get('confidence', 0.95))
+    interval_method = query.get('interval_method', 'wilson')
+    if num_iterations < 1:
+        raise ValueError("num_iterations must be at least 1")
+    if interval_method not in INTERVAL_METHODS:
+        raise ValueError(f"Unknown interval method: {interval_method!r}")
+
+    key = config_hash(config, seed=seed, batch_size=batch_size,
+                      num_iterations=num_iterations, routes=routes,
+                      confidence=confidence, interval_method=interval_method)
+    return RiskQuery(config, routes, num_iterations, seed, batch_size,
+                     confidence, interval_method, key)
+
+
+class _Job:
+    """An in-flight query: chunks still to run, merged counters and subscribers"""
+
+    def __init__(self, query: RiskQuery, chunks, loop: asyncio.AbstractEventLoop):
+        self.query = query
+        self.pending = deque(chunks)
+        self.completed = 0
+        self.results = empty_results()
+        self.library_chunks = 0
+        self.listeners = []
+        self.future = loop.create_future()
+        # Results and errors reach clients as events; nobody has to await the future
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    def progress(self) -> Dict:
+        """Progress event with the any-hit estimate over the chunks finished so far"""
+        completed = max(self.completed, 1)
+        return {
+            'event': 'progress',
+            'completed': self.completed,
+            'total': self.query.num_iterations,
+            'any_hit_prob': {vessel_type: (completed - counts['safe']) / completed
+                             for vessel_type, counts in self.results.items()},
+        }
+
+    def publish(self, event: Dict):
+        for queue in self.listeners:
+            queue.put_nowait(event)
+
+
+class QueryHandle:
+    """A submitted query
+
+    ``coalesced`` tells whether it joined an identical query already in
+    flight. events() yields its progress events and ends with the
+    'result' or 'error' event; result() waits for the statistics.
+    """
+
+    def __init__(self, job: _Job, coalesced: bool):
+        self.key = job.query.key
+        self.total = job.query.num_iterations
+        self.coalesced = coalesced
+        self._job = job
+        self._queue = asyncio.Queue()
+        job.listeners.append(self._queue)
+        if job.completed:
+            self._queue.put_nowait(job.progress())
+
+    async def events(self) -> AsyncIterator[Dict]:
+        while True:
+            event = await self._queue.get()
+            yield event
+            if event['event'] in ('result', 'error'):
+                return
+
+    async def result(self) -> Dict:
+        return await asyncio.shield(self._job.future)
+
+
+class RiskService:
+    """Risk queries run on a pool of ``workers`` warm processes
+
+    Workers import the simulator once, keep a TacticalMineSimulation (and
+    its path cache) per config, and open MinefieldArchive entries under
+    ``archive_root`` once: when an entry holds the fields a query would
+    deploy, they are read from it instead (see _run_chunk). Statistics are
+    identical to TacticalMineSimulation.run_simulation with the same
+    arguments.
+
+    Each query is split into chunks of ``chunk_size`` iterations (rounded
+    up to a multiple of batch_size). Chunks of all active queries are
+    handed to the pool round-robin, with at most ``max_in_flight`` (default
+    twice the workers) submitted at once, so concurrent queries share the
+    pool and no worker idles while work is queued. A query identical to
+    one in flight (same config, routes and run arguments) joins it instead
+    of running again.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 1000,
+                 archive_root: str = None, max_in_flight: int = None,
+                 base_config: TacticalMineConfig = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.archive_root = archive_root
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        self.base_config = base_config
+        self.counters = {'queries': 0, 'coalesced': 0, 'chunks': 0, 'library_chunks': 0}
+        self._pool = None
+        self._jobs = {}
+        self._ready = deque()
+        self._chunks = set()  # chunk futures submitted to the pool
+
+    async def start(self):
+        """Start the worker processes and wait until every one is warm"""
+        loop = asyncio.get_running_loop()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self.archive_root,))
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping)
+                               for _ in range(self.workers)))
+
+    async def close(self):
+        """Fail the queries in flight and shut the pool down"""
+        for job in list(self._jobs.values()):
+            self._fail(job, RuntimeError("Service closed"))
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            # Cancelling the wrappers cancels chunks not yet started in the
+            # pool; shutdown(cancel_futures=True) needs Python 3.9
+            for future in list(self._chunks):
+                future.cancel()
+            await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+    async def __aenter__(self) -> "RiskService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def submit(self, query: Dict) -> QueryHandle:
+        """Schedule a query, or join the identical one in flight; raises ValueError if invalid"""
+        if self._pool is None:
+            raise RuntimeError("Service is not running; call start() first")
+        request = parse_query(query, self.base_config)
+        self.counters['queries'] += 1
+        job = self._jobs.get(request.key)
+        if job is not None:
+            self.counters['coalesced'] += 1
+            return QueryHandle(job, coalesced=True)
+
+        step = self.chunk_size
+        if request.batch_size:
+            step = -(-step // request.batch_size) * request.batch_size
+        chunks = [(lo, min(lo + step, request.num_iterations))
+                  for lo in range(0, request.num_iterations, step)]
+        job = self._jobs[request.key] = _Job(request, chunks, asyncio.get_running_loop())
+        handle = QueryHandle(job, coalesced=False)
+        self._ready.append(job)
+        self._dispatch()
+        return handle
+
+    async def run(self, query: Dict, on_progress: Callable[[Dict], None] = None) -> Dict:
+        """Submit a query and return its statistics, passing progress events to ``on_progress``"""
+        handle = self.submit(query)
+        async for event in handle.events():
+            if event['event'] == 'progress' and on_progress is not None:
+                on_progress(event)
+        return await handle.result()
+
+    def _dispatch(self):
+        """Submit chunks round-robin over the ready queries until max_in_flight"""
+        loop = asyncio.get_running_loop()
+        while len(self._chunks) < self.max_in_flight and self._ready:
+            job = self._ready.popleft()
+            lo, hi = job.pending.popleft()
+            if job.pending:
+                self._ready.append(job)
+            request = job.query
+            future = loop.run_in_executor(self._pool, _run_chunk, request.config,
+                                          request.routes, request.seed, lo, hi,
+                                          request.batch_size)
+            self._chunks.add(future)
+            future.add_done_callback(functools.partial(self._chunk_done, job, hi - lo))
+
+    def _chunk_done(self, job: _Job, count: int, future: asyncio.Future):
+        self._chunks.discard(future)
+        if not job.future.done():
+            if future.cancelled():
+                self._fail(job, RuntimeError("Chunk cancelled"))
+            elif future.exception() is not None:
+                self._fail(job, future.exception())
+            else:
+                results, from_library = future.result()
+                merge_results(job.results, results)
+                job.completed += count
+                job.library_chunks += from_library
+                self.counters['chunks'] += 1
+                self.counters['library_chunks'] += from_library
+                if job.completed < job.query.num_iterations:
+                    job.publish(job.progress())
+                else:
+                    self._finish(job)
+        if self._pool is not None:
+            self._dispatch()
+
+    def _finish(self, job: _Job):
+        request = job.query
+        self._jobs.pop(request.key, None)
+        job.publish(job.progress())
+        stats = outcome_statistics(job.results, request.num_iterations,
+                                   request.confidence, request.interval_method)
+        stats = json.loads(json.dumps(stats))  # the form clients receive
+        job.future.set_result(stats)
+        job.publish({'event': 'result', 'key': request.key, 'stats': stats})
+
+    def _fail(self, job: _Job, error: BaseException):
+        self._jobs.pop(job.query.key, None)
+        if job in self._ready:
+            self._ready.remove(job)
+        job.pending.clear()
+        if not job.future.done():
+            job.future.set_exception(error)
+            job.publish({'event': 'error', 'message': f"{type(error).__name__}: {error}"})
+
+    async def serve(self, path: str = None, host: str = '127.0.0.1',
+                    port: int = 0) -> asyncio.AbstractServer:
+        """Listen for JSON Lines queries on the Unix socket ``path``, else on TCP host:port"""
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle_connection, path=path)
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(event: Dict):
+            async with lock:
+                writer.write(json.dumps(event).encode('utf-8') + b'\n')
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("A request must be a JSON object")
+                    request_id = request.get('id')
+                    handle = self.submit(request.get('query') or {})
+                except (ValueError, TypeError, RuntimeError) as exc:
+                    await send({'id': request_id, 'event': 'error', 'message': str(exc)})
+                    continue
+                task = asyncio.create_task(self._forward(handle, request_id, send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _forward(self, handle: QueryHandle, request_id, send):
+        await send({'id': request_id, 'event': 'accepted', 'key': handle.key,
+                    'coalesced': handle.coalesced, 'total': handle.total})
+        async for event in handle.events():
+            await send(dict(event, id=request_id))
+
+
+class ServiceClient:
+    """JSON Lines client of RiskService.serve, standing in for the planning tool
+
+    Any number of queries may run concurrently over one connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._streams = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, path: str = None, host: str = '127.0.0.1',
+                      port: int = None) -> "ServiceClient":
+        """Connect to the Unix socket ``path``, else to TCP host:port"""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def stream(self, query: Dict) -> AsyncIterator[Dict]:
+        """Send a query and yield its events through the final 'result' or 'error'"""
+        request_id = next(self._ids)
+        queue = self._streams[request_id] = asyncio.Queue()
+        try:
+            self._writer.write(json.dumps({'id': request_id, 'query': query}).encode('utf-8')
+                               + b'\n')
+            await self._writer.drain()
+            while True:
+                event = await queue.get()
+                yield event
+                if event['event'] in ('result', 'error'):
+                    return
+        finally:
+            self._streams.pop(request_id, None)
+
+    async def query(self, query: Dict, on_progress: Callable[[Dict], None] = None) -> Dict:
+        """Statistics of a query; raises RuntimeError if the service reports an error"""
+        async for event in self.stream(query):
+            if event['event'] == 'progress' and on_progress is not None:
+                on_progress(event)
+            elif event['event'] == 'result':
+                return event['stats']
+            elif event['event'] == 'error':
+                raise RuntimeError(event['message'])
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._listener
+
+    async def __aenter__(self) -> "ServiceClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _listen(self):
+        try:
+            while line := await self._reader.readline():
+                event = json.loads(line)
+                queue = self._streams.get(event.get('id'))
+                if queue is not None:
+                    queue.put_nowait(event)
+        except ConnectionError:
+            pass
+        for queue in self._streams.values():
+            queue.put_nowait({'event': 'error', 'message': "Connection closed"})
+
+
+# Per-process state of the pool workers, set up by _init_worker
+_worker = {}
+
+
+def _init_worker(archive_root: Optional[str]):
+    """Process-pool initializer: open the archive and warm the simulation code paths"""
+    _worker['simulations'] = {}
+    _worker['libraries'] = {}
+    _worker['archive'] = MinefieldArchive(archive_root) if archive_root else None
+    TacticalMineSimulation(TacticalMineConfig()).generate_minefield_batch(
+        (0.0, 0.0), (1000.0, 0.0), 1, seed=0)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _simulation(config: TacticalMineConfig) -> TacticalMineSimulation:
+    """The worker's simulation for ``config``, reused so its path cache stays warm"""
+    simulations = _worker['simulations']
+    key = config_hash(config, exclude=())
+    sim = simulations.pop(key, None) or TacticalMineSimulation(config)
+    simulations[key] = sim
+    while len(simulations) > _MAX_SIMULATIONS:
+        simulations.pop(next(iter(simulations)))
+    return sim
+
+
+def _library(config: TacticalMineConfig, routes: Dict, seed: int,
+             batch_size: Optional[int], stop: int) -> Optional[MinefieldBatch]:
+    """Archived fields a query would deploy, if an entry holds the first ``stop``"""
+    archive = _worker.get('archive')
+    if archive is None:
+        return None
+    key = (deployment_hash(config, routes['surface_start'], routes['surface_end'],
+                           batch_size), seed)
+    library = _worker['libraries'].get(key)
+    if library is None or len(library) < stop:
+        meta = archive.meta(*key)
+        if meta is None or meta['num_fields'] < stop:
+            return None
+        library = _worker['libraries'][key] = archive.load_key(*key)
+    return library
+
+
+def _run_chunk(config: TacticalMineConfig, routes: Dict, seed: int, start: int, stop: int,
+               batch_size: Optional[int]) -> Tuple[Dict, bool]:
+    """Process-pool worker: counters of iterations [start, stop) of a query
+
+    Returns (results, whether the fields came from the minefield library).
+    Field i of an archive entry is the field iteration i deploys, so
+    either way the counters match run_simulation.
+    """
+    sim = _simulation(config)
+    library = _library(config, routes, seed, batch_size, stop)
+    if library is None:
+        return sim.run_range(*(routes[name] for name in ROUTE_KEYS), seed, start, stop,
+                             batch_size), False
+
+    surface_path = sim.collision_path(routes['surface_start'], routes['surface_end'])
+    sub_path = sim.collision_path(routes['sub_start'], routes['sub_end'])
+    flags = sim.check_batch_safety(library.slice(start, stop), surface_path, sub_path)
+    results = empty_results()
+    for vessel_type, (mine_hits, net_hits) in flags.items():
+        record_outcomes(results[vessel_type], mine_hits, net_hits)
+    return results, True
+
+
+async def _serve_forever(args):
+    async with RiskService(args.workers, args.chunk_size, args.archive) as service:
+        server = await service.serve(args.socket, args.host, args.port)
+        where = args.socket or ', '.join(str(s.getsockname()) for s in server.sockets)
+        print(f"Serving risk queries with {service.workers} workers on {where}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--socket', help='Unix socket path (default: TCP on --host/--port)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help='iterations per scheduled chunk (default: 1000)')
+    parser.add_argument('--archive', help='MinefieldArchive root to read fields from')
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
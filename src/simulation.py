@@ -3,28 +3,89 @@ Core simulation engine for tactical mine warfare
 """
 
 import numpy as np
-from typing import List, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple, Dict
 from .config import TacticalMineConfig, RouteScenario
 from .mine_objects import SurfaceMine, MooredMine, BottomMine, Net3D
-from .utils import export_results_json
+from .minefield import Minefield, MinefieldBatch, MineType, NetField, Placement
+from .random_streams import SeedLike, make_rng, iteration_rng, batch_rng
+from .paths import PathCache, PathData, point_key
+from .profiling import NO_PHASE, PhaseProfile
+from .results_stream import ResultStreamWriter, outcome_rows
+from .spatial import PathIndex
+from .checkpoint import load_checkpoint, save_checkpoint
+from .util import config_hash, proportion_interval
 
 
 class TacticalMineSimulation:
-    """전술적 기뢰 부설 시뮬레이션"""
+    """전술적 기뢰 부설 시뮬레이션
     
-    def __init__(self, config: TacticalMineConfig):
+    All randomness comes from ``numpy.random.Generator`` objects; the global
+    NumPy random state is never touched, so separate instances can run
+    concurrently from threads.
+    
+    With ``config.profiling`` the wall time and call count of every phase
+    (deployment per mine class, nets, path generation, mine collision per
+    mine type, net collision) accumulate in ``profile``, a PhaseProfile;
+    otherwise ``profile`` is None and the phase hooks are no-ops.
+    """
+    
+    def __init__(self, config: TacticalMineConfig, seed: SeedLike = None):
         self.config = config
-        self.surface_mines: List[SurfaceMine] = []
-        self.moored_mines: List[MooredMine] = []
-        self.bottom_mines: List[BottomMine] = []
-        self.nets: List[Net3D] = []
-        
-        self.results = {
-            'surface_vessel': {'mine_hits': 0, 'net_hits': 0, 'both_hits': 0, 'safe': 0},
-            'submarine': {'mine_hits': 0, 'net_hits': 0, 'both_hits': 0, 'safe': 0}
-        }
+        self.rng = make_rng(seed)
+        self.minefield = Minefield.empty()
+        self.netfield = NetField.empty()
+        
+        self.results = empty_results()
         
         self.scenario_results = {}
+        self.path_cache = PathCache()
+        self.profile = PhaseProfile() if config.profiling else None
+    
+    @property
+    def surface_mines(self) -> List[SurfaceMine]:
+        """Surface mines as object views over the mine field arrays"""
+        return self.minefield.to_objects(MineType.SURFACE)
+    
+    @surface_mines.setter
+    def surface_mines(self, mines: List[SurfaceMine]):
+        self._replace_mines(MineType.SURFACE, mines)
+    
+    @property
+    def moored_mines(self) -> List[MooredMine]:
+        """Moored mines as object views over the mine field arrays"""
+        return self.minefield.to_objects(MineType.MOORED)
+    
+    @moored_mines.setter
+    def moored_mines(self, mines: List[MooredMine]):
+        self._replace_mines(MineType.MOORED, mines)
+    
+    @property
+    def bottom_mines(self) -> List[BottomMine]:
+        """Bottom mines as object views over the mine field arrays"""
+        return self.minefield.to_objects(MineType.BOTTOM)
+    
+    @bottom_mines.setter
+    def bottom_mines(self, mines: List[BottomMine]):
+        self._replace_mines(MineType.BOTTOM, mines)
+    
+    @property
+    def nets(self) -> List[Net3D]:
+        """Nets as object views over the net field arrays"""
+        return self.netfield.to_objects()
+    
+    @nets.setter
+    def nets(self, nets: List[Net3D]):
+        self.netfield = NetField.from_nets(nets)
+    
+    def _replace_mines(self, mine_type: MineType, mines: List):
+        """Replace all mines of one type in the mine field"""
+        kept = self.minefield.select(self.minefield.kind != mine_type)
+        self.minefield = Minefield.concatenate([kept, Minefield.from_mines(mines)])
+    
+    def _phase(self, name: str):
+        """Timing context for one phase; a shared no-op unless profiling is on"""
+        return self.profile.phase(name) if self.profile is not None else NO_PHASE
     
     def _calculate_core_route(self, start: Tuple[float, float], 
                              end: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray]:
@@ -36,195 +97,276 @@ class TacticalMineSimulation:
     
     def generate_tactical_mines(self, start: Tuple[float, float], 
                                 end: Tuple[float, float], 
-                                seed: int = None):
-        """Generate tactical mine deployment"""
-        if seed is not None:
-            np.random.seed(seed)
+                                seed: int = None,
+                                rng: np.random.Generator = None):
+        """Generate tactical mine deployment
         
-        total_mines = self.config.threat_level.value[0]
+        Random numbers are drawn from ``rng`` when given, otherwise from a
+        fresh generator seeded with ``seed``, falling back to the
+        simulation's own generator.
+        """
+        batch = self.generate_minefield_batch(start, end, 1, seed=seed, rng=rng)
+        self.minefield, self.netfield = batch.field(0)
+    
+    def generate_minefield_batch(self, start: Tuple[float, float], 
+                                 end: Tuple[float, float], 
+                                 num_fields: int,
+                                 seed: int = None,
+                                 rng: np.random.Generator = None,
+                                 sampler=None) -> MinefieldBatch:
+        """Generate a batch of independent mine fields in one shot
         
-        # Mine type ratio (surface:moored:bottom = 3:4:3)
-        num_surface = int(total_mines * 0.3)
-        num_moored = int(total_mines * 0.4)
-        num_bottom = total_mines - num_surface - num_moored
+        Every random quantity is drawn for all ``num_fields`` fields at once,
+        so the result holds stacked (num_fields, num_mines, 3) mine positions
+        and (num_fields, num_nets, 2, 2) net endpoints. A batch of one is the
+        field generate_tactical_mines deploys from the same generator.
+        
+        A ``sampler`` (see src.variance_reduction) draws the spacing, the
+        scattered mine positions and the mine depths in place of ``rng``,
+        e.g. stratified or importance sampled.
+        """
+        if rng is None:
+            rng = make_rng(seed) if seed is not None else self.rng
+        
+        classes = self.mine_classes()
+        total_mines = self.config.threat_level.value[0]
+        num_surface = classes[MineType.SURFACE]['count']
+        num_moored = classes[MineType.MOORED]['count']
+        num_bottom = classes[MineType.BOTTOM]['count']
         
         direction, perpendicular = self._calculate_core_route(start, end)
         route_length = np.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
         
         # Deploy surface mines
-        self._deploy_surface_mines(start, end, perpendicular, route_length, 
-                                   num_surface)
+        with self._phase('deploy.surface_mines'):
+            surface_mines = self._deploy_surface_mines(rng, start, end, perpendicular, 
+                                                       route_length, num_surface, num_fields,
+                                                       sampler)
         
         # Deploy moored mines
-        self._deploy_moored_mines(start, end, perpendicular, route_length, 
-                                 num_moored)
+        with self._phase('deploy.moored_mines'):
+            moored_mines = self._deploy_moored_mines(rng, start, end, perpendicular, 
+                                                     route_length, num_moored, num_fields,
+                                                     sampler)
         
         # Deploy bottom mines
-        self._deploy_bottom_mines(start, end, perpendicular, route_length, 
-                                 num_bottom)
+        with self._phase('deploy.bottom_mines'):
+            bottom_mines = self._deploy_bottom_mines(rng, start, end, perpendicular, 
+                                                     route_length, num_bottom, num_fields,
+                                                     sampler)
+        
+        positions = np.concatenate([surface_mines[0], moored_mines[0], 
+                                    bottom_mines[0]], axis=1)
+        placement = np.concatenate([surface_mines[1], moored_mines[1], 
+                                    bottom_mines[1]], axis=1)
+        kind = np.repeat(np.array([MineType.SURFACE, MineType.MOORED, MineType.BOTTOM], 
+                                  dtype=np.int8), 
+                         [num_surface, num_moored, num_bottom])
         
         # Deploy nets
-        self._deploy_nets()
+        with self._phase('deploy.nets'):
+            net_endpoints, net_z_top, net_z_bottom = self._deploy_nets(rng, num_fields)
+        
+        return MinefieldBatch(positions, np.full(total_mines, self.config.mine_radius),
+                              kind, placement, net_endpoints, net_z_top, net_z_bottom,
+                              np.full(self.config.num_nets, self.config.net_width))
     
-    def _deploy_surface_mines(self, start, end, perpendicular, route_length, num_surface):
-        """Deploy surface mines"""
-        self.surface_mines = []
-        num_linear = int(num_surface * self.config.linear_density)
-        spacing = np.random.uniform(*self.config.surface_mine_spacing)
-        num_line_mines = int(route_length / spacing)
+    def mine_classes(self) -> Dict[MineType, Dict]:
+        """Deployment parameters of each mine class, in deployment order
         
-        # Linear deployment
-        for i in range(min(num_linear, num_line_mines)):
-            t = i / max(num_line_mines - 1, 1)
-            base_x = start[0] + t * (end[0] - start[0])
-            base_y = start[1] + t * (end[1] - start[1])
-            
-            offset = np.random.uniform(-self.config.core_route_width/3, 
-                                      self.config.core_route_width/3)
-            x = base_x + offset * perpendicular[0]
-            y = base_y + offset * perpendicular[1]
-            z = np.random.uniform(*self.config.surface_mine_depth_range)
-            
-            x = np.clip(x, 0, self.config.area_width)
-            y = np.clip(y, 0, self.config.area_height)
-            
-            self.surface_mines.append(SurfaceMine(x, y, z, self.config.mine_radius, "linear"))
+        'count' mines of a class are laid, 'spacing_range', 'half_width',
+        'spread' and 'depth_range' as described in _deploy_mines.
+        """
+        config = self.config
+        total_mines = config.threat_level.value[0]
         
-        # Random deployment
-        num_random = num_surface - len(self.surface_mines)
-        for _ in range(num_random):
-            mid_x = (start[0] + end[0]) / 2
-            mid_y = (start[1] + end[1]) / 2
-            
-            x = np.random.normal(mid_x, self.config.area_width / 4)
-            y = np.random.normal(mid_y, self.config.area_height / 4)
-            z = np.random.uniform(*self.config.surface_mine_depth_range)
-            
-            x = np.clip(x, 0, self.config.area_width)
-            y = np.clip(y, 0, self.config.area_height)
-            
-            self.surface_mines.append(SurfaceMine(x, y, z, self.config.mine_radius, "random"))
+        # Mine type ratio (surface:moored:bottom = 3:4:3)
+        num_surface = int(total_mines * 0.3)
+        num_moored = int(total_mines * 0.4)
+        return {
+            MineType.SURFACE: dict(count=num_surface,
+                                   spacing_range=config.surface_mine_spacing,
+                                   half_width=config.core_route_width / 3, spread=4,
+                                   depth_range=config.surface_mine_depth_range),
+            MineType.MOORED: dict(count=num_moored,
+                                  spacing_range=config.subsurface_mine_spacing,
+                                  half_width=config.core_route_width / 2, spread=3,
+                                  depth_range=config.subsurface_mine_depth_range),
+            MineType.BOTTOM: dict(count=total_mines - num_surface - num_moored,
+                                  spacing_range=config.subsurface_mine_spacing,
+                                  half_width=config.core_route_width / 2, spread=3,
+                                  depth_range=None),
+        }
     
-    def _deploy_moored_mines(self, start, end, perpendicular, route_length, num_moored):
+    def _deploy_surface_mines(self, rng: np.random.Generator, start, end, 
+                              perpendicular, route_length, num_surface, 
+                              num_fields: int = 1, sampler=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Deploy surface mines"""
+        return self._deploy_mines(rng, start, end, perpendicular, route_length, 
+                                  num_surface, num_fields, MineType.SURFACE, sampler)
+    
+    def _deploy_moored_mines(self, rng: np.random.Generator, start, end, 
+                             perpendicular, route_length, num_moored, 
+                             num_fields: int = 1, sampler=None) -> Tuple[np.ndarray, np.ndarray]:
         """Deploy moored mines"""
-        self.moored_mines = []
-        num_linear = int(num_moored * self.config.linear_density)
-        spacing = np.random.uniform(*self.config.subsurface_mine_spacing)
-        num_line_mines = int(route_length / spacing)
+        return self._deploy_mines(rng, start, end, perpendicular, route_length, 
+                                  num_moored, num_fields, MineType.MOORED, sampler)
+    
+    def _deploy_bottom_mines(self, rng: np.random.Generator, start, end, 
+                             perpendicular, route_length, num_bottom, 
+                             num_fields: int = 1, sampler=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Deploy bottom mines"""
+        return self._deploy_mines(rng, start, end, perpendicular, route_length, 
+                                  num_bottom, num_fields, MineType.BOTTOM, sampler)
+    
+    def _deploy_mines(self, rng: np.random.Generator, start, end, perpendicular, 
+                      route_length, num_mines: int, num_fields: int,
+                      mine_type: MineType, sampler=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Deploy one mine class into num_fields fields with batched draws
+        
+        Linear mines sit at evenly spaced points along the core route with a
+        uniform perpendicular offset of +/- half_width; the rest are scattered
+        normally around the route midpoint with sigma = area / spread. Without
+        a depth_range the mines rest on the seabed. The spacing, and with it
+        the number of linear mines, is drawn per field. Parameters come from
+        mine_classes(); a ``sampler`` draws the spacing, the scattered
+        positions and the depths in place of ``rng``.
+        
+        Returns (positions, placement) of shape (num_fields, num_mines, 3)
+        and (num_fields, num_mines).
+        """
+        params = self.mine_classes()[mine_type]
+        half_width, depth_range = params['half_width'], params['depth_range']
+        
+        shape = (num_fields, num_mines)
+        num_linear = int(num_mines * self.config.linear_density)
+        if sampler is None:
+            spacing = rng.uniform(*params['spacing_range'], num_fields)
+        else:
+            spacing = sampler.spacing(rng, mine_type, params['spacing_range'], num_fields)
+        num_line_mines = (route_length / spacing).astype(int)
         
         # Linear deployment
-        for i in range(min(num_linear, num_line_mines)):
-            t = i / max(num_line_mines - 1, 1)
-            base_x = start[0] + t * (end[0] - start[0])
-            base_y = start[1] + t * (end[1] - start[1])
-            
-            offset = np.random.uniform(-self.config.core_route_width/2, 
-                                      self.config.core_route_width/2)
-            x = base_x + offset * perpendicular[0]
-            y = base_y + offset * perpendicular[1]
-            z = np.random.uniform(*self.config.subsurface_mine_depth_range)
-            
-            x = np.clip(x, 0, self.config.area_width)
-            y = np.clip(y, 0, self.config.area_height)
-            
-            self.moored_mines.append(MooredMine(x, y, z, self.config.mine_radius, "linear"))
+        n_linear = np.minimum(num_linear, num_line_mines)
+        index = np.arange(num_mines)
+        is_linear = index[None, :] < n_linear[:, None]
+        t = index[None, :] / np.maximum(num_line_mines - 1, 1)[:, None]
+        offset = rng.uniform(-half_width, half_width, shape)
+        linear_x = start[0] + t * (end[0] - start[0]) + offset * perpendicular[0]
+        linear_y = start[1] + t * (end[1] - start[1]) + offset * perpendicular[1]
         
         # Random deployment
-        num_random = num_moored - len(self.moored_mines)
-        for _ in range(num_random):
-            mid_x = (start[0] + end[0]) / 2
-            mid_y = (start[1] + end[1]) / 2
-            
-            x = np.random.normal(mid_x, self.config.area_width / 3)
-            y = np.random.normal(mid_y, self.config.area_height / 3)
-            z = np.random.uniform(*self.config.subsurface_mine_depth_range)
-            
-            x = np.clip(x, 0, self.config.area_width)
-            y = np.clip(y, 0, self.config.area_height)
-            
-            self.moored_mines.append(MooredMine(x, y, z, self.config.mine_radius, "random"))
+        mid_x = (start[0] + end[0]) / 2
+        mid_y = (start[1] + end[1]) / 2
+        sigma = (self.config.area_width / params['spread'], 
+                 self.config.area_height / params['spread'])
+        if sampler is None:
+            random_x = rng.normal(mid_x, sigma[0], shape)
+            random_y = rng.normal(mid_y, sigma[1], shape)
+        else:
+            random_x, random_y = sampler.scatter(rng, start, end, (mid_x, mid_y), sigma, 
+                                                 ~is_linear)
+        
+        positions = np.empty(shape + (3,))
+        positions[..., 0] = np.clip(np.where(is_linear, linear_x, random_x), 
+                                    0, self.config.area_width)
+        positions[..., 1] = np.clip(np.where(is_linear, linear_y, random_y), 
+                                    0, self.config.area_height)
+        if depth_range is not None and sampler is not None:
+            positions[..., 2] = sampler.depth(rng, depth_range, ~is_linear)
+        elif depth_range is not None:
+            positions[..., 2] = rng.uniform(*depth_range, shape)
+        else:
+            positions[..., 2] = self.config.max_depth
+        
+        placement = np.where(is_linear, Placement.LINEAR, Placement.RANDOM).astype(np.int8)
+        return positions, placement
     
-    def _deploy_bottom_mines(self, start, end, perpendicular, route_length, num_bottom):
-        """Deploy bottom mines"""
-        self.bottom_mines = []
-        num_linear = int(num_bottom * self.config.linear_density)
-        spacing = np.random.uniform(*self.config.subsurface_mine_spacing)
-        num_line_mines = int(route_length / spacing)
+    def _deploy_nets(self, rng: np.random.Generator, 
+                     num_fields: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Deploy nets
         
-        # Linear deployment
-        for i in range(min(num_linear, num_line_mines)):
-            t = i / max(num_line_mines - 1, 1)
-            base_x = start[0] + t * (end[0] - start[0])
-            base_y = start[1] + t * (end[1] - start[1])
-            
-            offset = np.random.uniform(-self.config.core_route_width/2, 
-                                      self.config.core_route_width/2)
-            x = base_x + offset * perpendicular[0]
-            y = base_y + offset * perpendicular[1]
-            
-            x = np.clip(x, 0, self.config.area_width)
-            y = np.clip(y, 0, self.config.area_height)
-            
-            self.bottom_mines.append(BottomMine(x, y, self.config.max_depth, 
-                                               self.config.mine_radius, "linear"))
+        Returns endpoints of shape (num_fields, num_nets, 2, 2) and the top
+        and bottom depths of shape (num_fields, num_nets).
+        """
+        shape = (num_fields, self.config.num_nets)
+        x1 = rng.uniform(0, self.config.area_width, shape)
+        y1 = rng.uniform(0, self.config.area_height, shape)
         
-        # Random deployment
-        num_random = num_bottom - len(self.bottom_mines)
-        for _ in range(num_random):
-            mid_x = (start[0] + end[0]) / 2
-            mid_y = (start[1] + end[1]) / 2
-            
-            x = np.random.normal(mid_x, self.config.area_width / 3)
-            y = np.random.normal(mid_y, self.config.area_height / 3)
-            
-            x = np.clip(x, 0, self.config.area_width)
-            y = np.clip(y, 0, self.config.area_height)
-            
-            self.bottom_mines.append(BottomMine(x, y, self.config.max_depth, 
-                                               self.config.mine_radius, "random"))
-    
-    def _deploy_nets(self):
-        """Deploy nets"""
-        self.nets = []
-        for _ in range(self.config.num_nets):
-            x1 = np.random.uniform(0, self.config.area_width)
-            y1 = np.random.uniform(0, self.config.area_height)
-            
-            length = np.random.uniform(*self.config.net_length_range)
-            angle = np.random.uniform(0, 2 * np.pi)
-            
-            x2 = np.clip(x1 + length * np.cos(angle), 0, self.config.area_width)
-            y2 = np.clip(y1 + length * np.sin(angle), 0, self.config.area_height)
-            
-            z_top = np.random.uniform(*self.config.net_depth_range)
-            z_bottom = z_top + np.random.uniform(50, 150)
-            
-            self.nets.append(Net3D(x1, y1, x2, y2, z_top, z_bottom, self.config.net_width))
+        length = rng.uniform(*self.config.net_length_range, shape)
+        angle = rng.uniform(0, 2 * np.pi, shape)
+        
+        x2 = np.clip(x1 + length * np.cos(angle), 0, self.config.area_width)
+        y2 = np.clip(y1 + length * np.sin(angle), 0, self.config.area_height)
+        
+        z_top = rng.uniform(*self.config.net_depth_range, shape)
+        z_bottom = z_top + rng.uniform(50, 150, shape)
+        
+        endpoints = np.stack([np.stack([x1, y1], axis=-1), 
+                              np.stack([x2, y2], axis=-1)], axis=-2)
+        return endpoints, z_top, z_bottom
     
     def generate_path_2d(self, start: Tuple[float, float], 
                         end: Tuple[float, float]) -> np.ndarray:
-        """Generate 2D path for surface vessel"""
+        """Generate 2D path for surface vessel
+        
+        Paths are memoized in ``path_cache``; the returned array is read-only.
+        """
+        key = ('2d', point_key(start), point_key(end), self.config.path_sampling_points)
+        return self.path_cache.get(key, lambda: self._sample_path_2d(start, end)).points
+    
+    def generate_path_3d(self, start: Tuple[float, float, float], 
+                        end: Tuple[float, float, float]) -> np.ndarray:
+        """Generate 3D path for submarine (memoized, read-only)"""
+        key = ('3d', point_key(start), point_key(end), self.config.path_sampling_points)
+        return self.path_cache.get(key, lambda: self._sample_path_3d(start, end)).points
+    
+    def generate_scenario_path(self, scenario: RouteScenario, 
+                              start: Tuple[float, float, float],
+                              end: Tuple[float, float, float]) -> np.ndarray:
+        """Generate path based on scenario (memoized, read-only)"""
+        key = ('scenario', scenario, point_key(start), point_key(end),
+               self.config.path_sampling_points, self.config.max_depth)
+        return self.path_cache.get(
+            key, lambda: self._build_scenario_path(scenario, start, end)).points
+    
+    def path_data(self, path: np.ndarray) -> PathData:
+        """Precomputed segment data of a path, from the cache when it came from there"""
+        cached = self.path_cache.lookup(path)
+        return cached if cached is not None else PathData(path)
+    
+    def _sample_path_2d(self, start: Tuple[float, float], 
+                        end: Tuple[float, float]) -> np.ndarray:
+        """Sample a straight surface path"""
         t = np.linspace(0, 1, self.config.path_sampling_points)
         x = start[0] + t * (end[0] - start[0])
         y = start[1] + t * (end[1] - start[1])
         z = np.zeros_like(x)
         return np.column_stack([x, y, z])
     
-    def generate_path_3d(self, start: Tuple[float, float, float], 
+    def _sample_path_3d(self, start: Tuple[float, float, float], 
                         end: Tuple[float, float, float]) -> np.ndarray:
-        """Generate 3D path for submarine"""
+        """Sample a straight 3D path"""
         t = np.linspace(0, 1, self.config.path_sampling_points)
         x = start[0] + t * (end[0] - start[0])
         y = start[1] + t * (end[1] - start[1])
         z = start[2] + t * (end[2] - start[2])
         return np.column_stack([x, y, z])
     
-    def generate_scenario_path(self, scenario: RouteScenario, 
-                              start: Tuple[float, float, float],
-                              end: Tuple[float, float, float]) -> np.ndarray:
-        """Generate path based on scenario"""
+    def _build_scenario_path(self, scenario: RouteScenario, 
+                             start: Tuple[float, float, float],
+                             end: Tuple[float, float, float]) -> np.ndarray:
+        """Sample the path of a route scenario leg by leg"""
+        waypoints = self._scenario_waypoints(scenario, start, end)
+        return np.vstack([self._sample_path_3d(a, b) 
+                          for a, b in zip(waypoints[:-1], waypoints[1:])])
+    
+    def _scenario_waypoints(self, scenario: RouteScenario, 
+                            start: Tuple[float, float, float],
+                            end: Tuple[float, float, float]) -> List[Tuple[float, float, float]]:
+        """Waypoints of a route scenario, joined by straight legs"""
         if scenario == RouteScenario.DIRECT:
-            return self.generate_path_3d(start, end)
+            return [start, end]
         
         elif scenario == RouteScenario.ZIGZAG:
             waypoints = []
@@ -238,12 +380,7 @@ class TacticalMineSimulation:
                 z = start[2] + t * (end[2] - start[2])
                 waypoints.append((x, y, z))
             
-            paths = [self.generate_path_3d(start, waypoints[0])]
-            for i in range(len(waypoints) - 1):
-                paths.append(self.generate_path_3d(waypoints[i], waypoints[i+1]))
-            paths.append(self.generate_path_3d(waypoints[-1], end))
-            
-            return np.vstack(paths)
+            return [start] + waypoints + [end]
         
         elif scenario == RouteScenario.DEEP_DIVE:
             mid_x = (start[0] + end[0]) / 2
@@ -251,57 +388,212 @@ class TacticalMineSimulation:
             mid_z = min(250, self.config.max_depth - 30)
             mid = (mid_x, mid_y, mid_z)
             
-            path1 = self.generate_path_3d(start, mid)
-            path2 = self.generate_path_3d(mid, end)
-            return np.vstack([path1, path2])
+            return [start, mid, end]
         
         elif scenario == RouteScenario.COASTAL:
             waypoint1 = (start[0] + 1000, 500, start[2])
             waypoint2 = (end[0] - 1000, 500, end[2])
             
-            path1 = self.generate_path_3d(start, waypoint1)
-            path2 = self.generate_path_3d(waypoint1, waypoint2)
-            path3 = self.generate_path_3d(waypoint2, end)
-            
-            return np.vstack([path1, path2, path3])
+            return [start, waypoint1, waypoint2, end]
+    
+    def generate_scenario_waypoints(self, scenario: RouteScenario,
+                                    start: Tuple[float, float, float],
+                                    end: Tuple[float, float, float]) -> np.ndarray:
+        """Waypoints of a route scenario as a read-only (L + 1, 3) array (memoized)"""
+        key = ('waypoints', scenario, point_key(start), point_key(end), 
+               self.config.max_depth)
+        return self.path_cache.get(
+            key, lambda: np.array(self._scenario_waypoints(scenario, start, end), 
+                                  dtype=np.float64)).points
+    
+    def collision_path(self, start, end, scenario: RouteScenario = None) -> np.ndarray:
+        """Path handed to the collision checks under ``config.collision_mode``
+        
+        'sampled' returns the sampled path (generate_path_2d for 2D
+        endpoints, generate_path_3d or generate_scenario_path otherwise);
+        'swept' returns only the waypoints, whose legs are tested exactly.
+        """
+        with self._phase('paths'):
+            return self._collision_path(start, end, scenario)
+    
+    def _collision_path(self, start, end, scenario: RouteScenario = None) -> np.ndarray:
+        swept = self.config.collision_mode == 'swept'
+        if len(start) == 2:
+            if not swept:
+                return self.generate_path_2d(start, end)
+            start, end = (start[0], start[1], 0.0), (end[0], end[1], 0.0)
+        scenario = scenario or RouteScenario.DIRECT
+        if swept:
+            return self.generate_scenario_waypoints(scenario, start, end)
+        if scenario == RouteScenario.DIRECT:
+            return self.generate_path_3d(start, end)
+        return self.generate_scenario_path(scenario, start, end)
+    
+    def path_index(self, path: np.ndarray) -> Optional[PathIndex]:
+        """Spatial index of a path, or None when the broad phase is disabled
+        
+        Indexes of cached paths are built once and reused. Swept collision
+        tests work on whole legs and do not use an index.
+        """
+        if not self.config.spatial_index or self._swept:
+            return None
+        return self.path_data(path).index
+    
+    @property
+    def _swept(self) -> bool:
+        return self.config.collision_mode == 'swept'
     
-    def check_surface_vessel_safety(self, path: np.ndarray) -> Tuple[bool, bool]:
-        """Check safety for surface vessel"""
-        mine_hit = any(mine.check_collision_2d(path, self.config.vessel_width,
-                                               self.config.vessel_draft)
-                      for mine in self.surface_mines)
+    @property
+    def _any_hit(self) -> bool:
+        return self.config.hit_mode == 'any_hit'
+    
+    def _corridor(self, vessel_width: float) -> float:
+        """Distance from the route within which a linear mine reaches a vessel on it"""
+        return self.config.mine_radius + vessel_width / 2
+    
+    def check_surface_vessel_safety(self, path: np.ndarray,
+                                    path_index: Optional[PathIndex] = None) -> Tuple[bool, bool]:
+        """Check safety for surface vessel
+        
+        A ``path_index`` from path_index() can be reused across mine fields.
+        In 'swept' collision mode ``path`` holds waypoints (see collision_path).
+        With ``config.hit_mode='any_hit'`` the check stops at the first
+        contact (see _first_contact).
+        """
+        if path_index is None:
+            path_index = self.path_index(path)
+        check = lambda field: field.check_surface_vessel(path, self.config.vessel_width,
+                                                         self.config.vessel_draft, 
+                                                         path_index, self._swept)
+        net_check = lambda: self.netfield.check_collision_2d(path, self.config.vessel_width,
+                                                             self.config.vessel_draft,
+                                                             path_index, self._swept)
+        if self._any_hit:
+            return self._first_contact(path, self.config.vessel_width, check, net_check)
+        
+        if self.profile is None:
+            mine_hit = check(self.minefield)
+        else:
+            mine_hit = self._profiled_mine_check(check, (MineType.SURFACE,))
         
-        net_hit = any(net.check_collision_2d(path, self.config.vessel_width,
-                                             self.config.vessel_draft)
-                     for net in self.nets)
+        with self._phase('collision.nets'):
+            net_hit = net_check()
         
         return mine_hit, net_hit
     
-    def check_submarine_safety(self, path: np.ndarray) -> Tuple[bool, bool]:
+    def check_submarine_safety(self, path: np.ndarray,
+                               path_index: Optional[PathIndex] = None) -> Tuple[bool, bool]:
         """Check safety for submarine"""
-        mine_hit = False
+        if path_index is None:
+            path_index = self.path_index(path)
+        check = lambda field: field.check_submarine(path, self.config.submarine_width,
+                                                    path_index, self._swept)
+        net_check = lambda: self.netfield.check_collision_3d(path, self.config.submarine_width,
+                                                             path_index, self._swept)
+        if self._any_hit:
+            return self._first_contact(path, self.config.submarine_width, check, net_check)
         
-        for mine in self.surface_mines:
-            if mine.check_collision_3d(path, self.config.submarine_width):
-                mine_hit = True
-                break
+        if self.profile is None:
+            mine_hit = check(self.minefield)
+        else:
+            mine_hit = self._profiled_mine_check(check, tuple(MineType))
         
-        if not mine_hit:
-            for mine in self.moored_mines:
-                if mine.check_collision_3d(path, self.config.submarine_width):
-                    mine_hit = True
-                    break
+        with self._phase('collision.nets'):
+            net_hit = net_check()
         
-        if not mine_hit:
-            for mine in self.bottom_mines:
-                if mine.check_collision_3d(path, self.config.submarine_width):
-                    mine_hit = True
-                    break
+        return mine_hit, net_hit
+    
+    def _first_contact(self, path: np.ndarray, vessel_width: float, 
+                       check, net_check) -> Tuple[bool, bool]:
+        """Any-hit check of the current field that stops at the first contact
         
-        net_hit = any(net.check_collision_3d(path, self.config.submarine_width)
-                     for net in self.nets)
+        Linear mines within reach of the straight route between the path's
+        endpoints are tested first, then the other mines, then the nets. A
+        net hit is only reported when no mine is hit, so the flags give the
+        first contact found rather than the full breakdown.
         
-        return mine_hit, net_hit
+        The stages are timed as 'collision.mines.near_route',
+        'collision.mines.other' and 'collision.nets'; 'early_exit.near_route'
+        and 'early_exit.mines' count the checks that stopped after a stage.
+        """
+        near, other = self.minefield.route_split(path[0], path[-1], 
+                                                 self._corridor(vessel_width))
+        with self._phase('collision.mines.near_route'):
+            hit = check(near)
+        if hit:
+            self._count('early_exit.near_route')
+            return True, False
+        
+        with self._phase('collision.mines.other'):
+            hit = check(other)
+        if hit:
+            self._count('early_exit.mines')
+            return True, False
+        
+        with self._phase('collision.nets'):
+            return False, net_check()
+    
+    def _count(self, name: str):
+        if self.profile is not None:
+            self.profile.count(name)
+    
+    def _profiled_mine_check(self, check, mine_types) -> bool:
+        """Run ``check`` on one mine type at a time, stopping at the first hit
+        
+        Each type is timed as 'collision.mines.<type>'; hits are counted per
+        type, and 'early_exit.mines' counts checks that skipped the
+        remaining types.
+        """
+        for i, mine_type in enumerate(mine_types):
+            name = mine_type.name.lower()
+            with self.profile.phase(f'collision.mines.{name}'):
+                hit = check(self.minefield.of_type(mine_type))
+            if hit:
+                self.profile.count(f'hits.mines.{name}')
+                if i < len(mine_types) - 1:
+                    self.profile.count('early_exit.mines')
+                return True
+        return False
+    
+    def check_batch_safety(self, batch: MinefieldBatch, surface_path: np.ndarray,
+                           sub_path: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Check safety of both vessels against every field of a batch
+        
+        Returns (mine_hits, net_hits) flag arrays of shape (len(batch),) for
+        'surface_vessel' and 'submarine'.
+        """
+        with self._phase('collision.batch'):
+            return self._check_batch_safety(batch, surface_path, sub_path)
+    
+    def _check_batch_safety(self, batch: MinefieldBatch, surface_path: np.ndarray,
+                            sub_path: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        config = self.config
+        surface_index = self.path_index(surface_path)
+        if self._any_hit:
+            priority = batch.near_route(surface_path[0], surface_path[-1],
+                                        self._corridor(config.vessel_width))
+            surface_flags = batch.first_contact_surface_vessel(
+                surface_path, config.vessel_width, config.vessel_draft, priority,
+                surface_index, self._swept)
+        else:
+            surface_flags = batch.check_surface_vessel(surface_path, config.vessel_width,
+                                                       config.vessel_draft, surface_index,
+                                                       self._swept)
+        return {
+            'surface_vessel': surface_flags,
+            'submarine': self._check_batch_submarine(batch, sub_path, 
+                                                     self.path_index(sub_path))
+        }
+    
+    def _check_batch_submarine(self, batch: MinefieldBatch, path: np.ndarray,
+                               path_index: Optional[PathIndex]) -> Tuple[np.ndarray, np.ndarray]:
+        """Submarine (mine_hits, net_hits) of a batch under ``config.hit_mode``"""
+        width = self.config.submarine_width
+        if self._any_hit:
+            priority = batch.near_route(path[0], path[-1], self._corridor(width))
+            return batch.first_contact_submarine(path, width, priority, path_index, 
+                                                 self._swept)
+        return batch.check_submarine(path, width, path_index, self._swept)
     
     def run_simulation(self, 
                       surface_start: Tuple[float, float],
@@ -309,88 +601,432 @@ class TacticalMineSimulation:
                       sub_start: Tuple[float, float, float],
                       sub_end: Tuple[float, float, float],
                       num_iterations: int = None,
-                      verbose: bool = True) -> Dict:
-        """Run main simulation"""
+                      verbose: bool = True,
+                      seed: int = 0,
+                      workers: int = 1,
+                      batch_size: int = None,
+                      target_half_width: float = None,
+                      confidence: float = 0.95,
+                      interval_method: str = 'wilson',
+                      check_interval: int = 100,
+                      stream: ResultStreamWriter = None,
+                      checkpoint: str = None,
+                      checkpoint_interval: int = 1000) -> Dict:
+        """Run main simulation
+        
+        Iteration i deploys its mine field from an independent generator
+        derived from ``SeedSequence(seed, spawn_key=(i,))``, so the results for
+        a given master seed are identical for any number of ``workers``. With
+        ``workers > 1`` the iterations are sharded across a process pool and
+        the per-shard counters are merged.
+        
+        With ``batch_size`` the Monte Carlo loop runs in array form: each
+        block of ``batch_size`` iterations is drawn by one
+        generate_minefield_batch call from ``batch_rng(seed, block)`` and
+        evaluated by check_batch_safety. Batched runs are reproducible for a
+        given (seed, batch_size) but draw different fields than the
+        per-iteration mode.
+        
+        With ``target_half_width`` the run stops early: after every
+        ``check_interval`` iterations (rounded up to a multiple of
+        batch_size) the ``interval_method`` ('wilson' or 'clopper-pearson')
+        confidence interval on any_hit_prob is computed for both vessel
+        types, and the run ends once both half-widths are at most
+        ``target_half_width``. ``num_iterations`` is then an upper bound.
+        Iterations keep their streams, so an early-stopped run equals the
+        fixed-length run of the same length. The statistics report the
+        iterations used and the final intervals.
+        
+        With ``config.profiling`` the statistics gain a 'profile' entry:
+        per-phase calls and seconds plus event counters for this run,
+        summed over all workers.
+        
+        With ``stream`` every iteration's outcome flags are appended to it
+        as a record (see results_stream) as soon as its iteration or shard
+        finishes; the stream is flushed, not closed, when the run ends.
+        
+        With ``checkpoint`` the completed iteration count, the partial
+        counters and the position in the random streams are saved to that
+        file every ``checkpoint_interval`` iterations (rounded up to a
+        multiple of batch_size) and at the end; resume_simulation continues
+        a run from it.
+        """
         if num_iterations is None:
             num_iterations = self.config.num_simulations
         
-        self.results = {
-            'surface_vessel': {'mine_hits': 0, 'net_hits': 0, 'both_hits': 0, 'safe': 0},
-            'submarine': {'mine_hits': 0, 'net_hits': 0, 'both_hits': 0, 'safe': 0}
+        job = {
+            'routes': [list(surface_start), list(surface_end), list(sub_start), list(sub_end)],
+            'num_iterations': num_iterations,
+            'seed': seed,
+            'batch_size': batch_size,
+            'target_half_width': target_half_width,
+            'confidence': confidence,
+            'interval_method': interval_method,
+            'check_interval': check_interval,
         }
+        self.results = empty_results()
+        if self.config.profiling:
+            self.profile = PhaseProfile()
+        return self._run_job(job, 0, verbose, workers, stream, checkpoint, checkpoint_interval)
+    
+    def resume_simulation(self, checkpoint: str, verbose: bool = True, workers: int = 1,
+                          stream: ResultStreamWriter = None,
+                          checkpoint_interval: int = 1000) -> Dict:
+        """Continue a run_simulation job from its checkpoint file
         
-        print_interval = max(1, num_iterations // 20)
+        The simulation's config must match the one the checkpoint was
+        written with. Iteration i always draws from the same stream, so the
+        final statistics are identical to an uninterrupted run. Iterations
+        after the last checkpoint are rerun; a JSON Lines ``stream`` opened
+        with append=True receives them again, and read_stream keeps one
+        record per iteration.
+        """
+        state = self._load_checkpoint(checkpoint, 'run_simulation')
+        self.results = state['results']
+        if self.config.profiling:
+            self.profile = PhaseProfile()
+            if state.get('profile'):
+                self.profile.merge(state['profile'])
+        return self._run_job(state['job'], state['completed'], verbose, workers, stream,
+                             checkpoint, checkpoint_interval)
+    
+    def _run_job(self, job: Dict, completed: int, verbose: bool, workers: int,
+                 stream: Optional[ResultStreamWriter], checkpoint: Optional[str],
+                 checkpoint_interval: int) -> Dict:
+        """Run main-simulation iterations [completed, num_iterations) of a job"""
+        routes = tuple(tuple(point) for point in job['routes'])
+        num_iterations = job['num_iterations']
+        seed = job['seed']
+        batch_size = job['batch_size']
+        target_half_width = job['target_half_width']
+        confidence = job['confidence']
+        interval_method = job['interval_method']
+        progress = _progress_printer(num_iterations, verbose, completed)
         
-        for i in range(num_iterations):
-            self.generate_tactical_mines(surface_start, surface_end, seed=i)
-            
-            # Surface vessel
-            surface_path = self.generate_path_2d(surface_start, surface_end)
-            mine_hit, net_hit = self.check_surface_vessel_safety(surface_path)
-            
-            if mine_hit and net_hit:
-                self.results['surface_vessel']['both_hits'] += 1
-            elif mine_hit:
-                self.results['surface_vessel']['mine_hits'] += 1
-            elif net_hit:
-                self.results['surface_vessel']['net_hits'] += 1
-            else:
-                self.results['surface_vessel']['safe'] += 1
-            
-            # Submarine
-            sub_path = self.generate_path_3d(sub_start, sub_end)
-            mine_hit, net_hit = self.check_submarine_safety(sub_path)
-            
-            if mine_hit and net_hit:
-                self.results['submarine']['both_hits'] += 1
-            elif mine_hit:
-                self.results['submarine']['mine_hits'] += 1
-            elif net_hit:
-                self.results['submarine']['net_hits'] += 1
+        unit = batch_size or 1
+        check_step = num_iterations
+        if target_half_width is not None:
+            check_step = max(unit, -(-job['check_interval'] // unit) * unit)
+        save_step = num_iterations
+        if checkpoint is not None:
+            save_step = max(unit, -(-checkpoint_interval // unit) * unit)
+        
+        # A resumed run may already have met the target at its last check
+        converged = (target_half_width is not None and completed > 0 and
+                     (completed % check_step == 0 or completed == num_iterations) and
+                     self._has_converged(completed, target_half_width, 
+                                         confidence, interval_method))
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while completed < num_iterations and not converged:
+                stop = min(_next_multiple(completed, check_step), 
+                           _next_multiple(completed, save_step), num_iterations)
+                if pool is not None:
+                    self._run_parallel(routes, completed, stop, seed, workers, 
+                                       batch_size, pool, progress, stream)
+                else:
+                    self._run_range(routes, seed, completed, stop, batch_size, 
+                                    self.results, progress, 
+                                    stream.write_rows if stream is not None else None)
+                completed = stop
+                
+                if target_half_width is not None and (completed % check_step == 0 or 
+                                                      completed == num_iterations):
+                    converged = self._has_converged(completed, target_half_width, 
+                                                    confidence, interval_method)
+                if checkpoint is not None:
+                    self._save_run_checkpoint(checkpoint, job, completed, converged)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if stream is not None:
+                stream.flush()
+        
+        if verbose and target_half_width is not None:
+            status = "Converged" if completed < num_iterations else "Stopped"
+            print(f"{status} after {completed}/{num_iterations} iterations "
+                  f"(target ±{target_half_width*100:.2f}%)")
+        
+        if target_half_width is None:
+            stats = self.calculate_statistics(completed)
+        else:
+            stats = self.calculate_statistics(completed, confidence, interval_method)
+        if self.profile is not None:
+            stats['profile'] = self.profile.as_dict()
+        return stats
+    
+    def _save_run_checkpoint(self, path: str, job: Dict, completed: int, converged: bool):
+        save_checkpoint(path, {
+            'kind': 'run_simulation',
+            'config_hash': config_hash(self.config),
+            'job': job,
+            'completed': completed,
+            'finished': converged or completed >= job['num_iterations'],
+            'results': self.results,
+            'profile': self.profile.as_dict() if self.profile is not None else None,
+            'rng': _stream_position(job['seed'], job['batch_size'], completed),
+        })
+    
+    def _load_checkpoint(self, path: str, kind: str) -> Dict:
+        """Read a checkpoint and check that it was written with this config"""
+        state = load_checkpoint(path, kind)
+        if state['config_hash'] != config_hash(self.config):
+            raise ValueError(f"Checkpoint {path} was written with a different config")
+        return state
+    
+    def _has_converged(self, total: int, target_half_width: float, 
+                       confidence: float, interval_method: str) -> bool:
+        """Whether the any-hit interval of every vessel type is narrow enough"""
+        for counts in self.results.values():
+            hits = total - counts['safe']
+            lower, upper = proportion_interval(hits, total, confidence, interval_method)
+            if (upper - lower) / 2 > target_half_width:
+                return False
+        return True
+    
+    def run_range(self, surface_start, surface_end, sub_start, sub_end, seed: int,
+                  start: int, stop: int, batch_size: int = None) -> Dict:
+        """Outcome counters of iterations [start, stop) of a run_simulation run
+        
+        Iteration i draws from the same stream as in run_simulation with this
+        ``seed`` and ``batch_size`` (``start`` must be a multiple of
+        batch_size), so counters of disjoint ranges added with merge_results
+        give that run's counters; outcome_statistics turns them into its
+        statistics.
+        """
+        results = empty_results()
+        self._run_range((surface_start, surface_end, sub_start, sub_end), seed, start, stop,
+                        batch_size, results)
+        return results
+    
+    def _run_range(self, routes, seed: int, start: int, stop: int, 
+                   batch_size: int, results: Dict, progress=None, emit=None):
+        """Run iterations [start, stop) one by one or in blocks of batch_size
+        
+        ``emit``, if given, is called with the iteration records of every
+        iteration or block.
+        """
+        step = batch_size or 1
+        for lo in range(start, stop, step):
+            hi = min(lo + step, stop)
+            if batch_size:
+                flags = self._simulate_batch(*routes, batch_rng(seed, lo // batch_size), 
+                                             hi - lo, results)
             else:
-                self.results['submarine']['safe'] += 1
+                flags = self._simulate_iteration(*routes, iteration_rng(seed, lo), results)
             
-            if verbose and (i + 1) % print_interval == 0:
-                progress = (i + 1) / num_iterations * 100
-                print(f"Progress: {progress:.1f}% ({i+1}/{num_iterations})")
+            if emit is not None:
+                emit(outcome_rows(lo, flags))
+            if progress is not None:
+                progress(hi - lo)
+    
+    def _simulate_iteration(self, surface_start, surface_end, sub_start, sub_end,
+                            rng: np.random.Generator, results: Dict) -> Dict:
+        """Deploy one mine field and record surface vessel and submarine outcomes
+        
+        Returns the (mine_hit, net_hit) flags per vessel type.
+        """
+        self.generate_tactical_mines(surface_start, surface_end, rng=rng)
+        
+        # Surface vessel
+        surface_path = self.collision_path(surface_start, surface_end)
+        surface_flags = self.check_surface_vessel_safety(surface_path)
+        _record_outcome(results['surface_vessel'], *surface_flags)
+        
+        # Submarine
+        sub_path = self.collision_path(sub_start, sub_end)
+        sub_flags = self.check_submarine_safety(sub_path)
+        _record_outcome(results['submarine'], *sub_flags)
         
-        return self.calculate_statistics(num_iterations)
+        return {'surface_vessel': surface_flags, 'submarine': sub_flags}
+    
+    def _simulate_batch(self, surface_start, surface_end, sub_start, sub_end,
+                        rng: np.random.Generator, num_fields: int, results: Dict) -> Dict:
+        """Deploy a batch of mine fields and record all outcomes at once
+        
+        Returns the per-field (mine_hits, net_hits) flag arrays per vessel type.
+        """
+        batch = self.generate_minefield_batch(surface_start, surface_end, 
+                                              num_fields, rng=rng)
+        surface_path = self.collision_path(surface_start, surface_end)
+        sub_path = self.collision_path(sub_start, sub_end)
+        
+        flags = self.check_batch_safety(batch, surface_path, sub_path)
+        for vessel_type, (mine_hits, net_hits) in flags.items():
+            record_outcomes(results[vessel_type], mine_hits, net_hits)
+        return flags
+    
+    def _run_parallel(self, routes, start: int, stop: int, seed: int, workers: int,
+                      batch_size: int, pool: ProcessPoolExecutor, progress=None,
+                      stream: ResultStreamWriter = None):
+        """Shard iterations [start, stop) across a process pool and merge the counters
+        
+        ``start`` must be a multiple of batch_size. Shard boundaries fall on
+        multiples of batch_size so that every block is drawn from the same
+        stream as in a serial run.
+        """
+        step = batch_size or 1
+        num_units = -(-(stop - start) // step)
+        num_shards = min(num_units, workers * 4)
+        bounds = np.minimum(start + np.linspace(0, num_units, num_shards + 1).astype(int) * step,
+                            stop)
+        
+        futures = {
+            pool.submit(_run_iteration_shard, self.config, routes, seed, 
+                        int(lo), int(hi), batch_size, stream is not None): int(hi - lo)
+            for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+        }
+        for future in as_completed(futures):
+            results, profile, rows = future.result()
+            merge_results(self.results, results)
+            if profile is not None:
+                self.profile.merge(profile)
+            if rows is not None:
+                stream.write_rows(rows)
+            if progress is not None:
+                progress(futures[future])
+    
+    def scenario_paths(self, sub_start: Tuple[float, float, float],
+                       sub_end: Tuple[float, float, float],
+                       extra_paths: Dict[str, np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Collision paths of every RouteScenario followed by user-supplied candidate paths
+        
+        Extra paths are polylines; in 'swept' collision mode their vertices
+        are the waypoints.
+        """
+        paths = {scenario.value: self.collision_path(sub_start, sub_end, scenario)
+                 for scenario in RouteScenario}
+        for name, path in (extra_paths or {}).items():
+            if name in paths:
+                raise ValueError(f"Extra path name clashes with a scenario: {name!r}")
+            paths[name] = np.asarray(path, dtype=np.float64)
+        return paths
     
     def run_scenario_comparison(self,
                                sub_start: Tuple[float, float, float],
                                sub_end: Tuple[float, float, float],
-                               num_iterations: int = 100) -> Dict:
-        """Compare multiple route scenarios"""
+                               num_iterations: int = None,
+                               seed: int = 0,
+                               extra_paths: Dict[str, np.ndarray] = None,
+                               batch_size: int = None,
+                               fields: MinefieldBatch = None,
+                               checkpoint: str = None,
+                               checkpoint_interval: int = 1000) -> Dict:
+        """Compare multiple route scenarios
+        
+        Each mine field is deployed once and every scenario path, plus any
+        ``extra_paths`` given as {name: (N, 3) array}, is evaluated against
+        it, so all routes are compared on common random numbers. Iteration
+        i uses the stream of ``iteration_rng(seed, i)``, as in
+        run_simulation. With ``batch_size`` the fields are drawn in blocks
+        by generate_minefield_batch from ``batch_rng(seed, block)`` and each
+        path is checked against a whole block at once.
+        
+        ``fields`` (e.g. a MinefieldArchive entry) replaces deployment: the
+        routes are evaluated against its first ``num_iterations`` fields,
+        all of them by default, and ``batch_size`` only sets how many are
+        checked at once. ``num_iterations`` otherwise defaults to 100.
+        
+        With ``checkpoint`` the per-route counters are saved to that file
+        every ``checkpoint_interval`` fields (rounded up to a multiple of
+        batch_size) and at the end; resume_scenario_comparison continues
+        from it.
+        """
+        if num_iterations is None:
+            num_iterations = len(fields) if fields is not None else 100
+        
+        job = {
+            'sub_start': list(sub_start),
+            'sub_end': list(sub_end),
+            'num_iterations': num_iterations,
+            'seed': seed,
+            'batch_size': batch_size,
+            'extra_paths': {name: np.asarray(path).tolist() 
+                            for name, path in (extra_paths or {}).items()},
+            'archived_fields': fields is not None,
+        }
+        return self._run_comparison(job, None, 0, fields, checkpoint, checkpoint_interval)
+    
+    def resume_scenario_comparison(self, checkpoint: str, fields: MinefieldBatch = None,
+                                   checkpoint_interval: int = 1000) -> Dict:
+        """Continue a run_scenario_comparison job from its checkpoint file
+        
+        Jobs that ran on pre-deployed ``fields`` need the same fields again.
+        The final results are identical to an uninterrupted comparison.
+        """
+        state = self._load_checkpoint(checkpoint, 'scenario_comparison')
+        job = state['job']
+        if job['archived_fields'] and fields is None:
+            raise ValueError("This comparison ran on pre-deployed fields; pass them again")
+        return self._run_comparison(job, state['counts'], state['completed'], 
+                                    fields if job['archived_fields'] else None, 
+                                    checkpoint, checkpoint_interval)
+    
+    def _run_comparison(self, job: Dict, counts: Optional[Dict], completed: int,
+                        fields: Optional[MinefieldBatch], checkpoint: Optional[str],
+                        checkpoint_interval: int) -> Dict:
+        """Evaluate every route against fields [completed, num_iterations) of a job"""
+        sub_start, sub_end = tuple(job['sub_start']), tuple(job['sub_end'])
+        num_iterations = job['num_iterations']
+        seed = job['seed']
+        batch_size = job['batch_size']
+        if fields is not None and num_iterations > len(fields):
+            raise ValueError(f"num_iterations={num_iterations} exceeds the "
+                             f"{len(fields)} fields given")
+        
         print("\n" + "="*80)
         print("ROUTE SCENARIO COMPARISON".center(80))
         print("="*80)
         
-        scenarios = list(RouteScenario)
-        scenario_results = {}
+        paths = self.scenario_paths(sub_start, sub_end, job['extra_paths'])
+        path_indexes = {name: self.path_index(path) for name, path in paths.items()}
+        if counts is None:
+            counts = {name: _empty_counts() for name in paths}
+        route = ((sub_start[0], sub_start[1]), (sub_end[0], sub_end[1]))
         
-        for scenario in scenarios:
-            print(f"\nTesting {scenario.value} scenario...")
-            
-            results = {'mine_hits': 0, 'net_hits': 0, 'both_hits': 0, 'safe': 0}
-            
-            for i in range(num_iterations):
-                self.generate_tactical_mines((sub_start[0], sub_start[1]), 
-                                            (sub_end[0], sub_end[1]), seed=i)
-                
-                path = self.generate_scenario_path(scenario, sub_start, sub_end)
-                mine_hit, net_hit = self.check_submarine_safety(path)
-                
-                if mine_hit and net_hit:
-                    results['both_hits'] += 1
-                elif mine_hit:
-                    results['mine_hits'] += 1
-                elif net_hit:
-                    results['net_hits'] += 1
+        print(f"\nTesting {len(paths)} routes against {num_iterations} mine fields...")
+        if completed:
+            print(f"Resuming after {completed} fields")
+        
+        step = batch_size or 1
+        save_step = (max(step, -(-checkpoint_interval // step) * step) 
+                     if checkpoint is not None else None)
+        for lo in range(completed, num_iterations, step):
+            hi = min(lo + step, num_iterations)
+            if batch_size:
+                if fields is not None:
+                    batch = fields.slice(lo, hi)
                 else:
-                    results['safe'] += 1
+                    batch = self.generate_minefield_batch(*route, hi - lo, 
+                                                          rng=batch_rng(seed, lo // batch_size))
+                for name, path in paths.items():
+                    mine_hits, net_hits = self._check_batch_submarine(
+                        batch, path, path_indexes[name])
+                    record_outcomes(counts[name], mine_hits, net_hits)
+            else:
+                if fields is not None:
+                    self.minefield, self.netfield = fields.field(lo)
+                else:
+                    self.generate_tactical_mines(*route, rng=iteration_rng(seed, lo))
+                for name, path in paths.items():
+                    mine_hit, net_hit = self.check_submarine_safety(path, path_indexes[name])
+                    _record_outcome(counts[name], mine_hit, net_hit)
             
+            if save_step is not None and (hi % save_step == 0 or hi == num_iterations):
+                save_checkpoint(checkpoint, {
+                    'kind': 'scenario_comparison',
+                    'config_hash': config_hash(self.config),
+                    'job': job,
+                    'completed': hi,
+                    'finished': hi == num_iterations,
+                    'counts': counts,
+                    'rng': _stream_position(seed, batch_size, hi),
+                })
+        
+        scenario_results = {}
+        for name, results in counts.items():
             total = num_iterations
-            scenario_results[scenario.value] = {
+            scenario_results[name] = {
                 'mine_hit_prob': results['mine_hits'] / total,
                 'net_hit_prob': results['net_hits'] / total,
                 'both_hit_prob': results['both_hits'] / total,
@@ -400,25 +1036,128 @@ class TacticalMineSimulation:
                 'counts': results
             }
             
-            print(f"  Safe: {scenario_results[scenario.value]['safe_prob']*100:.1f}%, "
-                  f"Risk: {scenario_results[scenario.value]['any_hit_prob']*100:.1f}%")
+            print(f"  {name}: Safe: {scenario_results[name]['safe_prob']*100:.1f}%, "
+                  f"Risk: {scenario_results[name]['any_hit_prob']*100:.1f}%")
         
         self.scenario_results = scenario_results
         return scenario_results
     
-    def calculate_statistics(self, total: int) -> Dict:
-        """Calculate statistics"""
-        stats = {}
-        
-        for vessel_type in ['surface_vessel', 'submarine']:
-            r = self.results[vessel_type]
-            stats[vessel_type] = {
-                'mine_hit_prob': r['mine_hits'] / total,
-                'net_hit_prob': r['net_hits'] / total,
-                'both_hit_prob': r['both_hits'] / total,
-                'any_hit_prob': (r['mine_hits'] + r['net_hits'] + r['both_hits']) / total,
-                'safe_prob': r['safe'] / total,
-                'counts': r
-            }
+    def calculate_statistics(self, total: int, confidence: float = None,
+                             interval_method: str = 'wilson') -> Dict:
+        """Calculate statistics
         
-        return stats
\ No newline at end of file
+        With ``confidence`` each vessel type also gets an 'any_hit_ci'
+        (lower, upper) interval from proportion_interval.
+        """
+        return outcome_statistics(self.results, total, confidence, interval_method)
+
+
+def outcome_statistics(results: Dict, total: int, confidence: float = None,
+                       interval_method: str = 'wilson') -> Dict:
+    """Per-vessel probabilities from outcome counters, as run_simulation reports them"""
+    stats = {}
+    
+    for vessel_type in ['surface_vessel', 'submarine']:
+        r = results[vessel_type]
+        any_hits = r['mine_hits'] + r['net_hits'] + r['both_hits']
+        stats[vessel_type] = {
+            'mine_hit_prob': r['mine_hits'] / total,
+            'net_hit_prob': r['net_hits'] / total,
+            'both_hit_prob': r['both_hits'] / total,
+            'any_hit_prob': any_hits / total,
+            'safe_prob': r['safe'] / total,
+            'iterations': total,
+            'counts': r
+        }
+        if confidence is not None:
+            stats[vessel_type]['any_hit_ci'] = proportion_interval(
+                any_hits, total, confidence, interval_method)
+    
+    return stats
+
+
+def _empty_counts() -> Dict:
+    """Outcome counters for one vessel type"""
+    return {'mine_hits': 0, 'net_hits': 0, 'both_hits': 0, 'safe': 0}
+
+
+def empty_results() -> Dict:
+    """Outcome counters for surface vessel and submarine, as outcome_statistics takes them"""
+    return {'surface_vessel': _empty_counts(), 'submarine': _empty_counts()}
+
+
+def _record_outcome(counts: Dict, mine_hit: bool, net_hit: bool):
+    """Add one transit outcome to the counters"""
+    if mine_hit and net_hit:
+        counts['both_hits'] += 1
+    elif mine_hit:
+        counts['mine_hits'] += 1
+    elif net_hit:
+        counts['net_hits'] += 1
+    else:
+        counts['safe'] += 1
+
+
+def record_outcomes(counts: Dict, mine_hits: np.ndarray, net_hits: np.ndarray):
+    """Add a batch of transit outcomes, given as flag arrays, to the counters"""
+    counts['both_hits'] += int(np.sum(mine_hits & net_hits))
+    counts['mine_hits'] += int(np.sum(mine_hits & ~net_hits))
+    counts['net_hits'] += int(np.sum(~mine_hits & net_hits))
+    counts['safe'] += int(np.sum(~mine_hits & ~net_hits))
+
+
+def merge_results(total: Dict, partial: Dict):
+    """Add partial per-vessel counters into total in place"""
+    for vessel_type, counts in partial.items():
+        for key, value in counts.items():
+            total[vessel_type][key] += value
+
+
+def _stream_position(seed: int, batch_size: Optional[int], completed: int) -> Dict:
+    """Random state of a run after ``completed`` iterations
+    
+    Every iteration (or block) draws from its own stream, so the master seed
+    and the next stream index are all that is needed to continue.
+    """
+    return {'seed': seed,
+            'stream': 'batch' if batch_size else 'iteration',
+            'next_index': completed // batch_size if batch_size else completed}
+
+
+def _next_multiple(value: int, step: int) -> int:
+    """Smallest multiple of step that is greater than value"""
+    return (value // step + 1) * step
+
+
+def _progress_printer(num_iterations: int, verbose: bool, completed: int = 0):
+    """Progress callback that prints every 5% of completed iterations"""
+    if not verbose:
+        return None
+    print_interval = max(1, num_iterations // 20)
+    state = {'completed': completed}
+    
+    def report(count: int):
+        before = state['completed']
+        state['completed'] = completed = before + count
+        if completed // print_interval > before // print_interval:
+            progress = completed / num_iterations * 100
+            print(f"Progress: {progress:.1f}% ({completed}/{num_iterations})")
+    
+    return report
+
+
+def _run_iteration_shard(config: TacticalMineConfig, routes, seed: int,
+                         start: int, stop: int, batch_size: int = None,
+                         collect_rows: bool = False) -> Tuple:
+    """Process-pool worker: run iterations [start, stop) and return the counters
+    
+    Returns (results, profile dict or None when profiling is off, iteration
+    records or None unless ``collect_rows``).
+    """
+    sim = TacticalMineSimulation(config)
+    results = empty_results()
+    rows = [] if collect_rows else None
+    sim._run_range(routes, seed, start, stop, batch_size, results, 
+                   emit=rows.extend if collect_rows else None)
+    profile = sim.profile.as_dict() if sim.profile is not None else None
+    return results, profile, rows
\ No newline at end of file
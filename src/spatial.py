@@ -0,0 +1,96 @@
+"""
+Broad-phase spatial indexing for collision culling
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Slack added to broad-phase radii so rounding never culls a boundary contact
+_BROAD_PHASE_SLACK = 1e-6
+
+
+class PathIndex:
+    """KD-tree over the horizontal positions of a sampled path
+
+    Built once per path and reused for every field the path is checked
+    against. ``max_half_segment`` bounds how far a point on a path segment
+    can be from the nearest sampled point; precomputed ``segment_lengths``
+    may be passed in.
+    """
+
+    def __init__(self, path_points: np.ndarray, segment_lengths: np.ndarray = None):
+        # scipy.spatial is imported on first index build: mine objects and
+        # pool workers import this module without needing a KD-tree
+        from scipy.spatial import cKDTree
+
+        self.points = np.asarray(path_points, dtype=np.float64)
+        xy = self.points[:, :2]
+        self.tree = cKDTree(xy)
+        if segment_lengths is None:
+            steps = np.diff(xy, axis=0)
+            segment_lengths = np.sqrt((steps ** 2).sum(axis=-1))
+        # 3D segment lengths also bound the horizontal ones
+        self.num_segments = len(segment_lengths)
+        self.max_half_segment = (0.5 * float(np.max(segment_lengths))
+                                 if len(segment_lengths) else 0.0)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+class FieldIndex:
+    """KD-tree over the horizontal positions of mines or net midpoints
+
+    Built once per field. ``extent`` is the horizontal half-size of each
+    object around its indexed point: zero for mines, half the length for
+    nets.
+    """
+
+    def __init__(self, xy: np.ndarray, extent=0.0):
+        from scipy.spatial import cKDTree
+
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        self.tree = cKDTree(xy)
+        self.extent = np.broadcast_to(np.asarray(extent, dtype=np.float64), len(xy))
+
+    @classmethod
+    def for_segments(cls, x1, y1, x2, y2) -> "FieldIndex":
+        """Index line segments (nets) by their midpoints and half-lengths"""
+        mid = np.stack([(np.ravel(x1) + np.ravel(x2)) / 2,
+                        (np.ravel(y1) + np.ravel(y2)) / 2], axis=-1)
+        half = np.hypot(np.ravel(x2) - np.ravel(x1), np.ravel(y2) - np.ravel(y1)) / 2
+        return cls(mid, half)
+
+    def __len__(self) -> int:
+        return self.tree.n
+
+    def near_points(self, path_index: PathIndex, reach) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate (object, path point) pairs within ``extent + reach`` horizontally
+
+        ``reach`` is a scalar or one value per indexed object. Objects not in
+        any pair are further than their reach from every path point.
+        """
+        radius = self.extent + np.broadcast_to(reach, len(self)) + _BROAD_PHASE_SLACK
+        if len(self) == 0 or len(path_index) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        pairs = self.tree.sparse_distance_matrix(path_index.tree, float(radius.max()),
+                                                 output_type='ndarray')
+        keep = pairs['v'] <= radius[pairs['i']]
+        return pairs['i'][keep].astype(np.intp), pairs['j'][keep].astype(np.intp)
+
+    def near_segments(self, path_index: PathIndex, reach) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate (object, path segment) pairs that may lie within ``reach``
+
+        A segment can only come within reach of an object if one of its
+        endpoints lies within ``extent + reach + max_half_segment`` of the
+        object's indexed point, so the pairs are a superset of all contacts.
+        """
+        objects, points = self.near_points(path_index, np.asarray(reach)
+                                           + path_index.max_half_segment)
+        num_segments = path_index.num_segments
+        objects = np.concatenate([objects, objects])
+        segments = np.concatenate([points - 1, points])
+        valid = (segments >= 0) & (segments < num_segments)
+        keys = np.unique(objects[valid] * num_segments + segments[valid])
+        return keys // max(num_segments, 1), keys % max(num_segments, 1)
\ No newline at end of file
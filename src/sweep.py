@@ -0,0 +1,172 @@
+"""
+Parameter sweeps over TacticalMineConfig with an on-disk result cache
+"""
+
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import TacticalMineConfig
+from .simulation import TacticalMineSimulation
+from .util import canonical_value, config_hash
+
+# Bump when the cached record layout or the simulation's statistics change
+CACHE_VERSION = 1
+
+ROUTE_KEYS = ('surface_start', 'surface_end', 'sub_start', 'sub_end')
+DEFAULT_ROUTES = {
+    'surface_start': (1000, 1000),
+    'surface_end': (9000, 9000),
+    'sub_start': (1000, 1000, 100),
+    'sub_end': (9000, 9000, 200),
+}
+
+
+def parameter_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    """Cartesian product of a {name: values} grid as a list of {name: value} points"""
+    names = list(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+@dataclass
+class SweepPoint:
+    """One grid point: its parameters, the resulting config and routes, and cache key"""
+    params: Dict
+    config: TacticalMineConfig
+    routes: Dict[str, Tuple[float, ...]]
+    key: str
+
+
+@dataclass
+class SweepResult:
+    """Statistics of one grid point; ``cached`` tells whether they came from disk"""
+    params: Dict
+    key: str
+    stats: Dict
+    cached: bool
+
+
+class ResultCache:
+    """Directory of JSON result records, one file per cache key
+
+    Records are written to a temporary file and renamed into place, so an
+    interrupted sweep never leaves a partial record behind.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached record for ``key``, or None if missing or unreadable"""
+        try:
+            with open(self.path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, record: Dict):
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp, path)
+
+
+def sweep_points(grid: Dict[str, Sequence], base_config: TacticalMineConfig = None,
+                 routes: Dict[str, Tuple[float, ...]] = None, num_iterations: int = None,
+                 seed: int = 0, batch_size: int = None) -> List[SweepPoint]:
+    """Expand a grid into SweepPoints
+
+    Grid names are TacticalMineConfig fields or the route endpoints
+    'surface_start', 'surface_end', 'sub_start' and 'sub_end'; anything
+    else raises ValueError. Unswept values come from ``base_config`` and
+    ``routes`` (default DEFAULT_ROUTES).
+    """
+    base_config = base_config or TacticalMineConfig()
+    base_routes = dict(DEFAULT_ROUTES, **(routes or {}))
+    config_fields = {f.name for f in fields(TacticalMineConfig)}
+    unknown = set(grid) - config_fields - set(ROUTE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    points = []
+    for params in parameter_grid(grid):
+        config = replace(base_config, **{k: v for k, v in params.items()
+                                         if k in config_fields})
+        if num_iterations is not None:
+            config = replace(config, num_simulations=num_iterations)
+        point_routes = dict(base_routes, **{k: tuple(v) for k, v in params.items()
+                                            if k in ROUTE_KEYS})
+        key = config_hash(config, version=CACHE_VERSION, seed=seed, batch_size=batch_size,
+                          routes=point_routes)
+        points.append(SweepPoint(params, config, point_routes, key))
+    return points
+
+
+def run_sweep(grid: Dict[str, Sequence], base_config: TacticalMineConfig = None,
+              routes: Dict[str, Tuple[float, ...]] = None, num_iterations: int = None,
+              seed: int = 0, batch_size: int = None, workers: int = 1,
+              cache_dir: str = './output/sweep_cache') -> Iterator[SweepResult]:
+    """Run run_simulation for every grid point, yielding results as they complete
+
+    Points already in the cache under ``cache_dir`` are yielded first
+    without running; the rest are scheduled on a pool of ``workers``
+    processes (inline for workers=1) and cached as each one finishes, so
+    an interrupted sweep resumes where it stopped. Every point uses the
+    same ``seed``, so points are compared on common random numbers.
+    ``cache_dir=None`` disables the cache.
+    """
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    pending = []
+    for point in sweep_points(grid, base_config, routes, num_iterations, seed, batch_size):
+        record = cache.get(point.key) if cache is not None else None
+        if record is not None:
+            yield SweepResult(point.params, point.key, record['stats'], True)
+        else:
+            pending.append(point)
+
+    def finish(point: SweepPoint, stats: Dict) -> SweepResult:
+        stats = json.loads(json.dumps(stats))  # same form as a cached record
+        if cache is not None:
+            cache.put(point.key, {'key': point.key, 'params': canonical_value(point.params),
+                                  'seed': seed, 'batch_size': batch_size,
+                                  'stats': stats})
+        return SweepResult(point.params, point.key, stats, False)
+
+    if workers <= 1:
+        for point in pending:
+            yield finish(point, _run_point(point.config, point.routes, seed, batch_size))
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    futures = {}
+    try:
+        for point in pending:
+            futures[pool.submit(_run_point, point.config, point.routes, seed, batch_size)] = point
+        for future in as_completed(futures):
+            yield finish(futures[future], future.result())
+    finally:
+        # shutdown(cancel_futures=True) needs Python 3.9
+        for future in futures:
+            future.cancel()
+        pool.shutdown()
+
+
+def _run_point(config: TacticalMineConfig, routes: Dict, seed: int,
+               batch_size: int = None) -> Dict:
+    """Process-pool worker: statistics of one sweep point"""
+    sim = TacticalMineSimulation(config)
+    return sim.run_simulation(routes['surface_start'], routes['surface_end'],
+                              routes['sub_start'], routes['sub_end'],
+                              verbose=False, seed=seed, batch_size=batch_size)
\ No newline at end of file
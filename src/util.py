@@ -2,9 +2,97 @@
 Utility functions for naval mine warfare simulation
 """
 
+import hashlib
 import json
+import math
+from dataclasses import fields
 from datetime import datetime
-from typing import Dict
+from enum import Enum
+from statistics import NormalDist
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# Config settings that never change the statistics and so stay out of config_hash
+RESULT_NEUTRAL_FIELDS = ('spatial_index', 'profiling')
+
+
+def wilson_interval(successes: int, trials: int, 
+                    confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denom = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denom
+    half_width = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denom
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def clopper_pearson_interval(successes: int, trials: int, 
+                             confidence: float = 0.95) -> Tuple[float, float]:
+    """Exact (Clopper-Pearson) interval for a binomial proportion"""
+    # scipy.stats costs most of the package import time, so load it on first use
+    from scipy.stats import beta
+
+    if trials == 0:
+        return 0.0, 1.0
+    alpha = 1 - confidence
+    lower = 0.0 if successes == 0 else beta.ppf(alpha / 2, successes, 
+                                                 trials - successes + 1)
+    upper = 1.0 if successes == trials else beta.ppf(1 - alpha / 2, successes + 1, 
+                                                     trials - successes)
+    return float(lower), float(upper)
+
+
+_INTERVALS = {'wilson': wilson_interval, 'clopper-pearson': clopper_pearson_interval}
+
+# Names accepted as proportion_interval's ``method``
+INTERVAL_METHODS = tuple(_INTERVALS)
+
+
+def proportion_interval(successes: int, trials: int, confidence: float = 0.95,
+                        method: str = 'wilson') -> Tuple[float, float]:
+    """Confidence interval for a binomial proportion
+    
+    ``method`` is 'wilson' or 'clopper-pearson'.
+    """
+    if method not in _INTERVALS:
+        raise ValueError(f"Unknown interval method: {method!r}")
+    return _INTERVALS[method](successes, trials, confidence)
+
+
+def canonical_value(value):
+    """JSON-ready form of a config value that is stable across runs and processes"""
+    if isinstance(value, Enum):
+        return [type(value).__name__, value.name, canonical_value(value.value)]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, (tuple, list, np.ndarray)):
+        return [canonical_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): canonical_value(v) for k, v in value.items()}
+    return value
+
+
+def config_hash(config, exclude: Sequence[str] = RESULT_NEUTRAL_FIELDS, **extra) -> str:
+    """Stable SHA-256 hex digest of a config plus run inputs such as seed and routes
+    
+    Integers and floats hash alike (1000 == 1000.0) and enums hash by class
+    name, member name and value, so the digest does not depend on the
+    process, the Python hash seed or how a value was spelled. Config fields
+    named in ``exclude`` are left out.
+    """
+    payload = {
+        'config': {f.name: canonical_value(getattr(config, f.name)) for f in fields(config)
+                   if f.name not in exclude},
+        'run': canonical_value(extra),
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
 
 def export_results_json(stats: Dict, threat_name: str, 
@@ -14,7 +102,8 @@ def export_results_json(stats: Dict, threat_name: str,
         'metadata': {
             'timestamp': datetime.now().isoformat(),
             'threat_level': threat_name,
-            'simulation_count': config.num_simulations,
+            'simulation_count': stats['surface_vessel'].get('iterations', 
+                                                            config.num_simulations),
             'version': '3.0'
         },
         'configuration': {
@@ -62,6 +151,15 @@ def export_results_json(stats: Dict, threat_name: str,
         }
     }
     
+    for vessel_type in ('surface_vessel', 'submarine'):
+        if 'any_hit_ci' in stats[vessel_type]:
+            lower, upper = stats[vessel_type]['any_hit_ci']
+            export_data['results'][vessel_type]['any_hit_ci'] = [round(lower, 4), 
+                                                                 round(upper, 4)]
+    
+    if 'profile' in stats:
+        export_data['profile'] = stats['profile']
+    
     if scenario_results:
         export_data['route_scenarios'] = {}
         for scenario_name, result in scenario_results.items():
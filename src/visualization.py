@@ -6,12 +6,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import Dict
 
-# 고품질 시각화 설정
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['savefig.dpi'] = 300
+# 고품질 시각화 설정, applied only while one of the plots below is drawn
+STYLE = {
+    'font.family': 'DejaVu Sans',
+    'axes.unicode_minus': False,
+    'savefig.dpi': 300,
+}
 
 
+@plt.rc_context(STYLE)
 def create_comparison_dashboard(all_results: Dict, output_dir: str):
     """Create comprehensive comparison dashboard"""
     fig, axes = plt.subplots(2, 2, figsize=(18, 14))
@@ -149,4 +152,49 @@ def create_comparison_dashboard(all_results: Dict, output_dir: str):
     plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close()
     
-    print(f"\n✓ Saved: comparison_dashboard.png")
\ No newline at end of file
+    print(f"\n✓ Saved: comparison_dashboard.png")
+
+@plt.rc_context(STYLE)
+def plot_risk_heatmap(raster, output_dir: str, depth: float = None,
+                      paths: Dict = None, filename: str = 'risk_heatmap.png'):
+    """Plot a RiskRaster layer with optional route overlays
+
+    ``depth`` selects a layer; by default the worst case over all depths
+    is shown. ``paths`` maps labels to (N, 2) or (N, 3) waypoint arrays.
+    """
+    fig, ax = plt.subplots(figsize=(12, 10))
+
+    layer = raster.layer(depth)
+    extent = (0, layer.shape[1] * raster.cell_size, 0, layer.shape[0] * raster.cell_size)
+    image = ax.imshow(layer * 100, origin='lower', extent=extent, cmap='YlOrRd',
+                      vmin=0, interpolation='nearest')
+    colorbar = fig.colorbar(image, ax=ax, shrink=0.85)
+    colorbar.set_label('Contact Probability (%)', fontsize=12, fontweight='bold')
+
+    for label, path in (paths or {}).items():
+        path = np.asarray(path)
+        risk = raster.path_risk(path, method='max') * 100
+        ax.plot(path[:, 0], path[:, 1], '-o', linewidth=2.5, markersize=5,
+                label=f'{label} (peak {risk:.1f}%)')
+    if paths:
+        ax.legend(loc='upper left', fontsize=10, framealpha=0.9)
+
+    vessel = 'Submarine' if raster.vessel == 'submarine' else 'Surface Vessel'
+    if raster.vessel == 'surface_vessel':
+        layer_name = 'surface'
+    elif depth is None:
+        layer_name = 'worst depth'
+    else:
+        layer_name = f'{depth:.0f} m depth'
+    ax.set_title(f'{vessel} Contact Risk ({layer_name}, {raster.num_fields} fields)',
+                 fontsize=14, fontweight='bold')
+    ax.set_xlabel('X (m)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Y (m)', fontsize=12, fontweight='bold')
+    plt.tight_layout()
+
+    save_path = f'{output_dir}/{filename}'
+    plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+
+    print(f"\n✓ Saved: {filename}")
+    return save_path
\ No newline at end of file